@@ -0,0 +1,264 @@
+# cli.py
+"""
+Command-line and daemon entry point; runs tasks on the shared runtime without importing Qt.
+
+    python main.py list
+    python main.py run indeed_task --config indeed.json --set pacing=fast
+    python main.py daemon --spool data/spool
+
+A run exits with 0 when the task succeeds, 1 when it fails (raises or returns False), 2 for a bad
+task name or configuration and 130 when interrupted. The daemon picks up job files from
+`<spool>/incoming/*.json` ({"task": "indeed_task", "config": {...}}) and moves each one to
+`done/` or `failed/` with its outcome once it finishes. Producers write `<name>.json.tmp` and
+rename it to `<name>.json` when it is complete, so a half-written job is never picked up.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError
+
+from tasks.common.config import ConfigError
+from tasks.common.logs import configure_logging
+from tasks.common.runtime import get_runtime
+from tasks.registry import get_task_registry
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+DEFAULT_SPOOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "spool")
+
+# Defaults for unattended runs that differ from the GUI's; cron and server hosts usually have no display
+NON_INTERACTIVE_DEFAULTS = {"launch_profile": "headless"}
+
+
+def parse_assignments(assignments):
+    """["key=value", ...] -> {"key": "value", ...}"""
+    config = {}
+    for assignment in assignments or []:
+        key, sep, value = assignment.partition("=")
+        if not sep or not key:
+            raise ConfigError(f"Expected key=value, got '{assignment}'")
+        config[key.strip()] = value
+    return config
+
+
+def build_config(spec, *sources, defaults=None):
+    """
+    Merge config sources over the defaults of a task's configuration_spec and validate the result.
+
+    An input's "default" wins, then `defaults` (for the keys the spec has), then the GUI's own
+    behaviour: dropdowns start at their first option and line edits empty. Every dropdown value
+    must be one of the options.
+    """
+    inputs = {item["key"]: item for item in (spec or {}).get("inputs", [])}
+    defaults = defaults or {}
+    config = {}
+    for key, item in inputs.items():
+        options = item.get("options") or []
+        if "default" in item:
+            config[key] = item["default"]
+        elif key in defaults:
+            config[key] = defaults[key]
+        else:
+            config[key] = options[0] if item.get("type") == "dropdown" and options else ""
+    for source in sources:
+        config.update(source)
+
+    unknown = sorted(set(config) - set(inputs)) if inputs else []
+    if unknown:
+        raise ConfigError(f"Unknown configuration keys {unknown}, expected some of {sorted(inputs)}")
+    for key, item in inputs.items():
+        options = item.get("options")
+        if item.get("type") == "dropdown" and options and str(config[key]) not in options:
+            raise ConfigError(f"Invalid value '{config[key]}' for {key}, expected one of {options}")
+    return config
+
+
+def load_config_file(path):
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path} must contain a JSON object")
+    return data
+
+
+def prepare_task(name, *sources):
+    """Import the task class through the registry and instantiate it with a validated config."""
+    registry = get_task_registry()
+    try:
+        task_class = registry.load_class(name)
+    except KeyError as e:
+        raise ConfigError(e.args[0]) from None
+    spec = task_class.configuration_spec() if hasattr(task_class, "configuration_spec") else None
+    return task_class(build_config(spec, *sources, defaults=NON_INTERACTIVE_DEFAULTS))
+
+
+def outcome(handle):
+    """Exit code and message for a finished TaskHandle."""
+    try:
+        result = handle.result()
+    except CancelledError:
+        return EXIT_INTERRUPTED, "cancelled"
+    except Exception as e:
+        return EXIT_FAILED, f"failed: {e}"
+    if result is False:
+        return EXIT_FAILED, "failed"
+    return EXIT_OK, "complete"
+
+
+def command_list(args):
+    for name, info in get_task_registry().tasks().items():
+        print(f"{name:<20} {info.description}")
+    return EXIT_OK
+
+
+def command_run(args):
+    try:
+        task = prepare_task(args.task, load_config_file(args.config), parse_assignments(args.set))
+    except (ConfigError, OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    runtime = get_runtime()
+    handle = runtime.submit(task.run, task_name=type(task).__name__)
+    try:
+        while not handle.done():
+            time.sleep(0.2)  # Short waits keep Ctrl+C responsive
+    except KeyboardInterrupt:
+        handle.cancel()
+    finally:
+        runtime.shutdown()
+
+    code, message = outcome(handle)
+    summary = handle.metrics.summary_text() if handle.metrics else ""
+    print(f"{args.task} {message}" + (f" ({summary})" if summary else ""))
+    return code
+
+
+class SpoolDaemon:
+    """
+    Runs job files dropped into a spool directory.
+
+    incoming/ holds new jobs, running/ the ones submitted to the runtime, and done/ or failed/ the
+    finished ones, each next to a `.result.json` with the outcome. Only `*.json` files are picked
+    up; producers write to `*.json.tmp` and rename once the file is complete. A job that can't be
+    picked up or submitted is logged and skipped, never allowed to stop the daemon.
+    """
+    def __init__(self, spool_dir, interval=5.0):
+        self.spool_dir = spool_dir
+        self.interval = interval
+        self.runtime = get_runtime()
+        self.stop_event = threading.Event()
+        for name in ("incoming", "running", "done", "failed"):
+            os.makedirs(os.path.join(spool_dir, name), exist_ok=True)
+
+    def path(self, folder, file_name):
+        return os.path.join(self.spool_dir, folder, file_name)
+
+    def finish(self, file_name, folder, result):
+        shutil.move(self.path("running", file_name), self.path(folder, file_name))
+        with open(self.path(folder, f"{file_name[:-5]}.result.json"), "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        logger.info(f"Spool job {file_name}: {result['status']}")
+
+    def submit(self, file_name):
+        try:
+            os.replace(self.path("incoming", file_name), self.path("running", file_name))
+        except FileNotFoundError:
+            logger.debug(f"Spool job {file_name} was taken by another daemon.")
+            return
+        try:
+            job = load_config_file(self.path("running", file_name))
+            task = prepare_task(job["task"], job.get("config", {}))
+        except (ConfigError, OSError, ValueError, KeyError) as e:
+            self.finish(file_name, "failed", {"status": "invalid", "error": str(e), "finished_at": time.time()})
+            return
+
+        def on_done(handle):
+            code, message = outcome(handle)
+            self.finish(file_name, "done" if code == EXIT_OK else "failed", {
+                "status": message,
+                "exit_code": code,
+                "timing": handle.metrics.summary_text() if handle.metrics else None,
+                "finished_at": time.time()
+            })
+
+        try:
+            handle = self.runtime.submit(task.run, task_name=type(task).__name__)
+        except Exception as e:
+            self.finish(file_name, "failed", {"status": "not submitted", "error": str(e), "finished_at": time.time()})
+            return
+        handle.add_done_callback(on_done)
+
+    def poll(self):
+        try:
+            incoming = sorted(name for name in os.listdir(os.path.join(self.spool_dir, "incoming"))
+                              if name.endswith(".json"))
+        except OSError as e:
+            logger.error(f"Could not list spool jobs: {e}")
+            return
+        for file_name in incoming:
+            try:
+                self.submit(file_name)
+            except Exception:
+                logger.exception(f"Could not submit spool job {file_name}")
+
+    def run(self):
+        logger.info(f"Watching {os.path.join(self.spool_dir, 'incoming')} every {self.interval}s")
+        try:
+            while not self.stop_event.is_set():
+                self.poll()
+                self.stop_event.wait(self.interval)
+        finally:
+            self.runtime.shutdown()
+        return EXIT_OK
+
+
+def command_daemon(args):
+    daemon = SpoolDaemon(args.spool, args.interval)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop_event.set())
+    try:
+        return daemon.run()
+    except KeyboardInterrupt:
+        return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wasabi", description="Run WASABI tasks without the GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="List the available tasks").set_defaults(func=command_list)
+
+    run_parser = subparsers.add_parser("run", help="Run one task and exit with its status")
+    run_parser.add_argument("task", help="Task name, as shown by 'list'")
+    run_parser.add_argument("--config", help="JSON file with the task's configuration")
+    run_parser.add_argument("--set", action="append", metavar="KEY=VALUE", help="Configuration value, repeatable")
+    run_parser.set_defaults(func=command_run)
+
+    daemon_parser = subparsers.add_parser("daemon", help="Run job files from a spool directory")
+    daemon_parser.add_argument("--spool", default=DEFAULT_SPOOL_DIR, help="Spool directory (default: data/spool)")
+    daemon_parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls (default: 5)")
+    daemon_parser.set_defaults(func=command_daemon)
+    return parser
+
+
+def main(argv=None):
+    configure_logging()
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
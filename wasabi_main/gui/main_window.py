@@ -1,5 +1,8 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QDialog, QWidget
+from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QPushButton, QTableView, QDialog, QWidget
 from .task_widget import TaskChooserDialog, TaskConfigDialog
+from .task_model import TaskEventQueue, TaskTableModel
+from .task_runner import QtTaskRunner
+from tasks.common.logs import configure_logging
 import sys
 
 
@@ -13,8 +16,12 @@ class MainWindow(QMainWindow):
         central_widget = QWidget()
         layout = QVBoxLayout()
 
-        self.task_table = QTableWidget(0, 3)
-        self.task_table.setHorizontalHeaderLabels(['Task ID', 'Task Type', 'Status'])
+        # Tasks publish progress to the event queue; the model applies it once per frame
+        self.task_events = TaskEventQueue()
+        self.task_model = TaskTableModel(self.task_events, parent=self)
+        self.task_table = QTableView()
+        self.task_table.setModel(self.task_model)
+        self.task_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.task_table)
 
         add_task_button = QPushButton('Add Task')
@@ -26,6 +33,8 @@ class MainWindow(QMainWindow):
 
         self.task_counter = 0
 
+        self.task_runner = QtTaskRunner(events=self.task_events, parent=self)
+
     def open_task_chooser_dialog(self):
         task_chooser_dialog = TaskChooserDialog(self)
         if task_chooser_dialog.exec_() == QDialog.Accepted:
@@ -33,15 +42,22 @@ class MainWindow(QMainWindow):
             self.open_task_config_dialog(selected_task_class)
 
     def open_task_config_dialog(self, task_class):
-        task_config_dialog = TaskConfigDialog(task_class, self)
+        # Add the row before submitting so status events always find it
+        task_id = self.task_counter + 1
+        self.task_model.add_task(task_id, task_class.__name__)
+
+        task_config_dialog = TaskConfigDialog(task_class, self.task_runner, task_id=task_id, parent=self)
         if task_config_dialog.exec_() == QDialog.Accepted:
-            self.task_table.insertRow(self.task_counter)
-            self.task_table.setItem(self.task_counter, 0, QTableWidgetItem(str(self.task_counter)))
-            self.task_table.setItem(self.task_counter, 1, QTableWidgetItem(task_class.__name__))
-            self.task_table.setItem(self.task_counter, 2, QTableWidgetItem("Running"))
-            self.task_counter += 1
+            self.task_counter = task_id
+        else:
+            self.task_model.remove_task(task_id)
+
+    def closeEvent(self, event):
+        self.task_runner.shutdown()
+        super().closeEvent(event)
 
 def run_gui():
+    configure_logging()  # The GUI runs in its own process, so it sets up its own log listener
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,100 @@
+from collections import deque
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+
+COLUMNS = ("task_id", "task_type", "status", "phase", "timing", "resources")
+HEADERS = ("Task ID", "Task Type", "Status", "Phase", "Timing", "Browser")
+
+
+class TaskEventQueue:
+    """
+    Thread-safe inbox for task progress events.
+
+    Running tasks publish from the runtime thread; the GUI drains the queue on its own schedule.
+    deque.append and popleft are atomic, so no lock is needed.
+    """
+    def __init__(self):
+        self._events = deque()
+
+    def publish(self, task_id, fields):
+        """Queue `fields` (a dict of column name -> value) for a task."""
+        self._events.append((task_id, fields))
+
+    def drain(self):
+        """Take every queued event, merged so each task keeps only the latest value per field."""
+        merged = {}
+        while True:
+            try:
+                task_id, fields = self._events.popleft()
+            except IndexError:
+                return merged
+            merged.setdefault(task_id, {}).update(fields)
+
+
+class TaskTableModel(QAbstractTableModel):
+    """
+    Table model of submitted tasks, fed by a TaskEventQueue.
+
+    A timer drains the queue once per frame and applies all pending changes with a single
+    dataChanged signal, so a burst of progress events costs one repaint instead of one per event.
+    """
+    def __init__(self, events, parent=None, interval_ms=16):
+        super().__init__(parent)
+        self.events = events
+        self._rows = []  # One list of column values per task
+        self._row_for = {}  # Task id -> row
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush_events)
+        self._timer.start()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        value = self._rows[index.row()][index.column()]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def add_task(self, task_id, task_type, status="Queued"):
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append([task_id, task_type, status, None, None, None])
+        self._row_for[task_id] = row
+        self.endInsertRows()
+
+    def remove_task(self, task_id):
+        row = self._row_for.pop(task_id, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        for later_row in range(row, len(self._rows)):
+            self._row_for[self._rows[later_row][0]] = later_row
+        self.endRemoveRows()
+
+    def flush_events(self):
+        """Apply every queued event to the model; called by the timer on the GUI thread."""
+        updates = self.events.drain()
+        if not updates:
+            return
+        first, last = None, None
+        for task_id, fields in updates.items():
+            row = self._row_for.get(task_id)
+            if row is None:
+                continue
+            for name, value in fields.items():
+                self._rows[row][COLUMNS.index(name)] = value
+            first = row if first is None else min(first, row)
+            last = row if last is None else max(last, row)
+        if first is not None:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(COLUMNS) - 1))
@@ -0,0 +1,64 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from concurrent.futures import CancelledError
+from tasks.common.runtime import get_runtime
+
+
+class QtTaskRunner(QObject):
+    """
+    Bridges the shared TaskRuntime to the GUI.
+
+    Tasks run on the runtime's event loop; their start and completion are reported back as Qt
+    signals, which Qt queues onto the GUI thread because this object lives there. When an event
+    queue is given, status, phase and timing changes are also published to it for the task table.
+    """
+    task_started = pyqtSignal(int)
+    task_complete = pyqtSignal(int)
+    task_failed = pyqtSignal(int, str)
+    task_cancelled = pyqtSignal(int)
+    task_metrics = pyqtSignal(int, str)  # Task id and a one-line timing summary
+
+    def __init__(self, runtime=None, events=None, parent=None):
+        super().__init__(parent)
+        self.runtime = runtime or get_runtime()
+        self.events = events  # Optional TaskEventQueue
+        self.handles = {}
+
+    def publish(self, task_id, fields):
+        if self.events is not None:
+            self.events.publish(task_id, fields)
+
+    def _on_start(self, task_id):
+        self.publish(task_id, {"status": "Running"})
+        self.task_started.emit(task_id)
+
+    def submit(self, task, task_id=None):
+        handle = self.runtime.submit(task.run, task_id=task_id, on_start=self._on_start,
+                                     task_name=type(task).__name__, on_event=self.publish)
+        self.handles[handle.task_id] = handle
+        handle.add_done_callback(self._on_done)
+        return handle.task_id
+
+    def _on_done(self, handle):
+        self.handles.pop(handle.task_id, None)
+        if handle.metrics:
+            summary = handle.metrics.summary_text()
+            self.publish(handle.task_id, {"timing": summary, "phase": None})
+            self.task_metrics.emit(handle.task_id, summary)
+        try:
+            handle.result()
+        except CancelledError:
+            self.publish(handle.task_id, {"status": "Cancelled"})
+            self.task_cancelled.emit(handle.task_id)
+        except Exception as e:
+            self.publish(handle.task_id, {"status": f"Failed: {e}"})
+            self.task_failed.emit(handle.task_id, str(e))
+        else:
+            self.publish(handle.task_id, {"status": "Complete"})
+            self.task_complete.emit(handle.task_id)
+
+    def cancel(self, task_id):
+        handle = self.handles.get(task_id)
+        return handle.cancel() if handle else False
+
+    def shutdown(self):
+        self.runtime.shutdown()
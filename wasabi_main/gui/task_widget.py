@@ -1,20 +1,21 @@
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QPushButton, QComboBox, QLabel, QDialogButtonBox, QLineEdit
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-import importlib
-import os
-import glob
-import asyncio
+from PyQt5.QtCore import Qt
+from tasks.registry import get_task_registry
 
 class TaskChooserDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, registry=None):
         super().__init__(parent)
-        self.task_classes = self.get_task_classes()
+        # Task names come from the cached manifest; nothing is imported until a task is chosen
+        self.registry = registry or get_task_registry()
         self.selected_task_class = None
 
         layout = QVBoxLayout()
 
         self.task_dropdown = QComboBox()
-        self.task_dropdown.addItems(list(self.task_classes.keys()))
+        for name, info in self.registry.tasks().items():
+            self.task_dropdown.addItem(name)
+            if info.description:
+                self.task_dropdown.setItemData(self.task_dropdown.count() - 1, info.description, Qt.ToolTipRole)
         layout.addWidget(QLabel("Choose a task:"))
         layout.addWidget(self.task_dropdown)
 
@@ -25,45 +26,20 @@ class TaskChooserDialog(QDialog):
 
         self.setLayout(layout)
 
-    def get_task_classes(self):
-        task_classes = {}
-        task_dirs = [d for d in os.listdir("tasks") if os.path.isdir(os.path.join("tasks", d))]
-
-        for task_dir in task_dirs:
-            # Look for the task file in each directory
-            task_files = glob.glob(os.path.join("tasks", task_dir, "*_task.py"))
-            for task_file in task_files:
-                module_name = os.path.basename(task_file)[:-3]
-                module_path = f"tasks.{task_dir}.{module_name}"
-                module = importlib.import_module(module_path)
-                class_name = ''.join([word.capitalize() for word in module_name.split('_')])
-                task_classes[module_name] = getattr(module, class_name)
-        
-        return task_classes
-
     def submit_task(self):
         selected_task_name = self.task_dropdown.currentText()
-        self.selected_task_class = self.task_classes[selected_task_name]
+        if not selected_task_name:
+            return
+        self.selected_task_class = self.registry.load_class(selected_task_name)
         self.accept()
 
 
-class TaskThread(QThread):
-    task_complete = pyqtSignal()
-
-    def __init__(self, task):
-        super().__init__()
-        self.task = task
-
-    def run(self):
-        asyncio.run(self.task.run())
-        self.task_complete.emit()
-
-
 class TaskConfigDialog(QDialog):
-    def __init__(self, task_class, parent=None):
+    def __init__(self, task_class, task_runner, task_id=None, parent=None):
         super().__init__(parent)
         self.task_class = task_class
-        self.task_thread = None
+        self.task_runner = task_runner
+        self.task_id = task_id
         self.input_fields = {}
 
         layout = QVBoxLayout()
@@ -109,12 +85,6 @@ class TaskConfigDialog(QDialog):
         print("Configuration passed to task:", config)  # Debugging output
 
         task = self.task_class(config)
-        self.task_thread = TaskThread(task)
-        self.task_thread.task_complete.connect(self.task_complete)
-        self.task_thread.start()
+        self.task_id = self.task_runner.submit(task, task_id=self.task_id)
 
         self.accept()
-
-    def task_complete(self):
-        print("Task Complete")
-        
\ No newline at end of file
@@ -1,8 +1,14 @@
 # main.py
 import multiprocessing
-from gui.main_window import run_gui
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Command-line use (run, daemon, list) never imports Qt
+        from cli import main
+        sys.exit(main())
+
+    from gui.main_window import run_gui
     multiprocessing.set_start_method('spawn')
     gui_process = multiprocessing.Process(target=run_gui)
     gui_process.start()
@@ -1,73 +1,232 @@
 # browser_manager.py
+import logging
 from playwright.async_api import async_playwright
-import os, random
+from tasks.common.launch_profiles import get_launch_profile, launch_options
+from tasks.common.metrics import current_recorder, timed
+from tasks.common.resource_monitor import browser_id_arg, get_resource_monitor, new_browser_id
+from tasks.common.selector_registry import as_selector
+import os, random, re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HAR_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "har")
+HAR_MODES = ("off", "record", "replay")
+
+def default_har_path(name):
+    """Archive path used for a task/profile when no explicit HAR path is given."""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    return os.path.join(DEFAULT_HAR_DIR, f"{safe_name}.har.zip")
+
+def get_random_viewport():
+    viewports = [
+        {'width': 1920, 'height': 1080},  # Typical desktop
+        {'width': 1366, 'height': 768}    # Common laptop
+    ]
+    weights = [10, 90]  # 10% chance for desktop, 90% for laptop
+    chosen_viewport = random.choices(viewports, weights, k=1)[0]
+    return chosen_viewport
+
+def get_random_geolocation():
+    # Central geolocation coordinates for Chicago
+    base_lat, base_lon = 41.8781, -87.6298
+    geolocations = [
+        {'latitude': base_lat, 'longitude': base_lon},  # Main address
+        {'latitude': base_lat + 0.05, 'longitude': base_lon + 0.05},  # Some miles north-east
+        {'latitude': base_lat - 0.05, 'longitude': base_lon - 0.05},  # Some miles south-west
+        {'latitude': base_lat + 0.08, 'longitude': base_lon - 0.08},  # Some miles north-west
+    ]
+    weights = [66, 11, 11, 12]  # Weights as per your description
+    chosen_geolocation = random.choices(geolocations, weights, k=1)[0]
+    return chosen_geolocation
 
 class BrowserManager:
-    def __init__(self, keep_open=False):
+    def __init__(self, keep_open=False, pool=None, launch_profile=None, har_mode="off", har_path=None):
         self.playwright = None
         self.browser = None
         self.context = None
         self.keep_open = keep_open  # Flag to control whether to keep the browser open
+        self.pool = pool  # Optional BrowserPool to lease contexts from
+        self.launch_profile = get_launch_profile(launch_profile)  # Headless/headed, extra args, proxy
+        if har_mode not in HAR_MODES:
+            raise ValueError(f"Unknown HAR mode '{har_mode}', expected one of {HAR_MODES}")
+        if har_mode != "off" and not har_path:
+            raise ValueError("A har_path is required to record or replay HAR archives.")
+        self.har_mode = har_mode  # "record" all traffic to har_path, or "replay" the task from it
+        self.har_path = har_path
+        self.route_filter = None
+        self._watched = None  # (browser, recorder) reported to by the ResourceMonitor while the context is held
 
 
-    async def launch_browser(self):
-        def get_random_viewport():
-            viewports = [
-                {'width': 1920, 'height': 1080},  # Typical desktop
-                {'width': 1366, 'height': 768}    # Common laptop
-            ]
-            weights = [10, 90]  # 10% chance for desktop, 90% for laptop
-            chosen_viewport = random.choices(viewports, weights, k=1)[0]
-            return chosen_viewport
-
-        def get_random_geolocation():
-        # Central geolocation coordinates for Chicago
-            base_lat, base_lon = 41.8781, -87.6298
-            geolocations = [
-                {'latitude': base_lat, 'longitude': base_lon},  # Main address
-                {'latitude': base_lat + 0.05, 'longitude': base_lon + 0.05},  # Some miles north-east
-                {'latitude': base_lat - 0.05, 'longitude': base_lon - 0.05},  # Some miles south-west
-                {'latitude': base_lat + 0.08, 'longitude': base_lon - 0.08},  # Some miles north-west
-            ]
-            weights = [66, 11, 11, 12]  # Weights as per your description
-            chosen_geolocation = random.choices(geolocations, weights, k=1)[0]
-            return chosen_geolocation
-        
+    @timed("lifecycle")
+    async def start_playwright(self):
+        """Start the Playwright driver if it is not already running."""
         if not self.playwright:
             self.playwright = await async_playwright().start()
+        return self.playwright
 
-        viewport = get_random_viewport()
-        geolocation = get_random_geolocation()
-        user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
-
-        self.browser = await self.playwright.chromium.launch(
-            headless=False,
-            args=[f'--user-agent={user_agent}'],
-            proxy={
-                "server": "http://45.203.245.56:7777",
-                "username": "lu9118235",
-                "password": "dcPbzD"
-            }
-        )
-        self.context = await self.browser.new_context(
-            viewport=viewport,
-            geolocation=geolocation,
-            permissions=['geolocation']
+    @timed("lifecycle")
+    async def new_browser(self):
+        """Launch a new Chromium process on the running driver using the manager's launch profile.
+
+        The process is tagged with a unique id so the ResourceMonitor can find and measure its tree.
+        """
+        options = launch_options(self.launch_profile)
+        browser_id = new_browser_id()
+        options["args"] = [*options.get("args", []), browser_id_arg(browser_id)]
+        browser = await self.playwright.chromium.launch(**options)
+        get_resource_monitor().track(browser_id, browser)
+        return browser
+
+    @timed("lifecycle")
+    async def new_context(self, browser, storage_state=None, **options):
+        """Open an isolated context on `browser` with a randomized viewport and geolocation.
+
+        Args:
+            browser (Browser): The browser to open the context on.
+            storage_state (Optional[dict]): Saved cookies/local storage to restore into the context.
+            **options: Extra keyword arguments for `browser.new_context`, e.g. HAR recording.
+        """
+        return await browser.new_context(
+            viewport=get_random_viewport(),
+            geolocation=get_random_geolocation(),
+            permissions=['geolocation'],
+            storage_state=storage_state,
+            **options
         )
+
+    @timed("lifecycle")
+    async def launch_browser(self, storage_state=None, route_filter=None):
+        self.route_filter = route_filter
+        context_options = {}
+        if self.har_mode == "record":
+            # Playwright writes the archive when the context is closed. It holds the login exchange
+            # (password, cookies, auth headers), so it goes in an owner-only directory
+            os.makedirs(os.path.dirname(os.path.abspath(self.har_path)), mode=0o700, exist_ok=True)
+            context_options = {"record_har_path": self.har_path, "record_har_mode": "full"}
+
+        if self.pool:
+            # Lease a context from a warm browser instead of cold-starting one
+            self.context = await self.pool.acquire(storage_state=storage_state, **context_options)
+        else:
+            await self.start_playwright()
+            self.browser = await self.new_browser()
+            self.context = await self.new_context(self.browser, storage_state=storage_state, **context_options)
+
+        if self.har_mode == "replay":
+            # Serve every request from the archive; anything it does not contain is aborted, never fetched
+            await self.context.route_from_har(self.har_path, not_found="abort")
+
+        # Registered after the HAR route so it gets the first look at each request
+        if route_filter:
+            await route_filter.attach(self.context)
+
+        # The task's metrics (and the GUI) follow the memory and CPU use of the browser it runs in
+        self._watched = (self.context.browser, current_recorder())
+        get_resource_monitor().watch(*self._watched)
         return self.context
 
+    def _har_recorded(self):
+        """Restrict the archive Playwright just wrote to its owner, like the session files."""
+        try:
+            os.chmod(self.har_path, 0o600)
+        except OSError as e:
+            logger.warning(f"Could not restrict permissions of {self.har_path}: {e}")
+        logger.info(f"HAR recorded to {self.har_path}.")
+
+    def _unwatch(self):
+        if self._watched:
+            get_resource_monitor().unwatch(*self._watched)
+            self._watched = None
+
+    def needs_recycle(self):
+        """True if the ResourceMonitor flagged the browser of the current context."""
+        return self.context is not None and get_resource_monitor().should_recycle(self.context.browser)
+
+    @timed("lifecycle")
+    async def recycle_if_needed(self, page, on_state=None, ready_selector=None, timeout=15000):
+        """
+        Move the task to a fresh browser once its current one passed the ResourceMonitor's limits.
+
+        Call it where the task can afford a reload, e.g. between phases. The context's storage state
+        is saved first (and handed to `on_state` so the caller can persist it), the old context is
+        released, and a new one is opened with that state and navigated back to the page's URL.
+
+        Args:
+            page (Page): The task's current page.
+            on_state (Optional[Callable[[dict], None]]): Receives the saved storage state.
+            ready_selector (Optional[str]): Element the next phase needs; waited for after the reload
+                so the phase starts on a ready page, not just a parsed one.
+            timeout (int): Milliseconds to wait for the reload and `ready_selector`.
+
+        Returns:
+            Page: `page` itself when nothing was recycled, otherwise the new page.
+        """
+        if not self.needs_recycle():
+            return page
+        if self.har_mode == "record":
+            logger.warning("Not recycling the browser while recording a HAR; the archive would be cut short.")
+            return page
+
+        url = page.url
+        storage_state = await self.context.storage_state()
+        if on_state:
+            on_state(storage_state)
+        logger.info(f"Recycling browser, resuming at {url}")
+
+        self._unwatch()
+        if self.pool:
+            # The pool already stopped leasing the flagged browser and closes it with its last context
+            await self.pool.release(self.context)
+        else:
+            await self.context.close()
+            await self.browser.close()
+            self.browser = None
+        self.context = None
+
+        await self.launch_browser(storage_state=storage_state, route_filter=self.route_filter)
+        page = await self.context.new_page()
+        if url and url != "about:blank":
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            if ready_selector:
+                await page.wait_for_selector(as_selector(ready_selector), state="attached", timeout=timeout)
+        return page
+
+    @timed("lifecycle")
     async def close_browser(self):
-        if not self.keep_open:  # Only close if keep_open is False
+        """
+        Give back or close what launch_browser opened; call it from a `finally` so failures do too.
+
+        A pooled context is always released, `keep_open` only means the warm browser keeps running
+        in the pool. Without a pool, `keep_open` leaves the whole browser open for inspection.
+        """
+        self._unwatch()
+        if self.pool:
             if self.context:
+                await self.pool.release(self.context)
+                self.context = None
+                if self.har_mode == "record":
+                    self._har_recorded()
+            return
+
+        if self.keep_open:
+            if self.har_mode == "record" and self.context:
+                # The HAR is only written when its context closes, so a recording can't stay open
                 await self.context.close()
                 self.context = None
+                self._har_recorded()
+            logger.info("Browser remains open for testing purposes.")
+            return
 
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
+        if self.context:
+            await self.context.close()
+            self.context = None
+            if self.har_mode == "record":
+                self._har_recorded()
 
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
-        else:
-            print("Browser remains open for testing purposes.")
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
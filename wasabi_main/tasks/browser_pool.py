@@ -0,0 +1,203 @@
+# browser_pool.py
+import asyncio
+import contextvars
+import logging
+import time
+import weakref
+from tasks.browser_manager import BrowserManager
+from tasks.common.launch_profiles import get_launch_profile
+from tasks.common.metrics import timed
+from tasks.common.resource_monitor import get_resource_monitor
+from tasks.common.runtime import get_runtime
+
+logger = logging.getLogger(__name__)
+
+
+class PooledBrowser:
+    """Bookkeeping for one warm Chromium process owned by a BrowserPool."""
+    def __init__(self, browser):
+        self.browser = browser
+        self.uses = 0
+        self.contexts = set()
+        self.last_used = time.monotonic()
+        self.retiring = False  # Set once max_uses or a resource limit is reached; closed when its last context is released
+
+    @property
+    def healthy(self):
+        if get_resource_monitor().should_recycle(self.browser):
+            self.retiring = True  # Over its memory/CPU limits
+        return not self.retiring and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Keeps warm Chromium processes on a single Playwright driver and leases out isolated contexts.
+
+    Each task gets its own BrowserContext (cookies, storage and cache are not shared), so the
+    per-task startup cost is one `new_context` call instead of a driver and browser launch.
+    Browsers are health-checked on every acquire, recycled after `max_uses` leases and evicted
+    after `idle_timeout` seconds without a context, down to `min_warm` browsers.
+    """
+    def __init__(self, size=2, min_warm=1, max_uses=50, contexts_per_browser=4, idle_timeout=300, manager=None):
+        self.size = size
+        self.min_warm = min(min_warm, size)
+        self.max_uses = max_uses
+        self.contexts_per_browser = contexts_per_browser
+        self.idle_timeout = idle_timeout
+        self.manager = manager or BrowserManager()
+        self._browsers = []
+        self._leases = {}
+        self._available = asyncio.Condition()
+        self._reaper = None
+        self._closed = False
+
+    async def start(self):
+        """Start the driver and launch browsers up to `min_warm`."""
+        await self.manager.start_playwright()
+        async with self._available:
+            await self._top_up()
+        if self._reaper is None:
+            # Runs for the life of the pool: give it an empty context so it doesn't inherit the log tags and
+            # metrics recorder of whichever task happened to start the pool
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_idle(), context=contextvars.Context())
+
+    @timed("lifecycle", name="pool.acquire")
+    async def acquire(self, storage_state=None, **context_options):
+        """Lease a fresh context from the least loaded healthy browser, launching one if needed.
+
+        Args:
+            storage_state (Optional[dict]): Saved cookies/local storage to restore into the context.
+            **context_options: Extra options for the new context, e.g. HAR recording.
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed.")
+        if self._reaper is None:
+            await self.start()
+
+        async with self._available:
+            while True:
+                await self._drop_unhealthy()
+                slot = self._pick()
+                if slot is None and len(self._browsers) < self.size:
+                    slot = await self._launch()
+                if slot is not None:
+                    break
+                await self._available.wait()
+
+            context = await self.manager.new_context(slot.browser, storage_state=storage_state, **context_options)
+            slot.uses += 1
+            slot.contexts.add(context)
+            if slot.uses >= self.max_uses:
+                slot.retiring = True
+            self._leases[context] = slot
+            return context
+
+    @timed("lifecycle", name="pool.release")
+    async def release(self, context):
+        """Close a leased context and return its browser slot to the pool."""
+        slot = self._leases.pop(context, None)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled context: {e}")
+
+        async with self._available:
+            if slot:
+                slot.contexts.discard(context)
+                slot.last_used = time.monotonic()
+                if not slot.healthy and not slot.contexts:
+                    await self._close_slot(slot)
+                    await self._top_up()
+            self._available.notify_all()
+
+    def stats(self):
+        return {
+            "browsers": len(self._browsers),
+            "leased_contexts": len(self._leases),
+            "uses": [slot.uses for slot in self._browsers],
+            "rss": [getattr(get_resource_monitor().usage(slot.browser), "rss", None) for slot in self._browsers]
+        }
+
+    async def close(self):
+        """Close every browser and stop the driver."""
+        self._closed = True
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        async with self._available:
+            for slot in list(self._browsers):
+                await self._close_slot(slot)
+            self._leases.clear()
+            self._available.notify_all()
+        if self.manager.playwright:
+            await self.manager.playwright.stop()
+            self.manager.playwright = None
+
+    def _pick(self):
+        candidates = [slot for slot in self._browsers
+                      if slot.healthy and len(slot.contexts) < self.contexts_per_browser]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda slot: len(slot.contexts))
+
+    async def _launch(self):
+        slot = PooledBrowser(await self.manager.new_browser())
+        self._browsers.append(slot)
+        return slot
+
+    async def _top_up(self):
+        missing = self.min_warm - len(self._browsers)
+        if missing > 0:
+            browsers = await asyncio.gather(*(self.manager.new_browser() for _ in range(missing)))
+            self._browsers.extend(PooledBrowser(browser) for browser in browsers)
+
+    async def _drop_unhealthy(self):
+        for slot in list(self._browsers):
+            if not slot.browser.is_connected():
+                logger.warning("Pooled browser disconnected, dropping it from the pool.")
+                for context in slot.contexts:
+                    self._leases.pop(context, None)
+                self._browsers.remove(slot)
+
+    async def _close_slot(self, slot):
+        if slot in self._browsers:
+            self._browsers.remove(slot)
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+
+    async def _reap_idle(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30))
+            async with self._available:
+                now = time.monotonic()
+                for slot in list(self._browsers):
+                    if not slot.contexts and not slot.healthy:
+                        logger.info("Closing idle pooled browser that is over its resource limits.")
+                        await self._close_slot(slot)
+                        continue
+                    if len(self._browsers) <= self.min_warm:
+                        break
+                    if not slot.contexts and now - slot.last_used > self.idle_timeout:
+                        logger.info("Evicting idle pooled browser.")
+                        await self._close_slot(slot)
+                await self._top_up()
+
+
+_pools = weakref.WeakKeyDictionary()
+
+
+def get_browser_pool(launch_profile=None, **kwargs):
+    """Return the BrowserPool for `launch_profile` bound to the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    profile_name = get_launch_profile(launch_profile).name
+    loop_pools = _pools.setdefault(loop, {})
+    pool = loop_pools.get(profile_name)
+    if pool is None or pool._closed:
+        pool = BrowserPool(manager=BrowserManager(launch_profile=profile_name), **kwargs)
+        loop_pools[profile_name] = pool
+        runtime = get_runtime()
+        if runtime.loop is loop:
+            runtime.add_shutdown_hook(pool.close)
+    return pool
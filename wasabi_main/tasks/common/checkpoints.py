@@ -0,0 +1,108 @@
+# checkpoints.py
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "checkpoints")
+
+
+class CheckpointStore:
+    """
+    Persists task progress so a restarted task can resume where the last run stopped.
+
+    A checkpoint holds the keys of the steps and phases that completed, the page URL after the
+    last one and the context's storage state at that point. Files are written atomically and
+    readable by the owner only, since the storage state holds session cookies.
+    """
+    def __init__(self, root=DEFAULT_CHECKPOINT_DIR, max_age=24 * 3600):
+        self.root = root
+        self.max_age = max_age
+
+    def path_for(self, key):
+        safe_key = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+        return os.path.join(self.root, f"{safe_key}.json")
+
+    def load(self, key):
+        """Return the saved checkpoint data for `key`, or None if there is none or it is too old."""
+        try:
+            with open(self.path_for(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable checkpoint {key}: {e}")
+            self.clear(key)
+            return None
+        if time.time() - data.get("saved_at", 0) > self.max_age:
+            logger.info(f"Checkpoint {key} expired.")
+            self.clear(key)
+            return None
+        return data
+
+    def save(self, key, data):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = f"{path}.tmp"
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            json.dump({**data, "saved_at": time.time()}, f)
+        os.replace(tmp_path, path)
+
+    def clear(self, key):
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def open(self, key, resume=True):
+        """Start tracking a task run, picking up the saved checkpoint unless `resume` is False."""
+        data = self.load(key) if resume else None
+        if not resume:
+            self.clear(key)
+        return TaskCheckpoint(self, key, data)
+
+
+class TaskCheckpoint:
+    """
+    Progress of one task run.
+
+    Completed keys are "<plan>/<step id>" for steps run by the step engine and "phase/<name>" for
+    task phases. Every `mark_done` saves the checkpoint right away, together with the page URL and
+    storage state, so a crash loses at most the step that was running.
+    """
+    def __init__(self, store: CheckpointStore, key, data=None):
+        data = data or {}
+        self.store = store
+        self.key = key
+        self.completed = list(data.get("completed", []))
+        self.url = data.get("url")
+        self.storage_state = data.get("storage_state")
+        self.resumed = bool(self.completed)  # True when this run continues an earlier one
+
+    def is_done(self, step_key):
+        return step_key in self.completed
+
+    def has_plan(self, plan_name):
+        """True if any step of `plan_name` completed."""
+        return any(step_key.startswith(f"{plan_name}/") for step_key in self.completed)
+
+    async def mark_done(self, step_key, page=None):
+        if step_key not in self.completed:
+            self.completed.append(step_key)
+        if page is not None:
+            self.url = page.url
+            self.storage_state = await page.context.storage_state()
+        await asyncio.to_thread(self.store.save, self.key, {
+            "completed": self.completed,
+            "url": self.url,
+            "storage_state": self.storage_state
+        })
+
+    def clear(self):
+        """Forget the progress, e.g. once the task finished successfully."""
+        self.completed, self.url, self.storage_state, self.resumed = [], None, None, False
+        self.store.clear(self.key)
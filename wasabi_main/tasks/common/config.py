@@ -0,0 +1,87 @@
+# config.py
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+DEFAULT_CONFIG_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # wasabi_main/tasks
+
+
+class ConfigError(ValueError):
+    """Raised when a task's configuration is invalid or a file it needs is missing."""
+
+
+class ConfigService:
+    """
+    Loads the JSON configuration files that ship next to the tasks (locations, user profiles).
+
+    Paths are relative to `root`, which defaults to the tasks package and can be moved with the
+    WASABI_CONFIG_ROOT environment variable. Each file is parsed once and served from memory until
+    its modification time or size changes, so dialogs and task starts don't re-read the disk. The
+    cache is shared by the GUI thread and the task runtime, hence the lock.
+    """
+    def __init__(self, root=None):
+        self.root = root or os.environ.get("WASABI_CONFIG_ROOT", DEFAULT_CONFIG_ROOT)
+        self._cache: Dict[str, tuple] = {}  # Path -> (mtime_ns, size, data)
+        self._indexes: Dict[tuple, tuple] = {}  # (path, key) -> (mtime_ns, size, index)
+        self._lock = threading.Lock()
+
+    def path(self, relative_path):
+        return os.path.join(self.root, *relative_path.replace("\\", "/").split("/"))
+
+    def _load(self, path):
+        stat = os.stat(path)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            cached = (stat.st_mtime_ns, stat.st_size, data)
+            self._cache[path] = cached
+            return cached
+
+    def load_json(self, relative_path) -> Any:
+        """
+        Return the parsed contents of a JSON file under the config root.
+
+        The returned object is shared with other callers and must not be modified.
+        """
+        return self._load(self.path(relative_path))[2]
+
+    def index(self, relative_path, list_key, field) -> Dict[str, dict]:
+        """
+        Index the list `list_key` of a JSON file by each item's `field`, e.g. profiles by profile_name.
+
+        The index is rebuilt together with the file's cache entry.
+        """
+        path = self.path(relative_path)
+        mtime_ns, size, data = self._load(path)
+        cache_key = (path, list_key, field)
+        with self._lock:
+            cached = self._indexes.get(cache_key)
+            if cached and cached[:2] == (mtime_ns, size):
+                return cached[2]
+            index = {item[field]: item for item in data[list_key]}
+            self._indexes[cache_key] = (mtime_ns, size, index)
+            return index
+
+    def exists(self, relative_path):
+        return os.path.exists(self.path(relative_path))
+
+    def first_existing(self, *relative_paths):
+        """The first of `relative_paths` that exists, falling back to the last one."""
+        for relative_path in relative_paths:
+            if self.exists(relative_path):
+                return relative_path
+        return relative_paths[-1]
+
+
+_config: Optional[ConfigService] = None
+
+
+def get_config() -> ConfigService:
+    global _config
+    if _config is None:
+        _config = ConfigService()
+    return _config
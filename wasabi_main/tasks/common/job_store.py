@@ -0,0 +1,170 @@
+# job_store.py
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "jobs.sqlite3")
+
+JOB_FIELDS = ("title", "company", "location", "salary", "posted", "url")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    site TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    salary TEXT,
+    posted TEXT,
+    url TEXT,
+    query TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_site_key ON jobs (site, job_key);
+CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (site, first_seen);
+"""
+
+
+class JobStore:
+    """
+    SQLite store of parsed job postings, unique per (site, job_key).
+
+    `ingest` writes a whole batch in one transaction and returns only the postings it had not seen
+    before; postings already stored just get their last_seen bumped. The connection is shared by
+    every task and guarded by a lock, and the async variants run on a worker thread so a write
+    never blocks the event loop.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("WASABI_JOB_DB", DEFAULT_JOB_DB)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def ingest(self, site, records: Iterable[Dict], query=None) -> List[Dict]:
+        """
+        Store a batch of postings and return the ones that are new.
+
+        Args:
+            site (str): Site the postings come from, e.g. "indeed".
+            records (Iterable[Dict]): Parsed postings, each with a "job_key" and any of JOB_FIELDS.
+            query (Optional[str]): Search that produced the postings, stored with new rows.
+
+        Returns:
+            List[Dict]: The records whose job_key was not stored yet, in input order.
+        """
+        batch = {}
+        for record in records:
+            if record.get("job_key"):
+                batch.setdefault(record["job_key"], record)  # Result pages repeat sponsored cards
+        if not batch:
+            return []
+
+        now = time.time()
+        keys = list(batch)
+        with self._lock, self._conn:
+            known = set()
+            for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                known.update(row[0] for row in self._conn.execute(
+                    f"SELECT job_key FROM jobs WHERE site = ? AND job_key IN ({placeholders})", (site, *chunk)))
+
+            new = [record for key, record in batch.items() if key not in known]
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (site, job_key, title, company, location, salary, posted, url, query,"
+                " first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(site, record["job_key"], *(record.get(name) for name in JOB_FIELDS), query, now, now)
+                 for record in new]
+            )
+            self._conn.executemany(
+                "UPDATE jobs SET last_seen = ?, seen_count = seen_count + 1 WHERE site = ? AND job_key = ?",
+                [(now, site, key) for key in known]
+            )
+        return new
+
+    async def ingest_async(self, site, records: Iterable[Dict], query=None) -> List[Dict]:
+        """`ingest` on a worker thread."""
+        return await asyncio.to_thread(self.ingest, site, list(records), query)
+
+    def count(self, site=None):
+        with self._lock:
+            if site is None:
+                return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE site = ?", (site,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobIngestor:
+    """
+    Buffers postings from a crawl and writes them to a JobStore in batches.
+
+    Use as an async context manager so the last partial batch is flushed:
+
+        async with JobIngestor(store, "indeed", query) as ingestor:
+            await ingestor.add_many(records)
+    """
+    def __init__(self, store: JobStore, site, query=None, batch_size=50):
+        self.store = store
+        self.site = site
+        self.query = query
+        self.batch_size = batch_size
+        self.pending = []
+        self.new_count = 0
+        self.total_count = 0
+
+    async def add(self, record):
+        await self.add_many([record])
+
+    async def add_many(self, records):
+        self.pending.extend(records)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def add_page(self, records):
+        """Write a crawled page right away (with anything still buffered) and return the new postings."""
+        self.pending.extend(records)
+        return await self.flush()
+
+    async def flush(self):
+        """Write the buffered postings in one transaction and return the new ones."""
+        if not self.pending:
+            return []
+        batch, self.pending = self.pending, []
+        new = await self.store.ingest_async(self.site, batch, self.query)
+        self.total_count += len(batch)
+        self.new_count += len(new)
+        return new
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to store the last batch of {self.site} postings: {e}")
+
+
+_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """Process-wide JobStore, opened on first use."""
+    global _store
+    if _store is None:
+        _store = JobStore()
+    return _store
@@ -0,0 +1,87 @@
+# launch_profiles.py
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+DEFAULT_PROXY_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "proxies.json")
+
+
+@dataclass(frozen=True)
+class LaunchProfile:
+    """Browser launch options a task can select by name."""
+    name: str
+    headless: bool = False
+    args: Tuple[str, ...] = ()
+    user_agent: Optional[str] = DEFAULT_USER_AGENT
+    proxy: Optional[str] = None  # Name of an entry in the proxy config, None for a direct connection
+
+
+LAUNCH_PROFILES = {
+    "headed": LaunchProfile("headed"),
+    "headless": LaunchProfile("headless", headless=True),
+    "headed_proxy": LaunchProfile("headed_proxy", proxy="default"),
+    "headless_proxy": LaunchProfile("headless_proxy", headless=True, proxy="default")
+}
+
+DEFAULT_LAUNCH_PROFILE = "headed"
+
+
+def load_proxy(name):
+    """
+    Look up proxy settings outside the source tree.
+
+    The "default" proxy can come from WASABI_PROXY_SERVER / WASABI_PROXY_USERNAME / WASABI_PROXY_PASSWORD;
+    any named proxy can be defined in the JSON file at WASABI_PROXY_CONFIG (data/proxies.json by default)
+    as {"<name>": {"server": ..., "username": ..., "password": ...}}.
+
+    Raises:
+        KeyError: If the proxy is not configured. A profile that asks for a proxy never silently
+            falls back to a direct connection.
+    """
+    if name == "default" and os.environ.get("WASABI_PROXY_SERVER"):
+        proxy = {"server": os.environ["WASABI_PROXY_SERVER"]}
+        if os.environ.get("WASABI_PROXY_USERNAME"):
+            proxy["username"] = os.environ["WASABI_PROXY_USERNAME"]
+            proxy["password"] = os.environ.get("WASABI_PROXY_PASSWORD", "")
+        return proxy
+
+    path = os.environ.get("WASABI_PROXY_CONFIG", DEFAULT_PROXY_CONFIG)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            proxies = json.load(f)
+    except FileNotFoundError:
+        proxies = {}
+    if name not in proxies:
+        raise KeyError(f"Proxy '{name}' is not configured (checked environment and {path}).")
+    return proxies[name]
+
+
+def get_launch_profile(name=None):
+    return LAUNCH_PROFILES[name or DEFAULT_LAUNCH_PROFILE]
+
+
+def launch_options(profile: LaunchProfile):
+    """Build the keyword arguments for `chromium.launch` from a profile."""
+    args = list(profile.args)
+    if profile.user_agent:
+        args.append(f'--user-agent={profile.user_agent}')
+    options = {"headless": profile.headless, "args": args}
+    if profile.proxy:
+        options["proxy"] = load_proxy(profile.proxy)
+        logger.info(f"Launching '{profile.name}' through proxy {options['proxy']['server']}")
+    return options
+
+
+def launch_profile_input():
+    """configuration_spec input shared by every task for picking a launch profile."""
+    return {
+        "key": "launch_profile",
+        "label": "Launch Profile",
+        "type": "dropdown",
+        "options": list(LAUNCH_PROFILES)
+    }
@@ -0,0 +1,175 @@
+# logs.py
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "logs")
+CONSOLE_FORMAT = "%(asctime)s - %(levelname)s - %(name)s [task %(task_id)s, %(step)s] - %(message)s"
+
+# Overridable per run with WASABI_LOG_LEVELS="tasks.subtasks.actions=DEBUG,tasks.browser_pool=WARNING"
+DEFAULT_MODULE_LEVELS = {
+    "asyncio": "WARNING",
+}
+
+_task_id = contextvars.ContextVar("wasabi_log_task_id", default=None)
+_step = contextvars.ContextVar("wasabi_log_step", default=None)
+
+
+@contextmanager
+def log_context(task_id=None, step=None):
+    """Tag every record logged inside the block (and the tasks it spawns) with a task ID and/or step."""
+    tokens = []
+    if task_id is not None:
+        tokens.append((_task_id, _task_id.set(task_id)))
+    if step is not None:
+        tokens.append((_step, _step.set(step)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the task ID and step of the logging coroutine onto the record."""
+    def filter(self, record):
+        task_id = _task_id.get()
+        step = _step.get()
+        record.task_id = task_id if task_id is not None else "-"
+        record.step = step if step is not None else "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, task_id, step and message."""
+    def format(self, record):
+        return json.dumps({
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "task_id": getattr(record, "task_id", "-"),
+            "step": getattr(record, "step", "-"),
+            "message": record.getMessage()
+        })
+
+
+class TaskFileHandler(logging.Handler):
+    """
+    Writes each task's records to a file of its own, rotated by size.
+
+    Files are named `<run stamp>-task<id>.jsonl` so task IDs restarting with every process do not
+    mix runs; records logged outside a task go to `wasabi.log`. Only the `max_open` most recently
+    used files are kept open.
+    """
+    def __init__(self, log_dir=DEFAULT_LOG_DIR, max_bytes=5 * 1024 * 1024, backup_count=3, max_open=32):
+        super().__init__()
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_open = max_open
+        self.run_stamp = time.strftime("%Y%m%d-%H%M%S")
+        self._handlers = OrderedDict()
+        os.makedirs(log_dir, exist_ok=True)
+
+    def _handler_for(self, task_id):
+        handler = self._handlers.get(task_id)
+        if handler is not None:
+            self._handlers.move_to_end(task_id)
+            return handler
+        if task_id == "-":
+            path, formatter = os.path.join(self.log_dir, "wasabi.log"), logging.Formatter(CONSOLE_FORMAT)
+        else:
+            path, formatter = os.path.join(self.log_dir, f"{self.run_stamp}-task{task_id}.jsonl"), JsonFormatter()
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=self.max_bytes, backupCount=self.backup_count,
+                                                       encoding="utf-8", delay=True)
+        handler.setFormatter(formatter)
+        self._handlers[task_id] = handler
+        while len(self._handlers) > self.max_open:
+            self._handlers.popitem(last=False)[1].close()
+        return handler
+
+    def emit(self, record):
+        try:
+            self._handler_for(getattr(record, "task_id", "-")).handle(record)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        for handler in self._handlers.values():
+            handler.close()
+        self._handlers.clear()
+        super().close()
+
+
+def parse_module_levels(spec):
+    """"a.b=DEBUG,c=WARNING" -> {"a.b": "DEBUG", "c": "WARNING"}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_listener = None
+
+
+def configure_logging(level=None, module_levels=None, log_dir=DEFAULT_LOG_DIR, console=True):
+    """
+    Route all logging through a queue drained by a background thread.
+
+    The root logger only gets a QueueHandler, so a log call on the event loop costs a put on an
+    in-memory queue; formatting, console output and file writes happen on the listener thread.
+    Calling it again only updates the levels.
+
+    Args:
+        level (Optional[str]): Root level, WASABI_LOG_LEVEL or INFO if None.
+        module_levels (Optional[dict]): Logger name -> level, applied over DEFAULT_MODULE_LEVELS
+            and WASABI_LOG_LEVELS.
+        log_dir (str): Directory for the per-task log files.
+        console (bool): Also write records to stderr.
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel((level or os.environ.get("WASABI_LOG_LEVEL") or "INFO").upper())
+    levels = {**DEFAULT_MODULE_LEVELS, **parse_module_levels(os.environ.get("WASABI_LOG_LEVELS")), **(module_levels or {})}
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+    if _listener is not None:
+        return
+
+    handlers = [TaskFileHandler(log_dir)]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Filters run on the logging thread, where the task's context variables are still visible
+    queue_handler.addFilter(ContextFilter())
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush the queue and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -0,0 +1,200 @@
+# metrics.py
+import asyncio
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Any, Dict, Optional
+
+DEFAULT_METRICS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "metrics")
+
+# Span kinds. wait/ipc/pause split where an action's time goes; the others group larger units of work.
+SPAN_KINDS = ("task", "phase", "lifecycle", "action", "wait", "ipc", "pause")
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    start: float  # Wall clock, seconds since the epoch
+    duration: float  # Seconds
+    task_id: Any = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class MetricsRecorder:
+    """Collects the spans of one task run (or of work done outside any task)."""
+    def __init__(self, task_id=None, task_name=None, listener=None, max_spans=None):
+        self.task_id = task_id
+        self.task_name = task_name
+        self.spans = deque(maxlen=max_spans) if max_spans else []  # Capped: only the newest max_spans are kept
+        self.phase = None  # Name of the phase currently running, for status displays
+        self.listener = listener  # Called as listener(task_id, fields) when the phase or resource use changes
+        self.resources = {}  # Latest browser RSS (bytes) and CPU (%) sampled by the ResourceMonitor, and peak RSS
+
+    def set_phase(self, name):
+        self.phase = name
+        if self.listener:
+            self.listener(self.task_id, {"phase": name, "timing": self.summary_text()})
+
+    def set_resources(self, rss, cpu_percent):
+        peak_rss = max(self.resources.get("peak_rss", 0), rss)
+        self.resources = {"rss": rss, "cpu_percent": cpu_percent, "peak_rss": peak_rss}
+        if self.listener:
+            self.listener(self.task_id, {"resources": self.resources_text()})
+
+    def resources_text(self):
+        """e.g. "812 MB, 14% CPU" for the browser the task runs in."""
+        if not self.resources:
+            return ""
+        return f"{self.resources['rss'] / 2**20:.0f} MB, {self.resources['cpu_percent']:.0f}% CPU"
+
+    def record(self, name, kind, duration, start=None, **attrs):
+        self.spans.append(Span(name, kind, start if start is not None else time.time() - duration,
+                               duration, self.task_id, attrs))
+
+    def totals(self):
+        """Total seconds and span count per (kind, name)."""
+        totals = defaultdict(lambda: [0.0, 0])
+        for span in self.spans:
+            entry = totals[(span.kind, span.name)]
+            entry[0] += span.duration
+            entry[1] += 1
+        return totals
+
+    def summary(self):
+        """Total seconds per span kind."""
+        by_kind = defaultdict(float)
+        for span in self.spans:
+            by_kind[span.kind] += span.duration
+        return dict(by_kind)
+
+    def summary_text(self):
+        """Short one-line summary, e.g. for the GUI task table."""
+        summary = self.summary()
+        parts = [f"{kind} {summary[kind]:.1f}s" for kind in ("task", "wait", "ipc", "pause", "lifecycle") if kind in summary]
+        return ", ".join(parts)
+
+
+_current = contextvars.ContextVar("wasabi_metrics", default=None)
+# Nothing exports the spans of background work (pool reaper, resource sampler), so in a long-running
+# daemon this recorder only keeps the most recent ones
+FALLBACK_MAX_SPANS = 1000
+_fallback = MetricsRecorder(max_spans=FALLBACK_MAX_SPANS)
+
+
+def current_recorder() -> MetricsRecorder:
+    """The recorder of the running task, or a process-wide fallback outside tasks."""
+    return _current.get() or _fallback
+
+
+def use_recorder(recorder):
+    """Make `recorder` current for this context (each asyncio task has its own). Returns a reset token."""
+    return _current.set(recorder)
+
+
+def reset_recorder(token):
+    _current.reset(token)
+
+
+@contextmanager
+def span(name, kind, **attrs):
+    """Time the enclosed block and record it on the current recorder."""
+    start_wall, start = time.time(), time.perf_counter()
+    try:
+        yield
+    finally:
+        current_recorder().record(name, kind, time.perf_counter() - start, start=start_wall, **attrs)
+
+
+@contextmanager
+def phase(name):
+    """Time a task phase and expose it as the recorder's current phase."""
+    recorder = current_recorder()
+    recorder.set_phase(name)
+    with span(name, "phase"):
+        yield
+
+
+async def timed_sleep(seconds, name="pause"):
+    """asyncio.sleep recorded as a deliberate pause."""
+    with span(name, "pause"):
+        await asyncio.sleep(seconds)
+
+
+def timed(kind, name=None):
+    """Decorator recording each call of an async function as a span of `kind`."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(span_name, kind):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MetricsExporter:
+    """
+    Writes finished task recorders to disk.
+
+    Every span is appended to `spans.jsonl`; `metrics.prom` is rewritten with totals across all
+    exported tasks in Prometheus text format, for a node_exporter textfile collector or a quick look.
+    """
+    def __init__(self, directory=None):
+        self.directory = directory or os.environ.get("WASABI_METRICS_DIR", DEFAULT_METRICS_DIR)
+        self._totals = defaultdict(lambda: [0.0, 0])
+        self._peak_rss = {}  # Task name -> highest browser RSS seen
+        self._lock = threading.Lock()
+
+    def export(self, recorder: MetricsRecorder):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            with open(os.path.join(self.directory, "spans.jsonl"), "a", encoding="utf-8") as f:
+                for item in recorder.spans:
+                    record = asdict(item)
+                    record["task_name"] = recorder.task_name
+                    f.write(json.dumps(record, default=str) + "\n")
+
+            for key, (seconds, count) in recorder.totals().items():
+                self._totals[key][0] += seconds
+                self._totals[key][1] += count
+            if recorder.resources:
+                name = recorder.task_name or "task"
+                self._peak_rss[name] = max(self._peak_rss.get(name, 0), recorder.resources["peak_rss"])
+            self._write_prometheus()
+
+    def _write_prometheus(self):
+        lines = [
+            "# HELP wasabi_span_seconds Time spent in instrumented WASABI spans.",
+            "# TYPE wasabi_span_seconds summary"
+        ]
+        for (kind, name), (seconds, count) in sorted(self._totals.items()):
+            labels = f'kind="{kind}",name="{name}"'
+            lines.append(f"wasabi_span_seconds_sum{{{labels}}} {seconds:.6f}")
+            lines.append(f"wasabi_span_seconds_count{{{labels}}} {count}")
+        if self._peak_rss:
+            lines.append("# HELP wasabi_browser_peak_rss_bytes Highest browser memory use seen by a task.")
+            lines.append("# TYPE wasabi_browser_peak_rss_bytes gauge")
+            for task_name, rss in sorted(self._peak_rss.items()):
+                lines.append(f'wasabi_browser_peak_rss_bytes{{task_name="{task_name}"}} {rss}')
+        path = os.path.join(self.directory, "metrics.prom")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(f"{path}.tmp", path)
+
+
+_exporter: Optional[MetricsExporter] = None
+
+
+def get_exporter() -> MetricsExporter:
+    global _exporter
+    if _exporter is None:
+        _exporter = MetricsExporter()
+    return _exporter
@@ -0,0 +1,242 @@
+# resource_monitor.py
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+try:
+    import psutil
+except ImportError:  # Optional: without it browsers are neither measured nor recycled
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Passed to every Chromium we launch so its process tree can be found among the host's processes.
+# Chromium ignores switches it does not know.
+BROWSER_ID_ARG = "--wasabi-browser-id"
+
+
+def new_browser_id():
+    return uuid.uuid4().hex
+
+
+def browser_id_arg(browser_id):
+    return f"{BROWSER_ID_ARG}={browser_id}"
+
+
+@dataclass
+class ResourceLimits:
+    """When a browser is due for recycling. A limit of None is not checked."""
+    max_rss_mb: Optional[float] = 1536
+    max_cpu_percent: Optional[float] = 90
+    cpu_samples: int = 4  # Consecutive samples above max_cpu_percent before it counts
+
+    @classmethod
+    def from_env(cls):
+        def number(name, default):
+            value = os.environ.get(name)
+            if value is None:
+                return default
+            return float(value) if value.strip() else None
+
+        defaults = cls()
+        return cls(
+            max_rss_mb=number("WASABI_BROWSER_MAX_RSS_MB", defaults.max_rss_mb),
+            max_cpu_percent=number("WASABI_BROWSER_MAX_CPU", defaults.max_cpu_percent),
+            cpu_samples=int(os.environ.get("WASABI_BROWSER_CPU_SAMPLES", defaults.cpu_samples))
+        )
+
+
+@dataclass
+class BrowserUsage:
+    browser_id: str
+    rss: int  # Bytes, summed over the browser's process tree
+    cpu_percent: float  # Summed over the tree, so it can exceed 100 on several cores
+    processes: int
+    sampled_at: float
+
+
+class TrackedBrowser:
+    """Bookkeeping for one monitored browser."""
+    def __init__(self, browser_id, browser):
+        self.browser_id = browser_id
+        self.browser = browser
+        self.root = None  # psutil.Process of the browser's main process, once found
+        self.processes = {}  # pid -> psutil.Process, kept so cpu_percent measures since the last sample
+        self.usage: Optional[BrowserUsage] = None
+        self.cpu_strikes = 0
+        self.over_limit = None  # Reason, once a limit was passed
+        self.recorders = weakref.WeakSet()  # MetricsRecorders of the tasks currently leasing a context on it
+
+
+class ResourceMonitor:
+    """
+    Samples the memory and CPU use of every Chromium process tree launched by a BrowserManager.
+
+    Each browser is launched with a unique BROWSER_ID_ARG, which identifies its main process; the
+    renderer, GPU and utility processes are its children. Samples are taken every `interval`
+    seconds on a worker thread, passed to the MetricsRecorders of the tasks using the browser, and
+    checked against `limits`. A browser over a limit is flagged rather than killed: the pool stops
+    leasing it out and tasks recycle it at their next safe point (BrowserManager.recycle_if_needed).
+    Does nothing when psutil is not installed.
+    """
+    def __init__(self, interval=15.0, limits: Optional[ResourceLimits] = None):
+        self.interval = interval
+        self.limits = limits or ResourceLimits()
+        self._tracked: Dict[str, TrackedBrowser] = {}
+        self._ids = weakref.WeakKeyDictionary()  # Browser -> browser id
+        self._task = None
+        self._disabled_logged = False
+
+    @property
+    def available(self):
+        return psutil is not None
+
+    def track(self, browser_id, browser):
+        """Start monitoring a browser launched with `browser_id_arg(browser_id)`."""
+        self._tracked[browser_id] = TrackedBrowser(browser_id, browser)
+        self._ids[browser] = browser_id
+        browser.on("disconnected", lambda _browser: self.untrack(browser_id))
+        self.start()
+
+    def untrack(self, browser_id):
+        self._tracked.pop(browser_id, None)
+
+    def watch(self, browser, recorder):
+        """Report the usage of `browser` to a task's MetricsRecorder."""
+        tracked = self._lookup(browser)
+        if tracked is not None:
+            tracked.recorders.add(recorder)
+            if tracked.usage:
+                recorder.set_resources(tracked.usage.rss, tracked.usage.cpu_percent)
+
+    def unwatch(self, browser, recorder):
+        """Stop reporting to `recorder`, e.g. once the task gave its context back."""
+        tracked = self._lookup(browser)
+        if tracked is not None:
+            tracked.recorders.discard(recorder)
+
+    def usage(self, browser) -> Optional[BrowserUsage]:
+        tracked = self._lookup(browser)
+        return tracked.usage if tracked else None
+
+    def should_recycle(self, browser):
+        """True once `browser` passed one of the limits."""
+        tracked = self._lookup(browser)
+        return tracked is not None and tracked.over_limit is not None
+
+    def _lookup(self, browser):
+        browser_id = self._ids.get(browser) if browser is not None else None
+        return self._tracked.get(browser_id) if browser_id else None
+
+    def start(self):
+        """Start sampling on the running event loop, unless it already runs."""
+        if not self.available:
+            if not self._disabled_logged:
+                logger.info("psutil is not installed, browser resource monitoring is disabled.")
+                self._disabled_logged = True
+            return
+        if self._task is None or self._task.done():
+            # Started from inside the first task that launches a browser; an empty context keeps that
+            # task's log tags and metrics recorder out of the sampler, which outlives it
+            self._task = asyncio.get_running_loop().create_task(self._run(), context=contextvars.Context())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._tracked:
+                continue
+            tracked = list(self._tracked.values())
+            try:
+                # Walking the process table is blocking I/O; keep it off the event loop
+                samples = await asyncio.to_thread(self._sample_all, tracked)
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+                continue
+            for item, usage in zip(tracked, samples):
+                if usage is not None:
+                    self._apply(item, usage)
+
+    def _apply(self, tracked, usage):
+        tracked.usage = usage
+        for recorder in list(tracked.recorders):
+            recorder.set_resources(usage.rss, usage.cpu_percent)
+        if tracked.over_limit:
+            return
+
+        limits = self.limits
+        if limits.max_cpu_percent is not None and usage.cpu_percent > limits.max_cpu_percent:
+            tracked.cpu_strikes += 1
+        else:
+            tracked.cpu_strikes = 0
+        if limits.max_rss_mb is not None and usage.rss > limits.max_rss_mb * 2**20:
+            tracked.over_limit = f"RSS {usage.rss / 2**20:.0f} MB > {limits.max_rss_mb:.0f} MB"
+        elif tracked.cpu_strikes >= limits.cpu_samples:
+            tracked.over_limit = f"CPU above {limits.max_cpu_percent:.0f}% for {tracked.cpu_strikes} samples"
+        if tracked.over_limit:
+            logger.warning(f"Browser {tracked.browser_id[:8]} is due for recycling: {tracked.over_limit}")
+
+    def _sample_all(self, tracked):
+        missing = [item for item in tracked if item.root is None or not item.root.is_running()]
+        if missing:
+            roots = self._find_roots({item.browser_id for item in missing})
+            for item in missing:
+                item.root = roots.get(item.browser_id)
+                item.processes = {}
+        return [self._sample(item) if item.root else None for item in tracked]
+
+    def _find_roots(self, browser_ids):
+        """Main process of each browser id: the process with the marker whose parent lacks it."""
+        markers = {browser_id_arg(browser_id): browser_id for browser_id in browser_ids}
+        matches = {}
+        for proc in psutil.process_iter(["pid", "ppid", "cmdline"]):
+            for arg in proc.info["cmdline"] or ():
+                if arg in markers:
+                    matches[proc.pid] = (markers[arg], proc)
+                    break
+        roots = {}
+        for pid, (browser_id, proc) in matches.items():
+            if proc.info["ppid"] not in matches:
+                roots[browser_id] = proc
+        return roots
+
+    def _sample(self, tracked):
+        try:
+            tree = [tracked.root, *tracked.root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            tracked.root = None
+            return None
+        rss, cpu, alive = 0, 0.0, {}
+        for proc in tree:
+            proc = tracked.processes.get(proc.pid, proc)
+            try:
+                with proc.oneshot():
+                    rss += proc.memory_info().rss
+                    cpu += proc.cpu_percent(None)  # 0.0 on the first sample of a process
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            alive[proc.pid] = proc
+        tracked.processes = alive
+        return BrowserUsage(tracked.browser_id, rss, cpu, len(alive), time.time())
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_resource_monitor():
+    """The process-wide ResourceMonitor, with limits from the WASABI_BROWSER_* environment variables."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ResourceMonitor(
+                interval=float(os.environ.get("WASABI_MONITOR_INTERVAL", 15)),
+                limits=ResourceLimits.from_env()
+            )
+        return _monitor
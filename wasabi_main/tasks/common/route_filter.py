@@ -0,0 +1,122 @@
+# route_filter.py
+import fnmatch
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteRule:
+    """
+    One allow/block rule. A rule matches when the request's resource type is in `resource_types`
+    (any type if empty) and its URL matches the glob `url_pattern` (any URL if None).
+    """
+    action: str  # "allow" or "block"
+    resource_types: FrozenSet[str] = frozenset()
+    url_pattern: Optional[str] = None
+    _regex: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.action not in ("allow", "block"):
+            raise ValueError(f"Route rule action must be 'allow' or 'block', got '{self.action}'")
+        self.resource_types = frozenset(self.resource_types)
+        if self.url_pattern:
+            self._regex = re.compile(fnmatch.translate(self.url_pattern))
+
+    def matches(self, url, resource_type):
+        if self.resource_types and resource_type not in self.resource_types:
+            return False
+        return self._regex is None or bool(self._regex.match(url))
+
+
+class RouteFilter:
+    """
+    Request filter installed on a BrowserContext through `context.route`.
+
+    Rules are checked in order and the first match decides; unmatched requests get `default`.
+    Allowed requests fall through to any other route handlers (HAR replay, fixtures), blocked ones
+    are aborted before they reach the network. Allowed bytes are counted from Content-Length, so
+    chunked responses without it are not included; blocked requests are counted per resource
+    type since their size is never known.
+    """
+    def __init__(self, rules: List[RouteRule], default="allow", replace_networkidle=False):
+        self.rules = rules
+        self.default = default
+        self.replace_networkidle = replace_networkidle  # Let flows wait on DOM readiness instead of networkidle
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+        self.blocked_requests = Counter()
+
+    def is_allowed(self, url, resource_type):
+        for rule in self.rules:
+            if rule.matches(url, resource_type):
+                return rule.action == "allow"
+        return self.default == "allow"
+
+    async def attach(self, context):
+        await context.route("**/*", self._handle_route)
+        context.on("response", self._count_response)
+
+    async def detach(self, context):
+        await context.unroute("**/*", self._handle_route)
+        context.remove_listener("response", self._count_response)
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.is_allowed(request.url, request.resource_type):
+            await route.fallback()
+        else:
+            self.blocked_requests[request.resource_type] += 1
+            await route.abort("blockedbyclient")
+
+    def _count_response(self, response):
+        self.allowed_requests += 1
+        try:
+            self.allowed_bytes += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    def stats(self):
+        return {
+            "allowed_requests": self.allowed_requests,
+            "allowed_bytes": self.allowed_bytes,
+            "blocked_requests": sum(self.blocked_requests.values()),
+            "blocked_by_type": dict(self.blocked_requests)
+        }
+
+    def log_stats(self):
+        logger.info(f"Route filter: {self.stats()}")
+
+
+TRACKER_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*bing.com/bat*"
+]
+
+# Rule sets selectable per task; "off" installs no filter at all
+ROUTE_FILTER_PRESETS = {
+    "off": None,
+    "lean": lambda: RouteFilter(
+        [RouteRule("block", {"image", "media", "font"})],
+        replace_networkidle=True
+    ),
+    "strict": lambda: RouteFilter(
+        [RouteRule("block", {"image", "media", "font"})] +
+        [RouteRule("block", url_pattern=pattern) for pattern in TRACKER_PATTERNS],
+        replace_networkidle=True
+    )
+}
+
+
+def build_route_filter(preset="off"):
+    """Create a fresh RouteFilter for a preset name, or None for "off"."""
+    factory = ROUTE_FILTER_PRESETS[preset]
+    return factory() if factory else None
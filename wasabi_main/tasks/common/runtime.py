@@ -0,0 +1,182 @@
+# runtime.py
+import asyncio
+import itertools
+import logging
+import threading
+from tasks.common.logs import log_context
+from tasks.common.metrics import MetricsRecorder, get_exporter, reset_recorder, span, use_recorder
+
+logger = logging.getLogger(__name__)
+
+
+class TaskHandle:
+    """
+    Handle for a task submitted to the TaskRuntime.
+
+    Wraps the concurrent.futures.Future returned by the runtime so callers on other threads
+    (the GUI, the CLI) can wait on, inspect or cancel the task.
+    """
+    def __init__(self, task_id, future, metrics=None):
+        self.task_id = task_id
+        self.future = future
+        self.metrics = metrics  # MetricsRecorder collecting the task's timing spans
+
+    def cancel(self):
+        """Request cancellation. Queued tasks never start, running tasks get CancelledError."""
+        return self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def add_done_callback(self, callback):
+        """Call `callback(handle)` once the task finishes. Runs on the runtime thread."""
+        self.future.add_done_callback(lambda _future: callback(self))
+
+
+class TaskRuntime:
+    """
+    Long-lived asyncio runtime shared by every task.
+
+    One background thread owns a single event loop. Tasks are submitted as coroutine factories
+    (usually `task.run`) and at most `max_concurrency` of them run at once; the rest wait on a
+    semaphore inside the same loop instead of each getting a thread and an event loop of their own.
+    """
+    def __init__(self, max_concurrency=4):
+        self.max_concurrency = max_concurrency
+        self.loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._semaphore = None
+        self._handles = {}
+        self._task_ids = itertools.count(1)
+        self._shutdown_hooks = []
+
+    def start(self):
+        """Start the runtime thread if it is not already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run_loop, name="wasabi-runtime", daemon=True)
+            self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coro_factory, task_id=None, on_start=None, task_name=None, on_event=None):
+        """
+        Schedule a task on the shared loop.
+
+        Args:
+            coro_factory (Callable[[], Awaitable]): Called on the runtime loop once a concurrency slot is free.
+            task_id (Optional[int]): Identifier for the task; one is allocated if not given.
+            on_start (Optional[Callable[[int], None]]): Called on the runtime thread when the task leaves the queue.
+            task_name (Optional[str]): Name recorded with the task's metrics.
+            on_event (Optional[Callable[[int, dict], None]]): Called on the runtime thread with
+                progress fields (phase, timing) whenever the task enters a new phase, and
+                (resources) whenever its browser's memory and CPU use is sampled.
+
+        Returns:
+            TaskHandle: Handle wrapping the task's completion future.
+        """
+        self.start()
+        if task_id is None:
+            task_id = next(self._task_ids)
+
+        metrics = MetricsRecorder(task_id, task_name, listener=on_event)
+        future = asyncio.run_coroutine_threadsafe(self._run_task(task_id, coro_factory, on_start, metrics), self.loop)
+        handle = TaskHandle(task_id, future, metrics)
+        self._handles[task_id] = handle
+        future.add_done_callback(lambda _future: self._handles.pop(task_id, None))
+        return handle
+
+    async def _run_task(self, task_id, coro_factory, on_start, metrics):
+        async with self._semaphore:
+            if on_start:
+                on_start(task_id)
+            with log_context(task_id=task_id):
+                logger.info(f"Task {task_id} started on the shared runtime.")
+                token = use_recorder(metrics)
+                try:
+                    with span(metrics.task_name or "task", "task"):
+                        return await coro_factory()
+                finally:
+                    reset_recorder(token)
+                    logger.info(f"Task {task_id} finished: {metrics.summary_text()}")
+                    try:
+                        await asyncio.to_thread(get_exporter().export, metrics)
+                    except Exception as e:
+                        logger.error(f"Could not export metrics for task {task_id}: {e}")
+
+    def run(self, coro_factory, timeout=None):
+        """Submit a task and block the calling thread until it completes."""
+        return self.submit(coro_factory).result(timeout)
+
+    def cancel(self, task_id):
+        handle = self._handles.get(task_id)
+        return handle.cancel() if handle else False
+
+    def active_tasks(self):
+        return list(self._handles)
+
+    def add_shutdown_hook(self, coro_factory):
+        """Register a coroutine factory to await on the runtime loop before it stops (e.g. closing browsers)."""
+        if coro_factory not in self._shutdown_hooks:
+            self._shutdown_hooks.append(coro_factory)
+
+    async def _run_shutdown_hooks(self):
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Runtime shutdown hook failed: {e}")
+        self._shutdown_hooks.clear()
+
+    def shutdown(self, timeout=10):
+        """Cancel outstanding tasks, run shutdown hooks, stop the loop and join the runtime thread."""
+        with self._lock:
+            if not self.running:
+                return
+            for handle in list(self._handles.values()):
+                handle.cancel()
+            try:
+                asyncio.run_coroutine_threadsafe(self._run_shutdown_hooks(), self.loop).result(timeout)
+            except Exception as e:
+                logger.error(f"Runtime shutdown hooks did not complete: {e}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime(max_concurrency=4):
+    """Return the process-wide TaskRuntime, creating it on first use."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = TaskRuntime(max_concurrency=max_concurrency)
+        return _runtime
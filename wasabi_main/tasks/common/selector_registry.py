@@ -0,0 +1,179 @@
+# selector_registry.py
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from tasks.common.metrics import span
+
+# Selectors starting with one of these already name their Playwright engine
+ENGINE_PREFIXES = ("css=", "xpath=", "text=", "role=", "id=", "data-testid=", "internal:")
+
+# One XPath location step: optional axis separator, a tag (or *), and any number of [predicates]
+_STEP = re.compile(r"(//|/)([A-Za-z][\w-]*|\*)((?:\[[^\[\]]*\])*)")
+_PREDICATE = re.compile(r"\[([^\[\]]*)\]")
+_CONTAINS_ATTR = re.compile(r"^\s*contains\(\s*@([\w-]+)\s*,\s*(['\"])(.*)\2\s*\)\s*$")
+_EQUALS_ATTR = re.compile(r"^\s*@([\w-]+)\s*=\s*(['\"])(.*)\2\s*$")
+_HAS_ATTR = re.compile(r"^\s*@([\w-]+)\s*$")
+
+# Counts the matches of every selector in one round trip; null for selectors only Playwright understands
+VALIDATE_SCRIPT = """
+(selectors) => {
+    const counts = {};
+    for (const [name, engine, body] of selectors) {
+        try {
+            if (engine === "css") {
+                counts[name] = document.querySelectorAll(body).length;
+            } else if (engine === "xpath") {
+                counts[name] = document.evaluate(body, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+            } else {
+                counts[name] = null;
+            }
+        } catch (error) {
+            counts[name] = -1;
+        }
+    }
+    return counts;
+}
+"""
+
+
+class SelectorMissingError(LookupError):
+    """Raised when selectors a flow depends on match nothing on the page."""
+    def __init__(self, site, missing, url=None):
+        self.site = site
+        self.missing = missing
+        super().__init__(f"{site} selectors missing{f' on {url}' if url else ''}: {', '.join(missing)}")
+
+
+def as_selector(selector: str) -> str:
+    """Prefix a bare XPath with its engine; selectors that already name an engine pass through."""
+    if selector.startswith(ENGINE_PREFIXES):
+        return selector
+    return f"xpath={selector}"
+
+
+def _css_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def compile_xpath(xpath: str) -> Optional[str]:
+    """
+    Translate a simple XPath into an equivalent CSS selector.
+
+    Handles chains of `/` and `//` steps whose predicates are `contains(@attr, 'v')`, `@attr='v'`
+    or `@attr`, which covers most of our selectors. Anything else (text(), positions, axes,
+    nested paths) returns None and stays XPath.
+    """
+    parts, position = [], 0
+    for match in _STEP.finditer(xpath):
+        if match.start() != position:
+            return None
+        separator, tag, predicates = match.groups()
+        css = "" if tag == "*" and predicates else tag
+        for predicate in _PREDICATE.findall(predicates):
+            contains, equals, has = (_CONTAINS_ATTR.match(predicate), _EQUALS_ATTR.match(predicate),
+                                     _HAS_ATTR.match(predicate))
+            if contains:
+                css += f"[{contains.group(1)}*={_css_string(contains.group(3))}]"
+            elif equals:
+                css += f"[{equals.group(1)}={_css_string(equals.group(3))}]"
+            elif has:
+                css += f"[{has.group(1)}]"
+            else:
+                return None
+        if parts:
+            parts.append(" " if separator == "//" else " > ")
+        elif separator != "//":
+            return None  # Absolute paths from the document root are rare and not worth translating
+        parts.append(css)
+        position = match.end()
+    if position != len(xpath) or not parts:
+        return None
+    return "".join(parts)
+
+
+@dataclass(frozen=True)
+class Selector:
+    name: str
+    source: str  # As defined: an XPath or an engine-prefixed Playwright selector
+    selector: str  # What Playwright is given: compiled CSS when possible, else the source
+
+    @property
+    def engine(self):
+        return self.selector.split("=", 1)[0] if self.selector.startswith(ENGINE_PREFIXES) else "xpath"
+
+    @property
+    def body(self):
+        return self.selector.split("=", 1)[1] if self.selector.startswith(ENGINE_PREFIXES) else self.selector
+
+
+class SelectorRegistry:
+    """
+    Named selectors of one site, defined once and compiled up front.
+
+    Bare XPaths that compile_xpath can translate are served as CSS, everything else as given.
+    `validate` checks any number of selectors against a page with a single evaluate; `wait_for`
+    uses it when a readiness wait runs out, so a flow fails with the names of the broken selectors.
+    """
+    def __init__(self, site, definitions: Dict[str, str], compile_css=True):
+        self.site = site
+        self.selectors: Dict[str, Selector] = {}
+        for name, source in definitions.items():
+            css = compile_xpath(source) if compile_css and not source.startswith(ENGINE_PREFIXES) else None
+            self.selectors[name] = Selector(name, source, f"css={css}" if css else as_selector(source))
+
+    def __getitem__(self, name) -> str:
+        """The Playwright selector string for `name`."""
+        try:
+            return self.selectors[name].selector
+        except KeyError:
+            raise KeyError(f"No {self.site} selector named '{name}'") from None
+
+    def __contains__(self, name):
+        return name in self.selectors
+
+    def __iter__(self):
+        return iter(self.selectors)
+
+    async def validate(self, page, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[int]]:
+        """
+        Count the matches of each named selector (all by default) on the current page.
+
+        Returns:
+            Dict[str, Optional[int]]: Matches per name; None when the selector can only be checked
+            by Playwright itself (role=, text=), -1 when the page rejected it as invalid.
+        """
+        names = list(names) if names is not None else list(self.selectors)
+        payload = [[name, self.selectors[name].engine, self.selectors[name].body] for name in names]
+        return await page.evaluate(VALIDATE_SCRIPT, payload)
+
+    async def wait_for(self, page, names: Iterable[str], timeout=15000):
+        """
+        Wait until every one of `names` is attached, all within one `timeout` (ms).
+
+        The wait gives a page that is still rendering its time; only if it runs out are the
+        selectors checked with `require`, so the failure names the ones that match nothing.
+
+        Raises:
+            SelectorMissingError: If the wait timed out and some of `names` match nothing.
+        """
+        # Imported here so the registry itself (and its tests) don't need Playwright
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        names = list(names)
+        deadline = time.monotonic() + timeout / 1000
+        try:
+            with span("selectors.wait_for", "wait"):
+                for name in names:
+                    remaining = max(1, (deadline - time.monotonic()) * 1000)  # 0 would mean no timeout
+                    await page.wait_for_selector(self[name], state="attached", timeout=remaining)
+        except PlaywrightTimeoutError:
+            await self.require(page, names)
+            raise
+
+    async def require(self, page, names: Iterable[str]):
+        """Raise SelectorMissingError right away if any of `names` matches nothing on the page."""
+        counts = await self.validate(page, names)
+        missing = [name for name, count in counts.items() if count is not None and count < 1]
+        if missing:
+            raise SelectorMissingError(self.site, missing, page.url)
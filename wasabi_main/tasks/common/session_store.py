@@ -0,0 +1,63 @@
+# session_store.py
+import json
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "sessions")
+
+
+class SessionStore:
+    """
+    Persists Playwright `storage_state` (cookies and local storage) per profile name.
+
+    A task restores the saved state into its new context and only runs the full login flow when
+    the restored session turns out to be invalid. Files are written atomically and readable by
+    the owner only, since they hold live session cookies.
+    """
+    def __init__(self, site, root=DEFAULT_SESSION_DIR, max_age=7 * 24 * 3600):
+        self.site = site
+        self.root = os.path.join(root, site)
+        self.max_age = max_age
+
+    def path_for(self, profile_name):
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", profile_name)
+        return os.path.join(self.root, f"{safe_name}.json")
+
+    def load(self, profile_name):
+        """
+        Return the saved storage state for a profile, or None if there is none or it is too old.
+        """
+        path = self.path_for(profile_name)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable session for {profile_name}: {e}")
+            self.invalidate(profile_name)
+            return None
+
+        if time.time() - data.get("saved_at", 0) > self.max_age:
+            logger.info(f"Saved {self.site} session for {profile_name} expired.")
+            self.invalidate(profile_name)
+            return None
+        return data.get("storage_state")
+
+    def save(self, profile_name, storage_state):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path_for(profile_name)
+        tmp_path = f"{path}.tmp"
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "storage_state": storage_state}, f)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, profile_name):
+        try:
+            os.remove(self.path_for(profile_name))
+        except FileNotFoundError:
+            pass
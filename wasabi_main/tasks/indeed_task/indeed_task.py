@@ -1,63 +1,186 @@
-import json
-import asyncio
-from tasks.browser_manager import BrowserManager
-from playwright.async_api import async_playwright
+import logging
+from contextlib import aclosing
+from tasks.browser_manager import BrowserManager, HAR_MODES, default_har_path
+from tasks.browser_pool import get_browser_pool
+from tasks.common.checkpoints import CheckpointStore
+from tasks.common.config import ConfigError, get_config
+from tasks.common.session_store import SessionStore
+from tasks.common.job_store import JobIngestor, get_job_store
+from tasks.common.route_filter import ROUTE_FILTER_PRESETS, build_route_filter
+from tasks.common.launch_profiles import launch_profile_input
+from tasks.common.metrics import phase
 from .login import IndeedLogin
 from .jobsearch import IndeedJobSearch
+from .selectors import INDEED_SELECTORS as SELECTORS
+from tasks.subtasks.actions import GlobalActionTask, PACING_PROFILES, TYPING_STRATEGIES
+
+logger = logging.getLogger(__name__)
+
+LOCATIONS_FILE = "indeed_task/locations.json"
+USER_PROFILES_FILE = "indeed_task/user_profiles.json"
+SAMPLE_USER_PROFILES_FILE = "indeed_task/user_profiles_sample.json"
 
 class IndeedTask:
+    """Log in to Indeed, run a job search and store the postings found."""
     def __init__(self, task_config):
         self.task_config = task_config
-        self.browser_manager = BrowserManager(keep_open=True)
+        self.browser_manager = None
+        self.session_store = SessionStore("indeed")
+        self.checkpoints = CheckpointStore()
 
     @staticmethod
     def load_locations():
-        with open(r"D:\code\WASABI\wasabi_main\tasks\indeed_task\locations.json", "r") as f:
-            data = json.load(f)
-            return data["locations"]    
+        return get_config().load_json(LOCATIONS_FILE)["locations"]
+
+    @staticmethod
+    def user_profiles_file():
+        # The real profiles are kept out of the repo; fall back to the sample so the task can still be listed
+        return get_config().first_existing(USER_PROFILES_FILE, SAMPLE_USER_PROFILES_FILE)
 
     @staticmethod
     def load_user_profiles():
-        with open(r"D:\code\WASABI\wasabi_main\tasks\indeed_task\user_profiles.json", "r") as f:
-            data = json.load(f)
-            return data["user_profiles"]
+        return get_config().load_json(IndeedTask.user_profiles_file())["user_profiles"]
+
+    @staticmethod
+    def get_user_profile(profile_name):
+        """Credentials to log in with, only ever from the real profiles file, never from the sample."""
+        config = get_config()
+        if not config.exists(USER_PROFILES_FILE):
+            raise ConfigError(f"{USER_PROFILES_FILE} is missing; copy {SAMPLE_USER_PROFILES_FILE} "
+                              f"and fill in real accounts before running the task.")
+        try:
+            return config.index(USER_PROFILES_FILE, "user_profiles", "profile_name")[profile_name]
+        except KeyError:
+            raise ConfigError(f"No profile named '{profile_name}' in {USER_PROFILES_FILE}") from None
 
     async def run(self):
         selected_profile = self.task_config["selected_profile"]
         selected_location = self.task_config["selected_location"]
         job_search_input = self.task_config["job_search_input"]
 
-        user_profiles = self.load_user_profiles()
-        selected_user = next(profile for profile in user_profiles if profile["profile_name"] == selected_profile)
-
-        login = IndeedLogin(username=selected_user["username"], password=selected_user["password"])
-        context = await self.browser_manager.launch_browser()
-        page = await context.new_page()
-        login_success = await login.login(page)
-        if login_success:
-            print("Login successful, initiating job search.")
-            job_search = IndeedJobSearch(page, self.task_config)
-            try:
-                search_successful = await job_search.initiate_job_search()
-            except Exception as e:
-                    print(f"Error on trying to initiate job search: ", e)
-            if search_successful:
-                print("Job search initiated successfully.")
-                await asyncio.sleep(1500)  # For demonstration purposes
-            
-            else:
-                print("Failed to initiate job search.")
-        else:
-            print("Login failed, not proceeding with job search.")
+        selected_user = self.get_user_profile(selected_profile)
+
+        # Build the flows before launching so bad step definitions fail fast
+        action_task = GlobalActionTask.with_pacing(
+            self.task_config.get("pacing", "human"),
+            typing_strategy=self.task_config.get("typing_strategy", "per_char")
+        )
+        route_filter = build_route_filter(self.task_config.get("resource_filter", "off"))
+        login = IndeedLogin(
+            username=selected_user["username"],
+            password=selected_user["password"],
+            action_task=action_task,
+            ready_state="dom" if route_filter and route_filter.replace_networkidle else "networkidle"
+        )
+        job_search = IndeedJobSearch(None, self.task_config, action_task=action_task)
+
+        har_mode = self.task_config.get("har_mode", "off")
+        self.browser_manager = BrowserManager(
+            pool=get_browser_pool(self.task_config.get("launch_profile")),
+            har_mode=har_mode,
+            har_path=default_har_path(f"indeed_{selected_profile}") if har_mode != "off" else None
+        )
+        # A replay runs against archived traffic: its session and postings are stale, so they must never
+        # overwrite the real session, checkpoint or job store
+        replay = har_mode == "replay"
+        # Steps and phases completed by an interrupted run of the same search are skipped
+        checkpoint = self.checkpoints.open(f"indeed_{selected_profile}_{job_search_input}" + ("_replay" if replay else ""),
+                                           resume=self.task_config.get("resume", "yes") == "yes")
+        action_task.checkpoint = checkpoint
+        storage_state = checkpoint.storage_state or self.session_store.load(selected_profile)
+        login_success = search_successful = False
 
+        def save_session(storage_state):
+            if not replay:
+                self.session_store.save(selected_profile, storage_state)
 
-        print(f"Selected location: {selected_location}")
-        print(f"Job search input: {job_search_input}")
+        try:
+            with phase("launch"):
+                context = await self.browser_manager.launch_browser(storage_state=storage_state, route_filter=route_filter)
+                page = await context.new_page()
 
+            session_checked = False
+            if checkpoint.resumed and checkpoint.url:
+                with phase("resume"):
+                    if checkpoint.is_done("phase/login"):
+                        # The checkpoint's session may have expired since it was saved; verify it before
+                        # trusting any of the saved progress
+                        session_checked = True
+                        login_success = await login.is_logged_in(page)
+                        if not login_success:
+                            logger.info("Checkpointed session expired, starting the run over.")
+                            checkpoint.clear()
+                    if checkpoint.resumed:
+                        logger.info(f"Resuming from checkpoint at {checkpoint.url}")
+                        await page.goto(checkpoint.url, wait_until="domcontentloaded")
+                        if not login_success and "onboarding.indeed.com" in checkpoint.url:
+                            login_success = await login.handle_onboarding(page)
 
-        # Implement other Indeed-specific tasks
+            if not login_success and not session_checked:
+                # Reuse the saved session when it is still valid, only fall back to the full login flow otherwise
+                with phase("restore_session"):
+                    login_success = storage_state is not None and await login.is_logged_in(page)
+            if not login_success:
+                with phase("login"):
+                    if storage_state is not None:
+                        if not replay:
+                            self.session_store.invalidate(selected_profile)
+                        await context.clear_cookies()
+                    login_success = await login.login(page)
+            if login_success and not checkpoint.is_done("phase/login"):
+                save_session(await context.storage_state())
+                await checkpoint.mark_done("phase/login", page)
 
-        await self.browser_manager.close_browser()
+            if login_success:
+                logger.info("Login successful, initiating job search.")
+                # Between phases the task can afford a reload, so an oversized browser is swapped for a fresh one here
+                page = await self.browser_manager.recycle_if_needed(page, on_state=save_session,
+                                                                    ready_selector=SELECTORS["search_input"])
+                try:
+                    with phase("job_search"):
+                        search_successful = checkpoint.is_done("phase/job_search") or await job_search.initiate_job_search(page)
+                    if search_successful:
+                        await checkpoint.mark_done("phase/job_search", page)
+                except Exception as e:
+                    logger.error(f"Error on trying to initiate job search: {e}")
+                if search_successful:
+                    logger.info("Job search initiated successfully.")
+                    page = await self.browser_manager.recycle_if_needed(page, on_state=save_session,
+                                                                        ready_selector=SELECTORS["results_list"])
+                    with phase("ingest"):
+                        # Postings stream in page by page and are stored as they come. Results are ordered by
+                        # relevance, so a page of known postings says nothing about the next one; every page up
+                        # to max_pages is crawled and the JobStore drops the duplicates
+                        max_pages = int(self.task_config.get("max_result_pages", 1))
+                        if replay:
+                            async with aclosing(job_search.iter_result_pages(page, max_pages=max_pages)) as result_pages:
+                                async for records in result_pages:
+                                    logger.info(f"Replayed {len(records)} postings, not storing them.")
+                        else:
+                            async with aclosing(job_search.iter_result_pages(page, max_pages=max_pages)) as result_pages, \
+                                    JobIngestor(get_job_store(), "indeed", job_search_input) as ingestor:
+                                async for records in result_pages:
+                                    new = await ingestor.add_page(records)
+                                    logger.info(f"{len(new)} new of {len(records)} postings on this result page.")
+                            logger.info(f"Stored {ingestor.new_count} new of {ingestor.total_count} postings.")
+                    checkpoint.clear()  # The run finished, the next one starts from scratch
+
+                else:
+                    logger.warning("Failed to initiate job search.")
+            else:
+                logger.warning("Login failed, not proceeding with job search.")
+
+            if route_filter:
+                route_filter.log_stats()
+
+            logger.info(f"Selected location: {selected_location}")
+            logger.info(f"Job search input: {job_search_input}")
+
+            # Implement other Indeed-specific tasks
+        finally:
+            # Always hand the context back, also when login or the search raised
+            await self.browser_manager.close_browser()
+        return login_success and search_successful
 
     @staticmethod
     def configuration_spec():
@@ -83,6 +206,43 @@ class IndeedTask:
                     "key": "job_search_input",
                     "label": "Job Search Input",
                     "type": "line_edit"
-                }
+                },
+                {
+                    "key": "pacing",
+                    "label": "Pacing",
+                    "type": "dropdown",
+                    "options": list(PACING_PROFILES)
+                },
+                {
+                    "key": "typing_strategy",
+                    "label": "Typing Strategy",
+                    "type": "dropdown",
+                    "options": list(TYPING_STRATEGIES)
+                },
+                {
+                    "key": "resource_filter",
+                    "label": "Resource Filter",
+                    "type": "dropdown",
+                    "options": list(ROUTE_FILTER_PRESETS)
+                },
+                {
+                    "key": "max_result_pages",
+                    "label": "Result Pages",
+                    "type": "dropdown",
+                    "options": ["1", "3", "5", "10"]
+                },
+                {
+                    "key": "resume",
+                    "label": "Resume From Checkpoint",
+                    "type": "dropdown",
+                    "options": ["yes", "no"]
+                },
+                {
+                    "key": "har_mode",
+                    "label": "HAR Record/Replay",
+                    "type": "dropdown",
+                    "options": list(HAR_MODES)
+                },
+                launch_profile_input()
             ]
         }
\ No newline at end of file
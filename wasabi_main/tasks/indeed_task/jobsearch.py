@@ -1,15 +1,64 @@
 import asyncio, random
+from contextlib import aclosing
+from urllib.parse import urljoin
 from playwright.async_api import Page
+from tasks.common.metrics import span
 from tasks.subtasks.actions import GlobalActionTask
- 
+from tasks.tab_pool import get_tab_pool
+from .selectors import INDEED_SELECTORS as SELECTORS
+
+
+# Parses every result card on the page in one round trip and returns compact records plus the next page link
+RESULT_PAGE_SCRIPT = """
+() => {
+    const text = (root, selector) => {
+        const node = root.querySelector(selector);
+        return node ? node.textContent.trim() : null;
+    };
+    const records = [];
+    const seen = new Set();
+    for (const card of document.querySelectorAll("div.job_seen_beacon, li div.cardOutline")) {
+        const link = card.querySelector("a[data-jk]");
+        if (!link || seen.has(link.dataset.jk)) continue;
+        seen.add(link.dataset.jk);
+        const title = link.querySelector("span[title]");
+        records.push({
+            job_key: link.dataset.jk,
+            title: title ? title.getAttribute("title") : link.textContent.trim(),
+            company: text(card, "[data-testid='company-name']"),
+            location: text(card, "[data-testid='text-location']"),
+            salary: text(card, ".salary-snippet-container, [data-testid='attribute_snippet_testid']"),
+            posted: text(card, "[data-testid='myJobsStateDate']"),
+            url: "https://www.indeed.com/viewjob?jk=" + encodeURIComponent(link.dataset.jk)
+        });
+    }
+    const next = document.querySelector("a[data-testid='pagination-page-next']");
+    return {records: records, next: next ? next.getAttribute("href") : null};
+}
+"""
+
+# Reads the full description of an opened posting
+POSTING_DETAILS_SCRIPT = """
+() => {
+    const description = document.querySelector("#jobDescriptionText");
+    const salary = document.querySelector("#salaryInfoAndJobType");
+    return {
+        description: description ? description.innerText.trim() : null,
+        salary_details: salary ? salary.innerText.trim() : null
+    };
+}
+"""
+
 class IndeedJobSearch:
-    def __init__(self, page, task_config):
+    def __init__(self, page, task_config, action_task=None):
         self.page = page
         self.task_config = task_config
-        self.action_task = GlobalActionTask()  # Create an instance of GlobalActionTask
+        self.action_task = action_task or GlobalActionTask()  # Create an instance of GlobalActionTask
+        self.search_plan = self.action_task.compile_steps(self.job_search_steps(), "job_search")
 
-    async def initiate_job_search(self, page):
-        job_searchbar_xpath = "//input[contains(@aria-label,'search: Job title, keywords, or company')]"
+    def job_search_steps(self):
+        job_searchbar_xpath = SELECTORS["search_input"]
+        find_jobs_xpath = SELECTORS["find_jobs_button"]
         job_search_text = self.task_config["job_search_input"]
         steps = [
             {
@@ -17,18 +66,162 @@ class IndeedJobSearch:
                 'params': {
                     'xpath': job_searchbar_xpath,
                     'element_description': "Job Serach Input",
-                    'text': job_search_text
-                }
+                    'text': job_search_text  # human_type verifies the field value itself
+                },
+                'checkpoint': False  # A reload clears the field, so typing always reruns
             },
             {
-                'type': 'check_input_value',
+                'type': 'hover_and_click',
                 'params': {
-                    'expected_value': job_search_text,
-                    'xpath': job_searchbar_xpath,
-                    'input_description': "Job Search Input"
+                    'xpath': find_jobs_xpath,
+                    'element_description': "Find Jobs Button"
+                },
+                'checkpoint': False
+            },
+            {
+                'type': 'confirm_navigation',
+                'params': {
+                    'page_name': "Job Search Results",
+                    'outcomes': {"https://www.indeed.com/jobs": [SELECTORS["results_list"]]}
                 }
             }
         ]
 
-        await self.action_task.perform_steps(self.page, steps)
-       
\ No newline at end of file
+        return steps
+
+    async def initiate_job_search(self, page=None):
+        page = page or self.page
+        # The page may only just have been reloaded (resume, recycle): give the form time to render
+        await SELECTORS.wait_for(page, ["search_input", "find_jobs_button"])
+        return await self.action_task.perform_steps(page, self.search_plan)
+
+    async def extract_results(self, page=None):
+        """
+        Parse the job cards of the current results page.
+
+        Returns:
+            List[dict]: One record per posting with job_key, title, company, location, salary,
+            posted and url; fields missing from a card are None.
+        """
+        return (await self._extract_page(page or self.page))["records"]
+
+    async def _extract_page(self, page):
+        with span("extract_results", "ipc"):
+            data = await page.evaluate(RESULT_PAGE_SCRIPT)
+        if data["next"]:
+            data["next"] = urljoin(page.url, data["next"])
+        return data
+
+    async def _wait_for_results(self, page, timeout=15000):
+        with span("wait_for_results", "wait"):
+            await page.wait_for_selector(SELECTORS["results_list"], state="attached", timeout=timeout)
+
+    async def _load_page(self, page, url, timeout=15000):
+        with span("load_results", "wait"):
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        await self._wait_for_results(page, timeout)
+        return await self._extract_page(page)
+
+    async def iter_results(self, page=None, max_pages=None, buffer_pages=1):
+        """
+        Walk the result pages from the current one on, yielding one posting at a time.
+
+        Same crawl as `iter_result_pages`, flattened; see there for the arguments.
+        """
+        async with aclosing(self.iter_result_pages(page, max_pages, buffer_pages)) as result_pages:
+            async for records in result_pages:
+                for record in records:
+                    yield record
+
+    async def iter_result_pages(self, page=None, max_pages=None, buffer_pages=1):
+        """
+        Walk the result pages from the current one on, yielding the postings of one page at a time.
+
+        Each page is parsed with a single evaluate. While the caller consumes a page, the next one
+        is already loading in a second tab leased from the context's TabPool; the two tabs take
+        turns, so the caller's page may end up on a later result page. At most `buffer_pages` parsed pages wait
+        for the caller, so a slow consumer holds the crawl back instead of piling up pages. Stop
+        early by breaking out of the loop; wrap the generator in `contextlib.aclosing` so the
+        prefetch is cancelled and the extra tab returned to the pool right away.
+
+        Args:
+            page (Page): A page showing the first result page.
+            max_pages (Optional[int]): Stop after this many result pages.
+            buffer_pages (int): Parsed pages allowed to wait for the consumer.
+
+        Yields:
+            List[dict]: The posting records of a page, as returned by `extract_results`.
+        """
+        page = page or self.page
+        queue = asyncio.Queue(maxsize=buffer_pages)
+        done = object()
+        tabs = [page]
+
+        async def produce():
+            pages = 1
+            try:
+                # The caller's page may only just have loaded (e.g. a resumed run); an unrendered list would parse as empty
+                await self._wait_for_results(page)
+                data = await self._extract_page(page)
+                while True:
+                    next_url = data["next"] if max_pages is None or pages < max_pages else None
+                    loading = None
+                    if next_url:
+                        if len(tabs) == 1:
+                            tabs.append(await get_tab_pool(page.context).acquire())
+                        loading = asyncio.create_task(self._load_page(tabs[pages % 2], next_url))
+                    try:
+                        await queue.put(data["records"])  # Blocks while the consumer is behind
+                    except BaseException:
+                        if loading:
+                            loading.cancel()
+                        raise
+                    if not loading:
+                        break
+                    data = await loading
+                    pages += 1
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(done)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            for tab in tabs[1:]:
+                await get_tab_pool(page.context).release(tab)
+
+    async def open_postings(self, context, records, tabs=3, timeout=15000):
+        """
+        Open several postings at once in pooled tabs and read their details.
+
+        Page loads overlap, up to `tabs` at a time. A posting that fails to load keeps its record
+        with an "error" field instead of failing the batch.
+
+        Args:
+            context (BrowserContext): Context whose TabPool provides the tabs.
+            records (List[dict]): Posting records with a "url", e.g. from `iter_results`.
+            tabs (int): Tabs to use when the context has no TabPool yet.
+
+        Returns:
+            List[dict]: The records, each extended with description and salary_details.
+        """
+        async def open_posting(page, record):
+            self.action_task.reset_mouse_tracker(page)  # A reused tab starts a new sub-flow
+            with span("open_posting", "wait"):
+                await page.goto(record["url"], wait_until="domcontentloaded", timeout=timeout)
+            with span("posting_details", "ipc"):
+                return {**record, **await page.evaluate(POSTING_DETAILS_SCRIPT)}
+
+        results = await get_tab_pool(context, tabs).map(open_posting, records, return_exceptions=True)
+        return [result if not isinstance(result, Exception) else {**record, "error": str(result)}
+                for record, result in zip(records, results)]
@@ -1,63 +1,56 @@
 import asyncio, random
-from playwright.async_api import Page
+import logging
+from playwright.async_api import Error as PlaywrightError, Page, TimeoutError
 from tasks.subtasks.actions import GlobalActionTask
+from .selectors import INDEED_SELECTORS as SELECTORS
+
+logger = logging.getLogger(__name__)
  
 class IndeedLogin:
-    def __init__(self, username, password):
+    def __init__(self, username, password, action_task=None, ready_state="networkidle"):
         self.username = username
         self.password = password
-        self.action_task = GlobalActionTask()  # Create an instance of GlobalActionTask
+        self.ready_state = ready_state  # "networkidle", or "dom" to wait only for the elements the flow needs
+        self.action_task = action_task or GlobalActionTask()  # Create an instance of GlobalActionTask
+        # Compile the onboarding flows up front so a bad step definition fails before the browser launches
+        self.plans = {
+            "onboarding_redirect1": self.action_task.compile_steps(self.onboarding_redirect1_steps(), "onboarding_redirect1"),
+            "onboarding_redirect2": self.action_task.compile_steps(self.onboarding_redirect2_steps(), "onboarding_redirect2"),
+            "onboarding_redirect3": self.action_task.compile_steps(self.onboarding_redirect3_steps(), "onboarding_redirect3")
+        }
     
     async def handle_login_code(self, page, event):
-        print("Checking For Login Code Page")
-        # Check to see if the redirected page is the 'Sign In With Login Code' page
-        page_name = "Login Code Page"
+        logger.debug("Checking For Login Code Page")
+        # Either the 'Sign In With Login Code' page or the '2-Step Verification' page may show up
+        login_code_xpath = SELECTORS["login_code_text"]
+        two_step_xpath = SELECTORS["two_step_heading"]
         outcomes = {
-            "https://secure.indeed.com": ["""//span[contains(text(),"We've sent your one-time passcode to")]"""]
+            "https://secure.indeed.com": [login_code_xpath, two_step_xpath]
         }
 
-        # Confirm navigation to login code page
+        # Race both pages at once
         success, login_code_navigation = await self.action_task.confirm_navigation(
             page=page,
-            page_name=page_name,
+            page_name="Login Code Page",
             outcomes=outcomes,
-            timeout=1500
+            timeout=2500
         )
         if success:
-            print("Handling Login Code Page")
-            print("Script paused. waiting 25 seconds...")
-            await asyncio.sleep(25)
-            print("Resuming script...")
-            await self.confirm_login(page)
+            logger.info(f"Handling login code page: {login_code_navigation['element_confirmed']}")
+            logger.info("Script paused. Waiting for the code to be entered...")
+            # Resume as soon as the page moves on instead of after a fixed delay
+            await self.action_task.wait_for_page_change(page, selector=login_code_navigation['element_confirmed'])
+            logger.info("Resuming script...")
+            return await self.confirm_login(page)
         else:
-            print("No Login Code Page Attempt #1 failed trying attempt #2")
-            page_name = "Login Code Page#2"
-            outcomes = {
-                "https://secure.indeed.com": ["""//h1[contains(text(),"2-Step Verification")]"""]
-            }
-
-            # Confirm navigation to login code page
-            success2, login_code_navigation2 = await self.action_task.confirm_navigation(
-                page=page,
-                page_name=page_name,
-                outcomes=outcomes,
-                timeout=1000
-            )
-            if success2:
-                print("Handling Login Code #2 Page")
-                print("Script paused. waiting 25 seconds...") 
-                await asyncio.sleep(25)
-                print("Resuming script...")
-                await self.confirm_login(page)
-            else:
-                print("Handle 2 step page not found, returning back to normal login script...")
+            logger.info("Handle 2 step page not found, returning back to normal login script...")
 
     async def confirm_login(self, page):
-        print("Confirming Login...")
+        logger.debug("Confirming Login...")
         # Multiple URLs and Elements
         outcomes = {
-            "https://onboarding.indeed.com/onboarding/": ["""//h1[contains(text(),"Let's make sure your preferences are up-to-date.")]"""],
-            "https://www.indeed.com/": ["//button[contains(@aria-controls, 'jobfeed')]"]
+            "https://onboarding.indeed.com/onboarding/": [SELECTORS["onboarding_preferences_heading"]],
+            "https://www.indeed.com/": [SELECTORS["job_feed_tab"]]
         }
 
         success, navigation_result = await self.action_task.confirm_navigation(
@@ -68,27 +61,50 @@ class IndeedLogin:
         )
 
         if success:
-            print(f"Confirmed navigation to: {navigation_result['url_confirmed']}")
-            print(f"Confirmed element: {navigation_result['element_confirmed']}")
+            logger.debug(f"Confirmed navigation to: {navigation_result['url_confirmed']}")
+            logger.debug(f"Confirmed element: {navigation_result['element_confirmed']}")
 
             if "https://onboarding.indeed.com/onboarding/" in navigation_result['url_confirmed']:
-                print(f"Navigated To the onboarding page for indeed")
-                await self.handle_onboarding(page)
-                print("Fully Logged Into Indeed")
+                logger.info("Navigated To the onboarding page for indeed")
+                if not await self.handle_onboarding(page):
+                    logger.warning("Onboarding flow failed.")
+                    return False
+                logger.info("Fully Logged Into Indeed")
                 return True
             
             elif "https://www.indeed.com/" in navigation_result['url_confirmed']:
-                print("Fully Logged Into Indeed")
+                logger.info("Fully Logged Into Indeed")
                 return True
             
         else:
-            print("Navigation check failed for login, returning false.")
+            logger.warning("Navigation check failed for login, returning false.")
+            return False
+
+    async def is_logged_in(self, page):
+        """
+        Cheap check of a restored session: load the home page without waiting for the network to
+        settle and look for the job feed tab, which is only rendered for signed-in users.
+
+        Returns:
+            bool: True if the session is still authenticated, False otherwise, also when the home
+                page failed to load, so the caller falls back to the full login.
+        """
+        try:
+            await page.goto("https://www.indeed.com/", wait_until="domcontentloaded")
+            await page.wait_for_selector(SELECTORS["job_feed_tab"], state="attached", timeout=5000)
+        except TimeoutError:
+            logger.info("Saved session is no longer valid.")
+            return False
+        except PlaywrightError as e:
+            logger.warning(f"Could not check the saved session, logging in again: {e}")
+            return False
+        logger.info("Restored saved session, skipping login.")
+        return True
     
-    async def onboarding_redirect1(self, page):
-        print("Performing onboarding_redirect 1...")
+    def onboarding_redirect1_steps(self):
         # Use hover_and_click to click on the indeed logo to redirect to homepage button during the onboarding page
-        indeed_logo_xpath = "//a[contains(@data-gnav-element-name, 'Logo')]"
-        indeed_home_job_feed_xpath = "//button[contains(@aria-controls, 'jobfeed-content')]"
+        indeed_logo_xpath = SELECTORS["logo_link"]
+        indeed_home_job_feed_xpath = SELECTORS["job_feed_content_tab"]
         steps = [
             {
                 'type': 'hover_and_click',
@@ -110,14 +126,13 @@ class IndeedLogin:
                 }
             }
         ]
-        await self.action_task.perform_steps(page, steps)
+        return steps
 
-    async def onboarding_redirect2(self, page):
-        print("Performing onboarding_redirect 2...")
-        onboarding_skip_button_xpath = "//button[contains(@data-tn-element,'skip-section')]"
-        onboarding_pay_h1_xpath = """//h1[contains(text(),"What's the minimum pay you're looking for?")]"""
-        onboarding_job_h1_xpath = """//h1[contains(text(),"What job are you looking for?")]"""
-        indeed_home_job_feed_xpath = "//button[contains(@aria-controls, 'jobfeed-content')]"
+    def onboarding_redirect2_steps(self):
+        onboarding_skip_button_xpath = SELECTORS["onboarding_skip_button"]
+        onboarding_pay_h1_xpath = SELECTORS["onboarding_pay_heading"]
+        onboarding_job_h1_xpath = SELECTORS["onboarding_job_heading"]
+        indeed_home_job_feed_xpath = SELECTORS["job_feed_content_tab"]
         steps = [
             {
                 'type': 'hover_and_click',
@@ -177,12 +192,11 @@ class IndeedLogin:
                 }
             }
         ]
-        await self.action_task.perform_steps(page, steps)
+        return steps
 
-    async def onboarding_redirect3(self, page):
-        print("Performing onboarding_redirect 3...")
-        indeed_home_button_xpath = "//a[contains(@id,'FindJobs')]"
-        indeed_home_job_feed_xpath = "//button[contains(@aria-controls, 'jobfeed-content')]"
+    def onboarding_redirect3_steps(self):
+        indeed_home_button_xpath = SELECTORS["find_jobs_nav_link"]
+        indeed_home_job_feed_xpath = SELECTORS["job_feed_content_tab"]
         steps = [
             {
                 'type': 'hover_and_click',
@@ -204,12 +218,30 @@ class IndeedLogin:
                 }
             }
         ]
-        await self.action_task.perform_steps(page, steps)
+        return steps
+
+    async def onboarding_redirect1(self, page):
+        logger.info("Performing onboarding_redirect 1...")
+        return await self.action_task.perform_steps(page, self.plans["onboarding_redirect1"])
+
+    async def onboarding_redirect2(self, page):
+        logger.info("Performing onboarding_redirect 2...")
+        return await self.action_task.perform_steps(page, self.plans["onboarding_redirect2"])
+
+    async def onboarding_redirect3(self, page):
+        logger.info("Performing onboarding_redirect 3...")
+        return await self.action_task.perform_steps(page, self.plans["onboarding_redirect3"])
 
     async def handle_onboarding(self, page):
-        print("Handling onboarding logic...")
+        logger.info("Handling onboarding logic...")
+        checkpoint = self.action_task.checkpoint
+        started = [name for name in self.plans if checkpoint and checkpoint.has_plan(name)]
+        if started:
+            # Finish the flow an earlier run was part way through
+            logger.info(f"Resuming {started[0]}...")
+            return await self.action_task.perform_steps(page, self.plans[started[0]])
         action = random.choice([self.onboarding_redirect1, self.onboarding_redirect2, self.onboarding_redirect1])
-        await action(page)  # Execute the chosen action
+        return await action(page)  # Execute the chosen action
 
 
     async def login(self, page: Page):
@@ -217,12 +249,14 @@ class IndeedLogin:
         await page.goto("https://www.indeed.com/")
         event = asyncio.Event()
         
-        # Wait for the page to fully load and stabilize
-        await page.wait_for_load_state('networkidle')
-    
         # Find the login link by checking if the href contains the required URL
-        login_url = "https://secure.indeed.com/account/login"
-        login_button_xpath = f"//a[contains(@href, '{login_url}')]"
+        login_button_xpath = SELECTORS["sign_in_link"]
+
+        # Wait for the page to fully load and stabilize, or only for the login link when requests are filtered
+        if self.ready_state != "dom":
+            await page.wait_for_load_state('networkidle')
+        # Bounded wait for the login link; if the home page layout changed, this names the missing selector
+        await SELECTORS.wait_for(page, ["sign_in_link"])
         
         # Use hover_and_click from action_task instance to interact with the login link
         await self.action_task.hover_and_click(
@@ -237,7 +271,7 @@ class IndeedLogin:
         page_name = "Login Page"
         # Single URL and Element
         outcomes = {
-            "https://secure.indeed.com/auth": ["//span[contains(text(),'Create an account or sign in.')]"]
+            "https://secure.indeed.com/auth": [SELECTORS["auth_heading"]]
         }
 
         # Confirms navigation to the intended page
@@ -249,13 +283,13 @@ class IndeedLogin:
         )
 
         if success:
-            print(f"Successfully navigated to and confirmed elements on: {navigation_result['url_confirmed']}")
-            print(f"Element confirmed: {navigation_result['element_confirmed']}")
+            logger.debug(f"Successfully navigated to and confirmed elements on: {navigation_result['url_confirmed']}")
+            logger.debug(f"Element confirmed: {navigation_result['element_confirmed']}")
         else:
-            print("Failed to navigate to the login page or confirm the submit button.")
+            logger.warning("Failed to navigate to the login page or confirm the submit button.")
 
         # Look for, click on and type in the username input
-        email_address_input_xpath = "//input[contains(@type, 'email')]"
+        email_address_input_xpath = SELECTORS["email_input"]
         await self.action_task.human_type(
             page=page,
             xpath=email_address_input_xpath,
@@ -264,7 +298,7 @@ class IndeedLogin:
         )
         
         # Submit email to open password input
-        submit_button_xpath = "//button[contains(@type,'submit')]"
+        submit_button_xpath = SELECTORS["submit_button"]
         await self.action_task.hover_and_click(
             page=page,
             xpath=submit_button_xpath,
@@ -278,12 +312,12 @@ class IndeedLogin:
         if login_code_check:
             return True
         else:
-            print("checked for login code page, passing to the rest of the script")
+            logger.debug("checked for login code page, passing to the rest of the script")
             pass
         # Check for CAPTCHA
         captcha_detected = await self.action_task.check_for_captcha_and_pause(page)
         if captcha_detected:
-            print("CAPTCHA resolved, proceeding with further actions.")
+            logger.info("CAPTCHA resolved, proceeding with further actions.")
             await self.action_task.hover_and_click(
             page=page,
             xpath=submit_button_xpath,
@@ -292,14 +326,14 @@ class IndeedLogin:
             click_pause_type="medium"
         )
         else:
-            print("Proceeding without CAPTCHA intervention.")
+            logger.info("Proceeding without CAPTCHA intervention.")
         
         # Confirm that the password field has appeared
-        password_input_xpath = "//input[contains(@type,'password')]"
+        password_input_xpath = SELECTORS["password_input"]
         if await self.action_task.confirm_dynamic_update(page, "Password field appearance", password_input_xpath, timeout=15000):
-            print("Password field appeared successfully.")
+            logger.debug("Password field appeared successfully.")
         else:
-            print("Failed to observe the appearance of the password field.")
+            logger.warning("Failed to observe the appearance of the password field.")
 
         # Look for, click on and type in the password input
         await self.action_task.human_type(
@@ -311,7 +345,7 @@ class IndeedLogin:
         await self.action_task.random_wait("short")
         
         # Sign in
-        sign_in_button_xpath = "//button[contains(@data-tn-element,'submit')]"
+        sign_in_button_xpath = SELECTORS["sign_in_button"]
         await self.action_task.hover_and_click(
             page=page,
             xpath=sign_in_button_xpath,
@@ -324,12 +358,12 @@ class IndeedLogin:
         if login_code_check:
             return True
         else:
-            print("checked for login code page, passing to the rest of the script")
+            logger.debug("checked for login code page, passing to the rest of the script")
             pass
         await self.action_task.random_wait("long")
         captcha_detected = await self.action_task.check_for_captcha_and_pause(page)
         if captcha_detected:
-            print("CAPTCHA resolved, proceeding with further actions.")
+            logger.info("CAPTCHA resolved, proceeding with further actions.")
             await self.action_task.hover_and_click(
             page=page,
             xpath=sign_in_button_xpath,
@@ -338,9 +372,9 @@ class IndeedLogin:
             click_pause_type="medium"
         )
         else:
-            print("Proceeding without CAPTCHA intervention.")
+            logger.info("Proceeding without CAPTCHA intervention.")
         
-        await self.confirm_login(page)
+        return await self.confirm_login(page)
         
 
 
@@ -0,0 +1,29 @@
+# selectors.py
+from tasks.common.selector_registry import SelectorRegistry
+
+# Every Indeed selector the flows use, by name. Simple attribute XPaths are served as CSS.
+INDEED_SELECTORS = SelectorRegistry("indeed", {
+    # Home page
+    "sign_in_link": "//a[contains(@href, 'https://secure.indeed.com/account/login')]",
+    "find_jobs_nav_link": "//a[contains(@id,'FindJobs')]",
+    "logo_link": "//a[contains(@data-gnav-element-name, 'Logo')]",
+    "job_feed_tab": "//button[contains(@aria-controls, 'jobfeed')]",
+    "job_feed_content_tab": "//button[contains(@aria-controls, 'jobfeed-content')]",
+    "search_input": "//input[contains(@aria-label,'search: Job title, keywords, or company')]",
+    "find_jobs_button": "//form[@id='jobsearch']//button[@type='submit']",
+    # Search results
+    "results_list": "//div[@id='mosaic-provider-jobcards']",
+    # Sign in
+    "auth_heading": "//span[contains(text(),'Create an account or sign in.')]",
+    "email_input": "//input[contains(@type, 'email')]",
+    "submit_button": "//button[contains(@type,'submit')]",
+    "password_input": "//input[contains(@type,'password')]",
+    "sign_in_button": "//button[contains(@data-tn-element,'submit')]",
+    "login_code_text": """//span[contains(text(),"We've sent your one-time passcode to")]""",
+    "two_step_heading": """//h1[contains(text(),"2-Step Verification")]""",
+    # Onboarding
+    "onboarding_preferences_heading": """//h1[contains(text(),"Let's make sure your preferences are up-to-date.")]""",
+    "onboarding_skip_button": "//button[contains(@data-tn-element,'skip-section')]",
+    "onboarding_pay_heading": """//h1[contains(text(),"What's the minimum pay you're looking for?")]""",
+    "onboarding_job_heading": """//h1[contains(text(),"What job are you looking for?")]""",
+})
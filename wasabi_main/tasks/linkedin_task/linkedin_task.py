@@ -1,29 +1,35 @@
 import asyncio
 from tasks.browser_manager import BrowserManager
+from tasks.browser_pool import get_browser_pool
+from tasks.common.launch_profiles import launch_profile_input
 from playwright.async_api import async_playwright
 from .login import LinkedinLogin
 
 class LinkedinTask:
+    """Log in to LinkedIn and run a job search."""
     def __init__(self, task_config):
         self.task_config = task_config
-        self.browser_manager = BrowserManager()
+        self.browser_manager = None
 
     async def run(self):
-        context = await self.browser_manager.launch_browser()
-        page = await context.new_page()
+        self.browser_manager = BrowserManager(pool=get_browser_pool(self.task_config.get("launch_profile")))
+        try:
+            context = await self.browser_manager.launch_browser()
+            page = await context.new_page()
 
-        login = LinkedinLogin(username=self.task_config["username"], password=self.task_config["password"])
-        await login.login(page)
+            login = LinkedinLogin(username=self.task_config["username"], password=self.task_config["password"])
+            await login.login(page)
 
-        # Implement other LinkedIn-specific tasks
-
-        await self.browser_manager.close_browser()
+            # Implement other LinkedIn-specific tasks
+        finally:
+            await self.browser_manager.close_browser()
 
     @staticmethod
     def configuration_spec():
         return {
             "inputs": [
-                {"label": "Username", "type": "line_edit"},
-                {"label": "Password", "type": "line_edit"}
+                {"key": "username", "label": "Username", "type": "line_edit"},
+                {"key": "password", "label": "Password", "type": "line_edit"},
+                launch_profile_input()
             ]
         }
\ No newline at end of file
@@ -0,0 +1,167 @@
+# registry.py
+import ast
+import importlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TASKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST_PATH = os.path.join(os.path.dirname(TASKS_DIR), "data", "task_manifest.json")
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class TaskInfo:
+    """What the GUI needs to list a task, read from its source without importing it."""
+    name: str  # Module name, e.g. "indeed_task"
+    module: str  # Import path, e.g. "tasks.indeed_task.indeed_task"
+    class_name: str
+    path: str
+    mtime: float
+    description: str = ""
+    has_configuration_spec: bool = False
+
+
+def class_name_for(module_name):
+    """indeed_task -> IndeedTask"""
+    return ''.join([word.capitalize() for word in module_name.split('_')])
+
+
+def parse_task_file(path, package_dir):
+    """
+    Read a `*_task.py` file with `ast` and describe its task class.
+
+    Returns:
+        Optional[TaskInfo]: None if the file does not define the expected class.
+    """
+    module_name = os.path.basename(path)[:-3]
+    class_name = class_name_for(module_name)
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            methods = {item.name for item in node.body if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))}
+            docstring = ast.get_docstring(node) or ""
+            return TaskInfo(
+                name=module_name,
+                module=f"tasks.{package_dir}.{module_name}",
+                class_name=class_name,
+                path=path,
+                mtime=os.path.getmtime(path),
+                description=docstring.strip().splitlines()[0] if docstring.strip() else "",
+                has_configuration_spec="configuration_spec" in methods
+            )
+    return None
+
+
+class TaskRegistry:
+    """
+    Discovers the `tasks/<package>/*_task.py` modules without importing them.
+
+    The manifest of task names and metadata is built by parsing the task files and cached on disk
+    together with their modification times; it is rebuilt only when a task file is added, removed
+    or changed. A task's module, and with it Playwright and the flow code, is imported only when
+    its class is asked for.
+    """
+    def __init__(self, tasks_dir=TASKS_DIR, manifest_path=DEFAULT_MANIFEST_PATH):
+        self.tasks_dir = tasks_dir
+        self.manifest_path = manifest_path
+        self._tasks: Optional[Dict[str, TaskInfo]] = None
+        self._files = None  # Task file mtimes the loaded manifest was built from
+        self._classes = {}
+
+    def task_files(self):
+        """Map of task file path to mtime, for every `*_task.py` one package below tasks/."""
+        files = {}
+        for entry in os.scandir(self.tasks_dir):
+            if not entry.is_dir() or entry.name.startswith(("_", ".")):
+                continue
+            for child in os.scandir(entry.path):
+                if child.is_file() and child.name.endswith("_task.py"):
+                    files[child.path] = child.stat().st_mtime
+        return files
+
+    def tasks(self) -> Dict[str, TaskInfo]:
+        """Task name -> TaskInfo, from the on-disk manifest when it is still current."""
+        files = self.task_files()
+        if self._tasks is not None and self._files == files:
+            return self._tasks
+
+        tasks = self._read_manifest(files)
+        if tasks is None:
+            tasks = self._scan(files)
+            self._write_manifest(files, tasks)
+        self._tasks, self._files = tasks, files
+        return tasks
+
+    def get(self, name) -> TaskInfo:
+        try:
+            return self.tasks()[name]
+        except KeyError:
+            raise KeyError(f"Unknown task '{name}', expected one of {sorted(self.tasks())}") from None
+
+    def load_class(self, name):
+        """Import the task's module and return its class."""
+        if name not in self._classes:
+            info = self.get(name)
+            module = importlib.import_module(info.module)
+            self._classes[name] = getattr(module, info.class_name)
+        return self._classes[name]
+
+    def configuration_spec(self, name):
+        """The task's configuration_spec(), or None if it has none."""
+        if not self.get(name).has_configuration_spec:
+            return None
+        return self.load_class(name).configuration_spec()
+
+    def _scan(self, files):
+        tasks = {}
+        for path in sorted(files):
+            try:
+                info = parse_task_file(path, os.path.basename(os.path.dirname(path)))
+            except (OSError, SyntaxError) as e:
+                logger.warning(f"Skipping task file {path}: {e}")
+                continue
+            if info:
+                tasks[info.name] = info
+        return tasks
+
+    def _read_manifest(self, files):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("files") != files:
+            return None
+        return {item["name"]: TaskInfo(**item) for item in manifest["tasks"]}
+
+    def _write_manifest(self, files, tasks):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "files": files,
+            "tasks": [asdict(info) for info in tasks.values()]
+        }
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not write task manifest: {e}")
+
+
+_registry: Optional[TaskRegistry] = None
+
+
+def get_task_registry() -> TaskRegistry:
+    global _registry
+    if _registry is None:
+        _registry = TaskRegistry()
+    return _registry
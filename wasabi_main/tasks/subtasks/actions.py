@@ -1,24 +1,76 @@
 import asyncio
 import random
 import logging
+import weakref
 from typing import Optional, Callable, Any, List, Dict
 from playwright.async_api import Page, TimeoutError
 from functools import wraps
 from asyncio import Event
+from tasks.subtasks.step_engine import StepPlan, compile_steps
+from tasks.subtasks.locator_cache import get_locator_cache
+from tasks.subtasks.mouse_paths import MOTION_PROFILES, dispatch_path, path_cache
+from tasks.common.metrics import span, timed, timed_sleep
+from tasks.common.selector_registry import as_selector
+from tasks.subtasks.selectors import COMMON_SELECTORS
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pacing presets selectable per task: pause between steps and scale of the random hover/click pauses
+PACING_PROFILES = {
+    "human": {"step_delay": (1, 2), "pause_scale": 1.0, "motion_profile": "human"},
+    "fast": {"step_delay": (0.2, 0.5), "pause_scale": 0.25, "motion_profile": "batched"},
+    "none": {"step_delay": (0, 0), "pause_scale": 0, "motion_profile": "fast"}
+}
+
+TYPING_STRATEGIES = ("per_char", "chunked", "bulk")
 
 class GlobalActionTask:
-    def __init__(self):
-        # Dictionary to store mosue coordinates/position
-        self.mouse_tracker = {'x': None, 'y': None}
+    def __init__(self, step_delay=(1, 2), pause_scale=1.0, motion_profile="human", typing_strategy="per_char"):
+        # Last known mouse coordinates/position per page, so actions on parallel tabs don't mix them up
+        self.mouse_trackers = weakref.WeakKeyDictionary()
         self.interaction_allowed = Event()
         self.interaction_allowed.set()  # Initially allow interaction
+        self.step_delay = step_delay  # (min, max) seconds between steps, (0, 0) to disable
+        self.pause_scale = pause_scale  # Multiplier for random_wait pauses, 0 to disable
+        self.motion_profile = motion_profile  # Key into MOTION_PROFILES
+        if typing_strategy not in TYPING_STRATEGIES:
+            raise ValueError(f"Unknown typing strategy '{typing_strategy}', expected one of {TYPING_STRATEGIES}")
+        self.typing_strategy = typing_strategy  # Default strategy for human_type, one of TYPING_STRATEGIES
+        self.last_step_results = []
+        self.checkpoint = None  # Optional TaskCheckpoint used by perform_steps to skip and record steps
         self.action_registry = {
             'hover_and_click': self.hover_and_click,
             'confirm_navigation': self.confirm_navigation,
-            'check_input_value': self.check_input_value  # Adding the new method
+            'check_input_value': self.check_input_value,
+            'confirm_dynamic_update': self.confirm_dynamic_update,
+            'human_type': self.human_type,
+            'wait_for_first': self.wait_for_first,
+            'wait_for_page_change': self.wait_for_page_change,
+            'wait_for_ready': self.wait_for_ready,
+            'check_for_captcha_and_pause': self.check_for_captcha_and_pause,
+            'handle_additional_checks': self.handle_additional_checks,
+            'random_wait': self.random_wait
         }
+        # Allowed values of action parameters, checked by compile_steps
+        self.param_choices = {
+            'human_type': {'strategy': TYPING_STRATEGIES}
+        }
+
+    def mouse_tracker(self, page):
+        """The {'x', 'y'} mouse position tracked for `page`; both None until the first move on it."""
+        tracker = self.mouse_trackers.get(page)
+        if tracker is None:
+            tracker = self.mouse_trackers[page] = {'x': None, 'y': None}
+        return tracker
+
+    def reset_mouse_tracker(self, page):
+        """Forget the tracked position, e.g. when a pooled tab is handed to a new sub-flow."""
+        self.mouse_trackers.pop(page, None)
+
+    @classmethod
+    def with_pacing(cls, pacing="human", **overrides):
+        """Create an action task using one of the PACING_PROFILES presets, with optional overrides."""
+        return cls(**{**PACING_PROFILES[pacing], **overrides})
 
     def handle_element_errors(func):
         """Decorator to handle errors for actions performed on page elements, capturing all arguments flexibly."""
@@ -29,11 +81,12 @@ class GlobalActionTask:
             try:
                 return await func(self, *args, **kwargs)
             except TimeoutError as e:
-                logging.error(f"Timeout error while interacting with {element_description}: {e}")
+                logger.error(f"Timeout error while interacting with {element_description}: {e}")
             except Exception as e:
-                logging.error(f"An unexpected error occurred while interacting with {element_description}: {e}")
+                logger.error(f"An unexpected error occurred while interacting with {element_description}: {e}")
         return wrapper
     
+    @timed("action")
     async def check_for_captcha_and_pause(self, page: Page):
         """
         Check for the presence of a CAPTCHA challenge based on a known selector and pause automation for manual resolution.
@@ -47,21 +100,23 @@ class GlobalActionTask:
         """
         try:
             # Specific CAPTCHA container with a descendant link containing 'cloudflare'
-            await page.wait_for_selector("//div[@id='content'][.//a[contains(@href, 'cloudflare')]]", state="visible", timeout=10000)
-            print("CAPTCHA detected. Please solve the CAPTCHA manually.")
+            with span("captcha_check", "wait"):
+                await page.wait_for_selector(COMMON_SELECTORS["captcha_container"], state="visible", timeout=10000)
+            logger.warning("CAPTCHA detected. Please solve the CAPTCHA manually.")
             self.interaction_allowed.clear()  # Block further interactions
 
             # Wait for the success div to become visible, indicating CAPTCHA has been solved
-            await page.wait_for_selector("//div[@id='success'][contains(@style, 'visible')]", state="visible", timeout=30000)
-            print("CAPTCHA solved. Resuming automation.")
+            with span("captcha_solve", "wait"):
+                await page.wait_for_selector(COMMON_SELECTORS["captcha_success"], state="visible", timeout=30000)
+            logger.info("CAPTCHA solved. Resuming automation.")
             self.interaction_allowed.set()  # Allow interactions again
             return True
         except TimeoutError:
-            print("Timeout occurred: CAPTCHA was not solved in time or did not appear.")
+            logger.info("Timeout occurred: CAPTCHA was not solved in time or did not appear.")
             self.interaction_allowed.set()  # Ensure interactions are allowed if an error occurs
             return False
         except Exception as e:
-            print(f"An unexpected error occurred: {str(e)}")
+            logger.error(f"An unexpected error occurred: {str(e)}")
             self.interaction_allowed.set()  # Ensure interactions are allowed if an error occurs
             return False
 
@@ -82,14 +137,18 @@ class GlobalActionTask:
 
     async def random_wait(self, pause_type: Optional[str] = None):
         """Wait for a random amount of time based on the specified or random pause type."""
+        if self.pause_scale <= 0:
+            return
         if pause_type is None:
             pause_type = self.random_pause_type()
-        wait_time = self.random_wait_duration(pause_type)
-        await asyncio.sleep(wait_time)
+        wait_time = self.random_wait_duration(pause_type) * self.pause_scale
+        await timed_sleep(wait_time, f"random_wait_{pause_type}")
 
     async def get_target_coordinates(self, page, selector):
         """
         Calculate the center coordinates of an element given its selector.
+        Resolution goes through the page's LocatorCache, so an element already resolved by this
+        action is not looked up again.
         
         Args:
             page (Page): The Playwright page object.
@@ -98,11 +157,8 @@ class GlobalActionTask:
         Returns:
             tuple: A tuple containing the x and y coordinates of the element's center.
         """
-        element = await page.wait_for_selector(selector)
-        box = await element.bounding_box()
-        center_x = box['x'] + box['width'] / 2
-        center_y = box['y'] + box['height'] / 2
-        return center_x, center_y
+        target = await get_locator_cache(page).resolve(selector)
+        return target.center
 
 
     def calculate_bezier_point(self, t, start, control1, control2, end):
@@ -110,61 +166,58 @@ class GlobalActionTask:
         return (1 - t)**3 * start + 3 * (1 - t)**2 * t * control1 + 3 * (1 - t) * t**2 * control2 + t**3 * end
 
     async def smooth_mouse_move(self, page: Page, start_x, start_y, end_x, end_y):
-        """Smoothly moves the mouse from start to end coordinates using a Bezier curve."""
-        logging.info(f"Starting mouse movement from ({start_x}, {start_y})")
-        
-        # Control points could be randomized slightly to make the curve less predictable
-        control1_x = start_x + (end_x - start_x) * 0.3 + random.randint(-10, 10)
-        control1_y = start_y + (end_y - start_y) * 0.3 + random.randint(-10, 10)
-        control2_x = start_x + (end_x - start_x) * 0.6 + random.randint(-10, 10)
-        control2_y = start_y + (end_y - start_y) * 0.6 + random.randint(-10, 10)
-
-        steps = 30  # More steps for smoother motion
-        for step in range(steps):
-            t = step / float(steps)
-            x = self.calculate_bezier_point(t, start_x, control1_x, control2_x, end_x)
-            y = self.calculate_bezier_point(t, start_y, control1_y, control2_y, end_y)
-            await page.mouse.move(x, y)
-            await asyncio.sleep(random.uniform(0.02, 0.05))  # Short delay to mimic human speed
-
-        logging.info(f"Ending mouse movement at ({end_x}, {end_y})")
+        """Smoothly moves the mouse from start to end coordinates using a Bezier curve.
+        The path is precomputed in one pass and dispatched according to the task's motion profile."""
+        logger.debug("Starting mouse movement from (%s, %s)", start_x, start_y)
 
+        profile = MOTION_PROFILES[self.motion_profile]
+        points = path_cache.path(start_x, start_y, end_x, end_y, profile)
+        await dispatch_path(page, points, profile)
+
+        logger.debug("Ending mouse movement at (%s, %s)", end_x, end_y)
+
+    @timed("action")
     @handle_element_errors
     async def hover_and_click(self, page: Page, xpath: str, element_description: str,
                               hover_pause_type: Optional[str] = None,
                               click_pause_type: Optional[str] = None):
-        element = await page.wait_for_selector(xpath, state='visible')
-        if not await element.is_visible():
-            raise Exception(f"The element {element_description} is not visible.")
-
-        target_x, target_y = await self.get_target_coordinates(page, xpath)
+        # Resolve once: the handle and box are shared by the move, hover and click phases
+        target = await get_locator_cache(page).resolve(xpath, state='visible')
+        target_x, target_y = target.center
 
         # Move from the last known mouse position to the new element
-        if self.mouse_tracker['x'] is not None and self.mouse_tracker['y'] is not None:
-            await self.smooth_mouse_move(page, self.mouse_tracker['x'], self.mouse_tracker['y'], target_x, target_y)
+        mouse_tracker = self.mouse_tracker(page)
+        if mouse_tracker['x'] is not None and mouse_tracker['y'] is not None:
+            await self.smooth_mouse_move(page, mouse_tracker['x'], mouse_tracker['y'], target_x, target_y)
         else:
-            await page.mouse.move(target_x, target_y)
+            with span("mouse.move", "ipc"):
+                await page.mouse.move(target_x, target_y)
 
         # Update the mouse tracker with the new position
-        self.mouse_tracker['x'], self.mouse_tracker['y'] = target_x, target_y
+        mouse_tracker['x'], mouse_tracker['y'] = target_x, target_y
 
         # Random wait before hovering
         await self.random_wait(hover_pause_type)
         
         # Hover using precise coordinates
-        await page.mouse.move(target_x, target_y)
+        with span("mouse.move", "ipc"):
+            await page.mouse.move(target_x, target_y)
         
         # Random wait after hovering and before clicking
         await self.random_wait(click_pause_type)
         
         # Click using precise coordinates
-        await page.mouse.click(target_x, target_y)
+        with span("mouse.click", "ipc"):
+            await page.mouse.click(target_x, target_y)
         
         # Random wait after clicking
         await self.random_wait(click_pause_type)
 
-        print(f"Successfully hovered over and clicked on {element_description}, using click pause type: {click_pause_type} and hover pause type: {hover_pause_type}.")
+        logger.debug("Successfully hovered over and clicked on %s, using click pause type: %s and hover pause type: %s.",
+                     element_description, click_pause_type, hover_pause_type)
+        return True
     
+    @timed("action")
     @handle_element_errors
     async def confirm_dynamic_update(self, page: Page, update_description: str, expected_xpath: str, 
                                     timeout: int = 10000, state: str = "visible"):
@@ -186,16 +239,19 @@ class GlobalActionTask:
         """
         try:
             if state == "visible":
-                await page.wait_for_selector(f'xpath={expected_xpath}', state="attached", timeout=timeout)
-                print(f"Update confirmed: {update_description}, {expected_xpath} is now visible.")
+                with span("confirm_dynamic_update", "wait"):
+                    await page.wait_for_selector(as_selector(expected_xpath), state="attached", timeout=timeout)
+                logger.debug("Update confirmed: %s, %s is now visible.", update_description, expected_xpath)
             elif state == "hidden":
-                await page.wait_for_selector(f'xpath={expected_xpath}', state="detached", timeout=timeout)
-                print(f"Update confirmed: {update_description}, {expected_xpath} is now hidden.")
+                with span("confirm_dynamic_update", "wait"):
+                    await page.wait_for_selector(as_selector(expected_xpath), state="detached", timeout=timeout)
+                logger.debug("Update confirmed: %s, %s is now hidden.", update_description, expected_xpath)
             return True
         except TimeoutError as e:
-            print(f"Failed to confirm dynamic update for {update_description}. Error: {e}")
+            logger.warning(f"Failed to confirm dynamic update for {update_description}. Error: {e}")
             return False
     
+    @timed("action")
     @handle_element_errors
     async def check_input_value(self, page: Page, input_description: str, expected_value: str, xpath: str):
         """
@@ -209,116 +265,250 @@ class GlobalActionTask:
         Returns:
             bool: True if the input field contains the expected value, False otherwise.
         """
-        # Retrieve the current value from the input field
-        current_value = await page.input_value(xpath)
+        # Retrieve the current value from the input field, reusing the handle if it was just resolved
+        target = get_locator_cache(page).get(xpath)
+        with span("input_value", "ipc"):
+            if target:
+                current_value = await target.handle.input_value()
+            else:
+                current_value = await page.input_value(xpath)
 
         # Compare the current value with the expected value
         if current_value == expected_value:
-            print(f"Input check passed: {input_description} contains the expected value.")
+            logger.debug("Input check passed: %s contains the expected value.", input_description)
             return True
         else:
-            print(f"Input check failed: {input_description} does not contain the expected value. Found: {current_value}")
+            # Never log the value itself: the field may be a password
+            logger.warning(f"Input check failed: {input_description} does not contain the expected value "
+                           f"({len(current_value)} characters found, {len(expected_value)} expected).")
             return False
 
     
+    @timed("action")
+    async def wait_for_first(self, page: Page, outcomes: Dict[str, List[str]], timeout: int = 10000,
+                             state: str = "attached"):
+        """
+        Race every URL/selector outcome at once and return as soon as one of them matches.
+
+        An outcome matches when the page URL contains its URL key and one of its XPath selectors
+        reaches `state`. All candidates share a single deadline, so the worst case is `timeout`
+        rather than the sum of one timeout per candidate.
+
+        Args:
+            page (Page): The Playwright page object to watch.
+            outcomes (Dict[str, List[str]]): Dictionary where keys are URLs and values are lists of XPath selectors.
+            timeout (int): Overall timeout in milliseconds.
+            state (str): Element state to wait for, passed to wait_for_selector.
+
+        Returns:
+            tuple: (url, selector) of the first matching outcome, or (None, None) if none matched in time.
+        """
+        async def wait_for_outcome(url, selector):
+            await page.wait_for_url(lambda current_url: url in current_url, wait_until="commit", timeout=timeout)
+            await page.wait_for_selector(as_selector(selector), state=state, timeout=timeout)
+            if url not in page.url:
+                raise TimeoutError(f"{selector} matched after leaving {url}")
+            return url, selector
+
+        pending = {asyncio.create_task(wait_for_outcome(url, selector))
+                   for url, selectors in outcomes.items() for selector in selectors}
+        deadline = asyncio.get_running_loop().time() + timeout / 1000
+        with span("wait_for_first", "wait", candidates=len(pending)):
+            try:
+                while pending:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        break
+                    done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if not task.cancelled() and task.exception() is None:
+                            return task.result()
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            return None, None
+
+    @timed("action")
+    async def wait_for_page_change(self, page: Page, selector: Optional[str] = None, timeout: int = 300000):
+        """
+        Wait for a step the user completes by hand (a login code, 2-step verification) to finish.
+
+        Resolves on the first observed change instead of a fixed sleep: the URL moving away from
+        the current one, or `selector` (the element that marks the manual step) detaching.
+
+        Args:
+            page (Page): The Playwright page object to watch.
+            selector (Optional[str]): XPath of the element that disappears once the step is done.
+            timeout (int): Maximum time to wait in milliseconds.
+
+        Returns:
+            bool: True if a change was observed, False on timeout.
+        """
+        start_url = page.url
+        waits = [page.wait_for_url(lambda current_url: current_url != start_url, wait_until="commit", timeout=timeout)]
+        if selector:
+            waits.append(page.wait_for_selector(as_selector(selector), state="detached", timeout=timeout))
+
+        pending = {asyncio.create_task(wait) for wait in waits}
+        with span("wait_for_page_change", "wait"):
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    if any(not task.cancelled() and task.exception() is None for task in done):
+                        return True
+                return False
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @timed("action")
+    async def wait_for_ready(self, page: Page, ready_xpath: Optional[str] = None, timeout: int = 15000):
+        """
+        Targeted replacement for waiting on 'networkidle': wait for the DOM to be parsed and, if given,
+        for the one element the next action needs.
+
+        Args:
+            page (Page): The Playwright page object to wait on.
+            ready_xpath (Optional[str]): XPath of the element that marks the page as ready.
+            timeout (int): Timeout in milliseconds.
+        """
+        with span("wait_for_ready", "wait"):
+            await page.wait_for_load_state('domcontentloaded', timeout=timeout)
+            if ready_xpath:
+                await page.wait_for_selector(as_selector(ready_xpath), state="attached", timeout=timeout)
+
+    @timed("action")
     @handle_element_errors
     async def confirm_navigation(self, page: Page, page_name: str, outcomes: Dict[str, List[str]], timeout: int = 10000):
         """
         Confirms navigation by checking a dictionary of URLs and their associated XPath selectors.
+        All outcomes are raced with wait_for_first, so the first page that shows up wins.
         
         Args:
             page (Page): The Playwright page object on which actions are performed.
             page_name (str): Descriptive name for the page, used for logging.
             outcomes (Dict[str, List[str]]): Dictionary where keys are URLs and values are lists of XPath selectors associated with those URLs.
-            timeout (int): Timeout in milliseconds for each check.
+            timeout (int): Overall timeout in milliseconds.
         
         Returns:
             tuple: (bool, dict) where bool indicates if navigation was successful, and dict provides details of the navigation result.
         """
+        url, selector = await self.wait_for_first(page, outcomes, timeout=timeout)
         result = {
-            'url_confirmed': None,
-            'element_confirmed': None
+            'url_confirmed': url,
+            'element_confirmed': selector
         }
-        current_url = page.url
-
-        for url, selectors in outcomes.items():
-            if url in current_url:
-                result['url_confirmed'] = url
-                for selector in selectors:
-                    try:
-                        await page.wait_for_selector(f'xpath={selector}', state="attached", timeout=timeout)
-                        result['element_confirmed'] = selector
-                        return True, result
-                    except TimeoutError:
-                        continue
-                break
-
-        logging.error(f"Failed to confirm navigation for {page_name}. Current URL: {current_url}")
-        return False, result
+        if url is None:
+            logger.error(f"Failed to confirm navigation for {page_name}. Current URL: {page.url}")
+            return False, result
+        return True, result
 
     async def handle_additional_checks(self, page: Page):
         """
         Placeholder for additional checks, such as bot detection handling.
         """
         # Implementation of additional security or bot detection measures.
-        logging.info("Implement additional checks here.")
+        logger.info("Implement additional checks here.")
     
+    def compile_steps(self, steps, name=None) -> StepPlan:
+        """Validate and compile step definitions once so they can be run many times. See step_engine.compile_steps."""
+        return compile_steps(self, steps, name)
+
     async def perform_steps(self, page: Page, steps):
         """
         Performs a sequence of specified actions and checks on a given page.
 
         Args:
             page (Page): Playwright page object where actions are performed.
-            steps (list): Each item in the list defines an action or a check.
-        """
-        for step in steps:
-            action_type = step['type']
-            params = step['params']
-            action_func = self.action_registry.get(action_type)
+            steps (list | StepPlan): Step definitions, or a plan already built with compile_steps.
 
-            if not action_func:
-                print(f"Action type '{action_type}' is not supported.")
-                continue
+        Returns:
+            bool: True if every step succeeded. Per-step results are kept in `last_step_results`.
+            With a `checkpoint` set, steps completed by an earlier run are skipped.
+        """
+        plan = steps if isinstance(steps, StepPlan) else self.compile_steps(steps)
+        self.last_step_results = await plan.run(page, step_delay=self.step_delay, checkpoint=self.checkpoint)
+        return all(result.success for result in self.last_step_results) and len(self.last_step_results) == len(plan)
 
-            # Execute the function corresponding to the action type
-            result = await action_func(page, **params)
+    @timed("action")
+    async def human_type(self, page, xpath, element_description: str, text, min_delay=0.05, max_delay=0.15,
+                         strategy: Optional[str] = None, verify: bool = True):
+        """
+        Click into an input and type `text` into it.
 
-            # Handle the result based on the action type
-            if action_type == 'confirm_navigation' and not result['url_confirmed']:
-                print(f"Failed to confirm navigation to: {params['page_name']}")
-                return False
-            elif action_type in ['hover_and_click', 'check_input_value'] and not result:
-                print(f"Action '{action_type}' failed at step with description: {params.get('description', 'No description provided')}")
-                return False
+        Args:
+            page (Page): The Playwright page object where actions are performed.
+            xpath (str): The XPath to the input field.
+            element_description (str): Description of the input, used for logging.
+            text (str): The text to type.
+            min_delay (float): Minimum delay in seconds between key events.
+            max_delay (float): Maximum delay in seconds between key events.
+            strategy (Optional[str]): One of TYPING_STRATEGIES, the task's typing_strategy if None.
+                'per_char' presses and releases each key with human-like delays, 'chunked' sends short
+                runs through keyboard.type, 'bulk' inserts the whole text at once.
+            verify (bool): Check the field's value with check_input_value after typing.
 
-            print(f"Action '{action_type}' successful.")
-            await asyncio.sleep(random.uniform(1, 2))  # Random short pause for realism
+        Returns:
+            bool: True if the text was typed (and verified, when requested).
 
-        return True
+        Raises:
+            ValueError: For an unknown strategy; a programming error, not a failed interaction.
+        """
+        strategy = strategy or self.typing_strategy
+        if strategy not in TYPING_STRATEGIES:
+            raise ValueError(f"Unknown typing strategy '{strategy}', expected one of {TYPING_STRATEGIES}")
+        return await self._type_into(page, xpath, element_description, text, min_delay, max_delay, strategy, verify)
 
-    async def human_type(self, page, xpath, element_description: str, text, min_delay=0.05, max_delay=0.15):
-        target_x, target_y = await self.get_target_coordinates(page, xpath)
+    @handle_element_errors
+    async def _type_into(self, page, xpath, element_description, text, min_delay, max_delay, strategy, verify):
+        target = await get_locator_cache(page).resolve(xpath, state='visible')
+        target_x, target_y = target.center
 
         # Move mouse to the element and click to focus
-        if self.mouse_tracker['x'] is not None and self.mouse_tracker['y'] is not None:
-            await self.smooth_mouse_move(page, self.mouse_tracker['x'], self.mouse_tracker['y'], target_x, target_y)
+        mouse_tracker = self.mouse_tracker(page)
+        if mouse_tracker['x'] is not None and mouse_tracker['y'] is not None:
+            await self.smooth_mouse_move(page, mouse_tracker['x'], mouse_tracker['y'], target_x, target_y)
         else:
-            await page.mouse.move(target_x, target_y)
+            with span("mouse.move", "ipc"):
+                await page.mouse.move(target_x, target_y)
 
-        await page.mouse.click(target_x, target_y)  # Click to focus the input field
-        self.mouse_tracker['x'], self.mouse_tracker['y'] = target_x, target_y  # Update the mouse position tracker
+        with span("mouse.click", "ipc"):
+            await page.mouse.click(target_x, target_y)  # Click to focus the input field
+        mouse_tracker['x'], mouse_tracker['y'] = target_x, target_y  # Update the mouse position tracker
         await self.random_wait('short')
-        for char in text:
-            # Simulate pressing the key
-            await page.keyboard.down(char)
-            # Wait for a human-like delay before releasing the key
-            await asyncio.sleep(random.uniform(min_delay, max_delay))
-            # Simulate releasing the key
-            await page.keyboard.up(char)
-            # Wait for a human-like delay before the next key press
-            await asyncio.sleep(random.uniform(min_delay, max_delay))
-
-        print(f"Finished typing '{text}' into {element_description} with human-like delays.")
+
+        if strategy == "bulk":
+            with span("keyboard.insert_text", "ipc"):
+                await page.keyboard.insert_text(text)
+        elif strategy == "chunked":
+            index = 0
+            while index < len(text):
+                chunk = text[index:index + random.randint(3, 6)]
+                # keyboard.type spends most of its time in its own per-key delay
+                with span("keyboard.type", "pause"):
+                    await page.keyboard.type(chunk, delay=random.uniform(min_delay, max_delay) * 1000)
+                index += len(chunk)
+                if index < len(text):
+                    await timed_sleep(random.uniform(min_delay, max_delay), "typing_delay")
+        else:
+            for char in text:
+                # Simulate pressing the key
+                with span("keyboard.down", "ipc"):
+                    await page.keyboard.down(char)
+                # Wait for a human-like delay before releasing the key
+                await timed_sleep(random.uniform(min_delay, max_delay), "typing_delay")
+                # Simulate releasing the key
+                with span("keyboard.up", "ipc"):
+                    await page.keyboard.up(char)
+                # Wait for a human-like delay before the next key press
+                await timed_sleep(random.uniform(min_delay, max_delay), "typing_delay")
+
+        logger.debug("Finished typing into %s using the '%s' strategy.", element_description, strategy)
+        if verify:
+            return await self.check_input_value(page, element_description, text, xpath)
+        return True
 
     async def handle_additional_checks(self, page: Page):
         """
@@ -326,4 +516,4 @@ class GlobalActionTask:
         """
         # Placeholder for additional checks
         # Example: await page.wait_for_selector("selector_for_bot_check", timeout=500)
-        logging.info("Additional check needed here! Implement detection and handling for bot security measures.")
\ No newline at end of file
+        logger.info("Additional check needed here! Implement detection and handling for bot security measures.")
\ No newline at end of file
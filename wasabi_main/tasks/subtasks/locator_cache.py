@@ -0,0 +1,136 @@
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from tasks.common.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Reports DOM structure/layout changes, scrolling and viewport resizes back to Python at most once per
+# animation frame. Bounding boxes are viewport coordinates, so a scroll or resize moves them as well
+MUTATION_OBSERVER_SCRIPT = """
+(() => {
+    if (window.__wasabiObserver || !window.__wasabiDomChanged) return;
+    let scheduled = false;
+    const changed = () => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => { scheduled = false; window.__wasabiDomChanged(); });
+    };
+    window.__wasabiObserver = new MutationObserver(changed);
+    const start = () => window.__wasabiObserver.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['style', 'class', 'hidden']
+    });
+    if (document.documentElement) start(); else document.addEventListener('DOMContentLoaded', start);
+    // Capturing catches scrolls of inner containers too, which don't bubble
+    window.addEventListener('scroll', changed, {capture: true, passive: true});
+    window.addEventListener('resize', changed, {passive: true});
+})();
+"""
+
+
+@dataclass
+class ResolvedTarget:
+    """An element resolved once and shared by every phase (move, hover, click, type) of an action."""
+    selector: str
+    state: str
+    handle: Any
+    box: Dict[str, float]
+    dom_version: int
+
+    @property
+    def center(self):
+        return self.box['x'] + self.box['width'] / 2, self.box['y'] + self.box['height'] / 2
+
+
+class LocatorCache:
+    """
+    Per-page cache of resolved element handles and bounding boxes.
+
+    Entries are keyed by selector and wait state, and dropped when the main frame navigates or the
+    page reports a DOM mutation, a scroll or a resize, so a cached target is only reused while the
+    element it points at can not have moved.
+    """
+    def __init__(self, page):
+        self._page_ref = weakref.ref(page)  # The page's event emitter references us, avoid a cycle
+        self.dom_version = 0
+        self._entries: Dict[Tuple[str, str], ResolvedTarget] = {}
+        self._installed = False
+        page.on("framenavigated", self._on_frame_navigated)
+
+    @property
+    def page(self):
+        return self._page_ref()
+
+    async def install(self):
+        """Expose the change callback and start observing the current and future documents."""
+        if self._installed:
+            return
+        self._installed = True
+        try:
+            await self.page.expose_binding("__wasabiDomChanged", lambda source: self.invalidate())
+            await self.page.add_init_script(MUTATION_OBSERVER_SCRIPT)
+            await self.page.evaluate(MUTATION_OBSERVER_SCRIPT)
+        except Exception as e:
+            # Without the observer the cache still invalidates on navigation, just not on mutations or scrolling
+            logger.warning(f"Could not install DOM mutation observer: {e}")
+
+    def _on_frame_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.invalidate()
+
+    def invalidate(self, selector: Optional[str] = None):
+        if selector is None:
+            self.dom_version += 1
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries if key[0] == selector]:
+                del self._entries[key]
+
+    def get(self, selector: str, state: str = "visible") -> Optional[ResolvedTarget]:
+        target = self._entries.get((selector, state))
+        if target and target.dom_version == self.dom_version:
+            return target
+        return None
+
+    async def resolve(self, selector: str, state: str = "visible", timeout: Optional[int] = None) -> ResolvedTarget:
+        """
+        Wait for `selector` and measure it, or return the cached result if the DOM has not changed since.
+
+        Args:
+            selector (str): The selector of the element.
+            state (str): State to wait for, passed to wait_for_selector.
+            timeout (Optional[int]): Timeout in milliseconds, Playwright's default if None.
+
+        Returns:
+            ResolvedTarget: The element handle, its bounding box and center.
+        """
+        target = self.get(selector, state)
+        if target:
+            return target
+
+        await self.install()
+        dom_version = self.dom_version
+        with span("wait_for_selector", "wait"):
+            handle = await self.page.wait_for_selector(selector, state=state, timeout=timeout)
+        with span("bounding_box", "ipc"):
+            box = await handle.bounding_box()
+        if box is None:
+            raise Exception(f"The element {selector} is not visible.")
+
+        target = ResolvedTarget(selector, state, handle, box, dom_version)
+        if dom_version == self.dom_version:
+            self._entries[(selector, state)] = target
+        return target
+
+
+_caches = weakref.WeakKeyDictionary()
+
+
+def get_locator_cache(page) -> LocatorCache:
+    """Return the LocatorCache for `page`, creating it on first use."""
+    cache = _caches.get(page)
+    if cache is None:
+        cache = LocatorCache(page)
+        _caches[page] = cache
+    return cache
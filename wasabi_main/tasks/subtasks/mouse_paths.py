@@ -0,0 +1,134 @@
+import math
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from tasks.common.metrics import span, timed_sleep
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python path gives the same points
+    np = None
+
+
+@dataclass(frozen=True)
+class MotionProfile:
+    """
+    How a pointer move is dispatched.
+
+    mode:
+        'human'   - one mouse.move per path point with a short random delay (the original behavior)
+        'batched' - the curve is cut into `waypoints` segments, each sent as one mouse.move(steps=...)
+                    call that the driver interpolates, with no delays
+        'fast'    - a single hop straight to the target
+    """
+    mode: str = "human"
+    steps: Optional[int] = None  # Path points; None picks a count from the distance
+    delay: Tuple[float, float] = (0.02, 0.05)  # Seconds between points in 'human' mode
+    waypoints: int = 4  # Driver calls per move in 'batched' mode
+
+
+MOTION_PROFILES: Dict[str, MotionProfile] = {
+    "human": MotionProfile("human", steps=30),
+    "batched": MotionProfile("batched", waypoints=4),
+    "fast": MotionProfile("fast")
+}
+
+
+@lru_cache(maxsize=64)
+def bezier_basis(steps: int):
+    """Cubic Bernstein weights for t in (0, 1], one row of four weights per step."""
+    rows = []
+    for step in range(1, steps + 1):
+        t = step / steps
+        rows.append(((1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3))
+    if np is not None:
+        return np.array(rows)
+    return tuple(rows)
+
+
+def bezier_curve(controls, steps: int) -> List[Tuple[float, float]]:
+    """
+    Evaluate a cubic Bezier curve at `steps` points in one pass.
+
+    Args:
+        controls: Four (x, y) control points.
+        steps (int): Number of points to produce, the last one being the end point.
+
+    Returns:
+        List[Tuple[float, float]]: The curve points.
+    """
+    basis = bezier_basis(steps)
+    if np is not None:
+        return [tuple(point) for point in (basis @ np.asarray(controls, dtype=float)).tolist()]
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = controls
+    return [(a * x0 + b * x1 + c * x2 + d * x3, a * y0 + b * y1 + c * y2 + d * y3) for a, b, c, d in basis]
+
+
+class PathCache:
+    """
+    Caches normalized path shapes by distance bucket.
+
+    A shape is a curve from (0, 0) to (1, 0) in a frame aligned with the move; it is rotated and
+    scaled onto the actual start/end points, so a handful of shapes per bucket serve every move of
+    a similar length while still varying between moves.
+    """
+    def __init__(self, bucket_size=100, variants=4):
+        self.bucket_size = bucket_size
+        self.variants = variants
+        self._shapes: Dict[Tuple[int, int], List[List[Tuple[float, float]]]] = {}
+
+    def steps_for(self, distance, profile: MotionProfile):
+        if profile.steps:
+            return profile.steps
+        return max(5, min(40, int(distance / 20)))
+
+    def shape(self, distance, steps):
+        bucket = int(distance // self.bucket_size)
+        shapes = self._shapes.setdefault((bucket, steps), [])
+        if len(shapes) < self.variants:
+            # Same jitter as the original control points: about +-10px off the straight line
+            scale = max((bucket + 0.5) * self.bucket_size, 1)
+            controls = [
+                (0.0, 0.0),
+                (0.3 + random.uniform(-0.05, 0.05), random.randint(-10, 10) / scale),
+                (0.6 + random.uniform(-0.05, 0.05), random.randint(-10, 10) / scale),
+                (1.0, 0.0)
+            ]
+            shapes.append(bezier_curve(controls, steps))
+            return shapes[-1]
+        return random.choice(shapes)
+
+    def path(self, start_x, start_y, end_x, end_y, profile: MotionProfile):
+        """Return the points of a move from start to end, ending exactly on the target."""
+        dx, dy = end_x - start_x, end_y - start_y
+        distance = math.hypot(dx, dy)
+        if distance < 1:
+            return [(end_x, end_y)]
+        shape = self.shape(distance, self.steps_for(distance, profile))
+        # Map (u along the move, v across it) back onto the page
+        return [(start_x + u * dx - v * dy, start_y + u * dy + v * dx) for u, v in shape[:-1]] + [(end_x, end_y)]
+
+
+path_cache = PathCache()
+
+
+async def dispatch_path(page, points, profile: MotionProfile):
+    """Send a precomputed path to the browser according to `profile`."""
+    if profile.mode == "fast" or len(points) == 1:
+        with span("mouse.move", "ipc"):
+            await page.mouse.move(*points[-1])
+        return
+
+    if profile.mode == "batched":
+        segment = max(1, math.ceil(len(points) / profile.waypoints))
+        with span("mouse.move", "ipc", points=len(points)):
+            for index in range(segment - 1, len(points) + segment - 1, segment):
+                x, y = points[min(index, len(points) - 1)]
+                await page.mouse.move(x, y, steps=segment)
+        return
+
+    for x, y in points:
+        with span("mouse.move", "ipc"):
+            await page.mouse.move(x, y)
+        await timed_sleep(random.uniform(*profile.delay), "mouse_delay")  # Short delay to mimic human speed
@@ -0,0 +1,9 @@
+# selectors.py
+from tasks.common.selector_registry import SelectorRegistry
+
+# Selectors of the site-independent checks in GlobalActionTask
+COMMON_SELECTORS = SelectorRegistry("common", {
+    # Cloudflare challenge container, and the banner it shows once solved
+    "captcha_container": "//div[@id='content'][.//a[contains(@href, 'cloudflare')]]",
+    "captcha_success": "//div[@id='success'][contains(@style, 'visible')]",
+})
@@ -0,0 +1,211 @@
+import asyncio
+import inspect
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from tasks.common.logs import log_context
+
+logger = logging.getLogger(__name__)
+
+# How to read each action's raw return value as success/failure. Actions not listed succeed on a truthy result.
+RESULT_INTERPRETERS: Dict[str, Callable[[Any], bool]] = {
+    'confirm_navigation': lambda result: bool(result and result[0]),
+    'wait_for_first': lambda result: bool(result and result[0]),
+    'check_for_captcha_and_pause': lambda result: True,  # A check: no CAPTCHA is not a failure
+    'random_wait': lambda result: True,
+    'handle_additional_checks': lambda result: True,
+    'wait_for_ready': lambda result: True,  # Raises on timeout
+}
+
+# Actions that do not take the page as their first argument
+PAGELESS_ACTIONS = {'random_wait'}
+
+STEP_KEYS = {'id', 'type', 'params', 'timeout', 'retries', 'retry_delay', 'description', 'checkpoint'}
+
+
+class StepDefinitionError(ValueError):
+    """Raised when a step list cannot be compiled into a plan."""
+
+
+@dataclass
+class StepResult:
+    """Uniform outcome of one executed step."""
+    step_id: str
+    action: str
+    success: bool
+    value: Any = None
+    duration: float = 0.0  # Seconds, including retries
+    attempts: int = 1
+    error: Optional[str] = None
+    skipped: bool = False  # Completed by an earlier run and skipped on resume
+
+
+@dataclass
+class CompiledStep:
+    step_id: str
+    action: str
+    func: Callable
+    params: Dict[str, Any]
+    description: str
+    timeout: Optional[float] = None  # Seconds
+    retries: int = 0
+    retry_delay: float = 0.0  # Seconds
+    interpret: Callable[[Any], bool] = bool
+    checkpoint: bool = True  # Record completion; False for steps whose effect a reload would undo
+
+    async def execute(self, page):
+        args = () if self.action in PAGELESS_ACTIONS else (page,)
+        call = self.func(*args, **self.params)
+        if self.timeout is not None:
+            return await asyncio.wait_for(call, self.timeout)
+        return await call
+
+
+@dataclass
+class StepPlan:
+    """An ordered list of validated steps, ready to run against a page."""
+    steps: List[CompiledStep] = field(default_factory=list)
+    name: Optional[str] = None  # Prefix of the plan's checkpoint keys
+
+    def __len__(self):
+        return len(self.steps)
+
+    def checkpoint_key(self, step):
+        return f"{self.name or 'plan'}/{step.step_id}"
+
+    async def run(self, page, step_delay=(0, 0), checkpoint=None):
+        """
+        Execute the plan, stopping at the first failed step.
+
+        Args:
+            page (Page): Playwright page object where actions are performed.
+            step_delay (tuple): (min, max) seconds to pause between steps; (0, 0) disables pacing.
+            checkpoint (Optional[TaskCheckpoint]): Steps it lists as done are skipped, and every
+                step that succeeds is recorded in it.
+
+        Returns:
+            List[StepResult]: One result per step, skipped ones included; the last one is the failure, if any.
+        """
+        results = []
+        ran_step = False
+        for step in self.steps:
+            if checkpoint is not None and step.checkpoint and checkpoint.is_done(self.checkpoint_key(step)):
+                logger.info(f"Step '{step.step_id}' ({step.action}) completed in an earlier run, skipping.")
+                results.append(StepResult(step.step_id, step.action, True, attempts=0, skipped=True))
+                continue
+            if ran_step and step_delay[1] > 0:
+                await asyncio.sleep(random.uniform(*step_delay))
+
+            with log_context(step=self.checkpoint_key(step)):
+                result = await run_step(page, step)
+            ran_step = True
+            results.append(result)
+            if result.success:
+                if checkpoint is not None and step.checkpoint:
+                    await checkpoint.mark_done(self.checkpoint_key(step), page)
+                logger.info(f"Step '{step.step_id}' ({step.action}) succeeded in {result.duration:.3f}s.")
+            else:
+                logger.error(f"Step '{step.step_id}' ({step.action}) failed after {result.attempts} attempt(s) "
+                              f"in {result.duration:.3f}s: {step.description}. {result.error or ''}")
+                break
+        return results
+
+
+async def run_step(page, step):
+    start = time.perf_counter()
+    value, error = None, None
+    for attempt in range(1, step.retries + 2):
+        try:
+            value = await step.execute(page)
+            error = None
+            if step.interpret(value):
+                return StepResult(step.step_id, step.action, True, value, time.perf_counter() - start, attempt)
+        except asyncio.TimeoutError:
+            error = f"Timed out after {step.timeout}s"
+        except Exception as e:
+            error = str(e)
+        if attempt <= step.retries and step.retry_delay:
+            await asyncio.sleep(step.retry_delay)
+    return StepResult(step.step_id, step.action, False, value, time.perf_counter() - start, attempt, error)
+
+
+def compile_steps(action_task, steps, name=None):
+    """
+    Validate step definitions and bind them to `action_task`'s actions.
+
+    Each step is a dict with 'type' and 'params', and optionally 'id', 'description', 'timeout' (ms),
+    'retries', 'retry_delay' (ms) and 'checkpoint' (False to never skip the step on resume).
+    Unknown actions, unknown keys, parameters that do not match the action's signature, values
+    outside the action task's `param_choices` and duplicate ids raise StepDefinitionError, so a
+    bad flow fails before any browser is launched.
+
+    Args:
+        action_task (GlobalActionTask): Provides the action registry.
+        steps (list): Step definitions.
+        name (Optional[str]): Plan name, used to key its steps in checkpoints.
+
+    Returns:
+        StepPlan: The compiled plan.
+    """
+    compiled = []
+    step_ids = set()
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict) or 'type' not in step:
+            raise StepDefinitionError(f"Step {index} must be a dict with a 'type' key.")
+        unknown_keys = set(step) - STEP_KEYS
+        if unknown_keys:
+            raise StepDefinitionError(f"Step {index} has unknown keys: {sorted(unknown_keys)}")
+
+        action = step['type']
+        func = action_task.action_registry.get(action)
+        if func is None:
+            raise StepDefinitionError(f"Step {index}: action type '{action}' is not supported.")
+
+        params = dict(step.get('params', {}))
+        try:
+            if action in PAGELESS_ACTIONS:
+                inspect.signature(func).bind(**params)
+            else:
+                inspect.signature(func).bind(None, **params)
+        except TypeError as e:
+            raise StepDefinitionError(f"Step {index}: invalid params for '{action}': {e}") from None
+        for param, allowed in getattr(action_task, 'param_choices', {}).get(action, {}).items():
+            if params.get(param) is not None and params[param] not in allowed:
+                raise StepDefinitionError(f"Step {index}: '{param}' of '{action}' must be one of {list(allowed)}, "
+                                          f"got {params[param]!r}.")
+
+        timeout = step.get('timeout')
+        retries = step.get('retries', 0)
+        retry_delay = step.get('retry_delay', 0)
+        if not isinstance(retries, int) or isinstance(retries, bool) or retries < 0:
+            raise StepDefinitionError(f"Step {index}: 'retries' must be a non-negative integer.")
+        for key, value in (('timeout', timeout), ('retry_delay', retry_delay)):
+            if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0):
+                raise StepDefinitionError(f"Step {index}: '{key}' must be a non-negative number of milliseconds.")
+        if timeout == 0:
+            # wait_for(call, 0) fails every attempt at once; leave 'timeout' out for no limit
+            raise StepDefinitionError(f"Step {index}: 'timeout' must be greater than 0.")
+
+        # Ids key the steps' checkpoints, a duplicate would mark one step done for the other
+        step_id = str(step.get('id', f"{index}:{action}"))
+        if step_id in step_ids:
+            raise StepDefinitionError(f"Step {index}: duplicate step id '{step_id}'.")
+        step_ids.add(step_id)
+
+        description = (step.get('description') or params.get('element_description')
+                       or params.get('page_name') or params.get('input_description') or action)
+        compiled.append(CompiledStep(
+            step_id=step_id,
+            action=action,
+            func=func,
+            params=params,
+            description=description,
+            timeout=timeout / 1000 if timeout is not None else None,
+            retries=retries,
+            retry_delay=(retry_delay or 0) / 1000,
+            interpret=RESULT_INTERPRETERS.get(action, bool),
+            checkpoint=bool(step.get('checkpoint', True))
+        ))
+    return StepPlan(compiled, name)
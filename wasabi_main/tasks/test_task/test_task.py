@@ -1,14 +1,28 @@
 import asyncio
-from playwright.async_api import async_playwright
+from tasks.browser_manager import BrowserManager
+from tasks.browser_pool import get_browser_pool
+from tasks.common.launch_profiles import launch_profile_input
 
 class TestTask:
+    """Open a page in a pooled browser to check the setup."""
     def __init__(self, task_config):
         self.task_config = task_config
+        self.browser_manager = None
 
     async def run(self):
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            page = await browser.new_page()
+        self.browser_manager = BrowserManager(pool=get_browser_pool(self.task_config.get("launch_profile")))
+        try:
+            context = await self.browser_manager.launch_browser()
+            page = await context.new_page()
             await page.goto("https://www.google.com")
             await asyncio.sleep(5)  # For demonstration
-            await browser.close()
\ No newline at end of file
+        finally:
+            await self.browser_manager.close_browser()
+
+    @staticmethod
+    def configuration_spec():
+        return {
+            "inputs": [
+                launch_profile_input()
+            ]
+        }
@@ -0,0 +1,75 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """Serves fixture files quietly; a directory path serves its index.html without a redirect."""
+    def translate_path(self, path):
+        translated = super().translate_path(path)
+        if os.path.isdir(translated):
+            translated = os.path.join(translated, "index.html")
+        return translated
+
+    def send_head(self):
+        # Directory paths without a trailing slash would otherwise get a 301
+        self.path = self.path.split("?", 1)[0]
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Local HTTP server for recorded pages.
+
+    Fixtures are laid out as `fixtures/<host>/<path>/index.html`; `route_site` sends a real
+    site's requests (e.g. https://www.indeed.com/...) to the matching fixture, so flows that
+    hard-code site URLs run unchanged and page.url still shows the real address.
+    """
+    def __init__(self, directory=FIXTURES_DIR, host="127.0.0.1", port=0):
+        handler = functools.partial(FixtureRequestHandler, directory=directory)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    async def route_site(self, context, hosts):
+        """Serve every request for `hosts` from the fixtures and abort any other external request."""
+        async def handle(route):
+            parts = urlsplit(route.request.url)
+            if parts.hostname in hosts:
+                response = await route.fetch(url=self.url_for(f"{parts.hostname}{parts.path}"))
+                await route.fulfill(response=response)
+            elif parts.hostname in ("127.0.0.1", "localhost"):
+                await route.fallback()
+            else:
+                await route.abort("blockedbyclient")
+
+        await context.route("**/*", handle)
@@ -0,0 +1,251 @@
+"""
+Offline benchmarks for the WASABI action primitives and the Indeed flows.
+
+Recorded pages under fixtures/ are served from a local HTTP server and the Indeed hosts are routed
+to them, so IndeedLogin and IndeedJobSearch run unchanged, headless and with pacing turned off.
+Results are written as JSON that can be compared across commits:
+
+    python wasabi_test/benchmark/run_benchmarks.py --iterations 10 --output bench.json
+    python wasabi_test/benchmark/run_benchmarks.py --compare bench.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import aclosing
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+WASABI_MAIN = os.path.join(os.path.dirname(os.path.dirname(BENCHMARK_DIR)), "wasabi_main")
+sys.path.insert(0, WASABI_MAIN)
+
+from fixture_server import FixtureServer
+from tasks.browser_manager import BrowserManager
+from tasks.common.metrics import MetricsRecorder, reset_recorder, use_recorder
+from tasks.indeed_task.jobsearch import IndeedJobSearch
+from tasks.indeed_task.login import IndeedLogin
+from tasks.subtasks.actions import GlobalActionTask, TYPING_STRATEGIES
+from tasks.subtasks.mouse_paths import MOTION_PROFILES
+
+INDEED_HOSTS = {"www.indeed.com", "secure.indeed.com", "onboarding.indeed.com"}
+SESSION_COOKIE = {"name": "wasabi_bench_session", "value": "1", "domain": ".indeed.com", "path": "/"}
+TARGET_XPATH = "//button[@id='target']"
+INPUT_XPATH = "//input[@id='text-input']"
+
+
+def succeeded(result):
+    """Actions report failure as False or a (False, details) tuple; None means the action has no result."""
+    if isinstance(result, tuple):
+        return bool(result[0])
+    return result is not False
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class BenchmarkRunner:
+    def __init__(self, server, iterations, name_filter=None):
+        self.server = server
+        self.iterations = iterations
+        self.name_filter = name_filter
+        self.manager = BrowserManager(launch_profile="headless")
+        self.browser = None
+        self.results = {}
+
+    async def start(self):
+        await self.manager.start_playwright()
+        self.browser = await self.manager.new_browser()
+
+    async def close(self):
+        await self.browser.close()
+        await self.manager.playwright.stop()
+
+    async def measure(self, name, body, setup=None, signed_in=False):
+        """Run `body(page)` `iterations` times, each in a fresh context, and record its latency."""
+        if self.name_filter and self.name_filter not in name:
+            return
+        durations, successes = [], 0
+        kinds = defaultdict(float)
+        for _ in range(self.iterations):
+            context = await self.manager.new_context(self.browser)
+            await self.server.route_site(context, INDEED_HOSTS)
+            if signed_in:
+                await context.add_cookies([SESSION_COOKIE])
+            page = await context.new_page()
+            try:
+                if setup:
+                    await setup(page)
+                recorder = MetricsRecorder(task_name=name)
+                token = use_recorder(recorder)
+                start = time.perf_counter()
+                try:
+                    result = await body(page)
+                finally:
+                    durations.append(time.perf_counter() - start)
+                    reset_recorder(token)
+                successes += succeeded(result)
+                for kind, seconds in recorder.summary().items():
+                    kinds[kind] += seconds
+            finally:
+                await context.close()
+
+        self.results[name] = {
+            "n": len(durations),
+            "ok": successes,
+            "p50_ms": percentile(durations, 50) * 1000,
+            "p95_ms": percentile(durations, 95) * 1000,
+            "mean_ms": sum(durations) / len(durations) * 1000,
+            "min_ms": min(durations) * 1000,
+            "max_ms": max(durations) * 1000,
+            "mean_ms_by_kind": {kind: seconds / len(durations) * 1000 for kind, seconds in kinds.items()}
+        }
+        print(f"{name:<40} p50 {self.results[name]['p50_ms']:9.1f} ms  p95 {self.results[name]['p95_ms']:9.1f} ms  "
+              f"ok {successes}/{len(durations)}")
+
+    async def run_primitives(self):
+        primitives_url = self.server.url_for("local/primitives.html")
+        action_task = GlobalActionTask.with_pacing("none")
+
+        async def open_primitives(page):
+            await page.goto(primitives_url)
+
+        await self.measure("action.hover_and_click",
+                           lambda page: action_task.hover_and_click(page, TARGET_XPATH, "Target"),
+                           setup=open_primitives)
+
+        for profile in MOTION_PROFILES:
+            mover = GlobalActionTask.with_pacing("none", motion_profile=profile)
+            await self.measure(f"action.smooth_mouse_move[{profile}]",
+                               lambda page, mover=mover: mover.smooth_mouse_move(page, 10, 10, 900, 500),
+                               setup=open_primitives)
+
+        for strategy in TYPING_STRATEGIES:
+            await self.measure(f"action.human_type[{strategy}]",
+                               lambda page, strategy=strategy: action_task.human_type(
+                                   page, INPUT_XPATH, "Benchmark input", "software engineer chicago", strategy=strategy),
+                               setup=open_primitives)
+
+        async def fill_input(page):
+            await open_primitives(page)
+            await page.fill(INPUT_XPATH, "expected")
+
+        await self.measure("action.check_input_value",
+                           lambda page: action_task.check_input_value(page, "Benchmark input", "expected", INPUT_XPATH),
+                           setup=fill_input)
+
+        await self.measure("action.confirm_navigation",
+                           lambda page: action_task.confirm_navigation(
+                               page, "Primitives", {self.server.base_url: ["//h1[@id='title']"]}, timeout=5000),
+                           setup=open_primitives)
+
+        await self.measure("action.wait_for_first[3 candidates]",
+                           lambda page: action_task.wait_for_first(page, {
+                               "https://nowhere.invalid": ["//h1"],
+                               self.server.base_url: ["//div[@id='missing']", "//button[@id='target']"]
+                           }, timeout=5000),
+                           setup=open_primitives)
+
+    async def run_flows(self):
+        action_task = GlobalActionTask.with_pacing("none", typing_strategy="bulk")
+        login = IndeedLogin("bench@example.com", "bench-password", action_task=action_task, ready_state="dom")
+        job_search = IndeedJobSearch(None, {"job_search_input": "software engineer"}, action_task=action_task)
+
+        # Every iteration runs on a fresh page, so the per-page mouse tracker starts out empty
+        async def open_onboarding(page):
+            await page.goto("https://onboarding.indeed.com/onboarding/")
+
+        async def open_home(page):
+            await page.goto("https://www.indeed.com/")
+
+        await self.measure("flow.login", login.login)
+        await self.measure("flow.is_logged_in", login.is_logged_in, signed_in=True)
+        await self.measure("flow.onboarding_redirect2", login.onboarding_redirect2, setup=open_onboarding, signed_in=True)
+        async def open_results(page):
+            await page.goto("https://www.indeed.com/jobs?q=software+engineer")
+
+        await self.measure("flow.job_search", job_search.initiate_job_search, setup=open_home, signed_in=True)
+        await self.measure("flow.extract_results", job_search.extract_results, setup=open_results, signed_in=True)
+
+        async def stream_results(page):
+            async with aclosing(job_search.iter_results(page)) as results:
+                return [record async for record in results]
+
+        await self.measure("flow.iter_results[4 pages]", stream_results, setup=open_results, signed_in=True)
+
+        async def open_postings(page):
+            records = (await job_search.extract_results(page))[:6]
+            return all("error" not in record for record in await job_search.open_postings(page.context, records))
+
+        await self.measure("flow.open_postings[6 in 3 tabs]", open_postings, setup=open_results, signed_in=True)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline.get('commit')} ({baseline_path}):")
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            print(f"{name:<40} (new)")
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms"):
+            change = (result[key] - previous[key]) / previous[key] * 100 if previous[key] else 0.0
+            deltas.append(f"{key[:3]} {previous[key]:9.1f} -> {result[key]:9.1f} ms ({change:+6.1f}%)")
+        print(f"{name:<40} " + "  ".join(deltas))
+
+
+async def main(args):
+    with FixtureServer() as server:
+        runner = BenchmarkRunner(server, args.iterations, args.filter)
+        await runner.start()
+        try:
+            if not args.flows_only:
+                await runner.run_primitives()
+            if not args.primitives_only:
+                await runner.run_flows()
+        finally:
+            await runner.close()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "results": runner.results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark WASABI primitives and flows against local fixture pages.")
+    parser.add_argument("--iterations", type=int, default=5, help="Runs per benchmark (default: 5)")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Compare against a previous JSON report")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--primitives-only", action="store_true")
+    group.add_argument("--flows-only", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,185 @@
+"""
+Capture pages and their stylesheets/scripts for Label Studio training sets.
+
+Every captured file is stored once under `objects/`, named by the SHA-256 of its content, so assets
+shared between pages (frameworks, site-wide CSS) are kept a single time across captures. Each
+captured page appends one line to `manifest.jsonl` describing the page and the assets it used:
+
+    python wasabi_test/capture.py https://example.com/a https://example.com/b
+    python wasabi_test/capture.py --urls-file urls.txt --out wasabi_test/training_data --concurrency 16
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "training_data")
+
+ASSET_QUERIES = {
+    "stylesheet": ('link[rel="stylesheet"]', "elements => elements.map(e => e.href)"),
+    "script": ("script[src]", "elements => elements.map(e => e.src)")
+}
+DEFAULT_EXTENSIONS = {"page": ".html", "stylesheet": ".css", "script": ".js"}
+
+
+class CaptureStore:
+    """Content-addressed object store plus an append-only manifest."""
+    def __init__(self, root=DEFAULT_OUTPUT_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifest_path = os.path.join(root, "manifest.jsonl")
+
+    def put(self, data: bytes, extension=""):
+        """Store `data` unless an identical object exists. Returns (sha256, relative path, newly written)."""
+        digest = hashlib.sha256(data).hexdigest()
+        relative = os.path.join("objects", digest[:2], digest + extension)
+        path = os.path.join(self.root, relative)
+        if os.path.exists(path):
+            return digest, relative, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A unique temp file per write: threads storing the same object must not share one. Whichever
+        # rename lands last wins, which is fine since the content is identical
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix=digest[:16], suffix=".tmp",
+                                         delete=False) as f:
+            f.write(data)
+        try:
+            os.chmod(f.name, 0o644)  # NamedTemporaryFile creates it owner-only; objects are shared training data
+            os.replace(f.name, path)
+        except OSError:
+            os.remove(f.name)
+            raise
+        return digest, relative, True
+
+    def append_manifest(self, entry):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def extension_for(kind, url, content_type=None):
+    extension = os.path.splitext(urlsplit(url).path)[1]
+    if not extension and content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+    return extension[:10] or DEFAULT_EXTENSIONS.get(kind, "")
+
+
+class Capturer:
+    """
+    Captures a list of URLs with a bounded number of open pages and concurrent asset downloads.
+
+    An asset URL is downloaded at most once per run, however many pages reference it.
+    """
+    def __init__(self, store: CaptureStore, concurrency=8, pages=2, timeout=30000):
+        self.store = store
+        self.timeout = timeout
+        self.fetch_slots = asyncio.Semaphore(concurrency)
+        self.page_slots = asyncio.Semaphore(pages)
+        self.downloads = {}  # Asset URL -> task, so shared assets are fetched once
+        self.stats = {"pages": 0, "failed_pages": 0, "assets": 0, "failed_assets": 0, "new_objects": 0}
+
+    async def store_bytes(self, data, extension):
+        digest, relative, created = await asyncio.to_thread(self.store.put, data, extension)
+        self.stats["new_objects"] += created
+        return digest, relative
+
+    async def download(self, request, kind, url):
+        async with self.fetch_slots:
+            try:
+                response = await request.get(url, timeout=self.timeout)
+                body = await response.body()
+            except Exception as e:
+                self.stats["failed_assets"] += 1
+                return {"url": url, "kind": kind, "error": str(e)}
+        content_type = response.headers.get("content-type")
+        digest, relative = await self.store_bytes(body, extension_for(kind, url, content_type))
+        self.stats["assets"] += 1
+        return {"url": url, "kind": kind, "status": response.status, "content_type": content_type,
+                "size": len(body), "sha256": digest, "path": relative}
+
+    def fetch(self, request, kind, url):
+        if url not in self.downloads:
+            self.downloads[url] = asyncio.ensure_future(self.download(request, kind, url))
+        return self.downloads[url]
+
+    async def capture(self, context, url):
+        async with self.page_slots:
+            page = await context.new_page()
+            try:
+                response = await page.goto(url, timeout=self.timeout)
+                html = await page.content()
+                title = await page.title()
+                asset_urls = {kind: await page.eval_on_selector_all(selector, script)
+                              for kind, (selector, script) in ASSET_QUERIES.items()}
+            except Exception as e:
+                self.stats["failed_pages"] += 1
+                print(f"Failed to capture {url}: {e}")
+                return None
+            finally:
+                await page.close()
+
+        # Asset downloads run outside the page slot so the next page can load meanwhile
+        digest, relative = await self.store_bytes(html.encode("utf-8"), ".html")
+        assets = await asyncio.gather(*(self.fetch(context.request, kind, asset_url)
+                                         for kind, urls in asset_urls.items()
+                                         for asset_url in dict.fromkeys(urls) if asset_url))
+        entry = {
+            "url": url,
+            "final_url": response.url if response else url,
+            "status": response.status if response else None,
+            "title": title,
+            "captured_at": time.time(),
+            "page": {"sha256": digest, "path": relative, "size": len(html)},
+            "assets": assets
+        }
+        await asyncio.to_thread(self.store.append_manifest, entry)
+        self.stats["pages"] += 1
+        print(f"Captured {url} ({len(assets)} assets)")
+        return entry
+
+    async def run(self, urls, headless=True):
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=headless)
+            try:
+                context = await browser.new_context()
+                entries = await asyncio.gather(*(self.capture(context, url) for url in urls))
+            finally:
+                await browser.close()
+        return [entry for entry in entries if entry]
+
+
+def read_urls(urls, urls_file=None):
+    urls = list(urls)
+    if urls_file:
+        with open(urls_file, "r", encoding="utf-8") as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    return list(dict.fromkeys(urls))
+
+
+async def capture(urls, output_dir=DEFAULT_OUTPUT_DIR, concurrency=8, pages=2, headless=True):
+    """Capture `urls` into `output_dir` and return the manifest entries written."""
+    capturer = Capturer(CaptureStore(output_dir), concurrency=concurrency, pages=pages)
+    entries = await capturer.run(urls, headless=headless)
+    print(", ".join(f"{key} {value}" for key, value in capturer.stats.items()))
+    return entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capture pages and their assets into a content-addressed store.")
+    parser.add_argument("urls", nargs="*", help="Pages to capture")
+    parser.add_argument("--urls-file", help="File with one URL per line (# starts a comment)")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT_DIR, help="Output directory (default: training_data)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent asset downloads (default: 8)")
+    parser.add_argument("--pages", type=int, default=2, help="Pages loading at once (default: 2)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser while capturing")
+    args = parser.parse_args()
+    url_list = read_urls(args.urls, args.urls_file)
+    if not url_list:
+        parser.error("no URLs given")
+    asyncio.run(capture(url_list, args.out, args.concurrency, args.pages, headless=not args.headed))
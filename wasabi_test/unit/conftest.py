@@ -0,0 +1,7 @@
+# conftest.py
+import os
+import sys
+
+# The code under test imports itself as `tasks...`, run from wasabi_main/ (like the benchmark)
+WASABI_MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "wasabi_main")
+sys.path.insert(0, WASABI_MAIN)
@@ -0,0 +1,198 @@
+# test_cli.py
+import argparse
+import json
+import os
+from concurrent.futures import CancelledError
+
+import pytest
+
+import cli
+from cli import ConfigError, build_config, load_config_file, outcome, parse_assignments
+
+SPEC = {
+    "inputs": [
+        {"key": "selected_profile", "type": "dropdown", "options": ["alice", "bob"]},
+        {"key": "job_search_input", "type": "line_edit"},
+        {"key": "max_result_pages", "type": "dropdown", "options": ["1", "3", "5"], "default": "3"},
+        {"key": "launch_profile", "type": "dropdown", "options": ["default", "headless"]},
+    ]
+}
+
+
+class FakeHandle:
+    def __init__(self, result=None, error=None):
+        self._result, self._error = result, error
+        self.metrics = None
+
+    def result(self):
+        if self._error:
+            raise self._error
+        return self._result
+
+
+def test_parse_assignments():
+    assert parse_assignments(["pacing=fast", " resume =no", "query=a=b", "empty="]) == {
+        "pacing": "fast", "resume": "no", "query": "a=b", "empty": ""}
+    assert parse_assignments(None) == {}
+
+
+@pytest.mark.parametrize("assignment", ["pacing", "=fast"])
+def test_parse_assignments_rejects_malformed(assignment):
+    with pytest.raises(ConfigError, match="key=value"):
+        parse_assignments([assignment])
+
+
+def test_build_config_fills_defaults_like_the_gui():
+    assert build_config(SPEC) == {
+        "selected_profile": "alice", "job_search_input": "", "max_result_pages": "3", "launch_profile": "default"}
+
+
+def test_build_config_later_sources_win():
+    config = build_config(SPEC, {"selected_profile": "bob", "job_search_input": "python"},
+                          {"job_search_input": "rust"})
+
+    assert (config["selected_profile"], config["job_search_input"]) == ("bob", "rust")
+
+
+def test_unattended_defaults_apply_only_to_inputs_without_their_own_default():
+    defaults = {"launch_profile": "headless", "max_result_pages": "5", "not_in_spec": "x"}
+
+    config = build_config(SPEC, defaults=defaults)
+
+    assert (config["launch_profile"], config["max_result_pages"]) == ("headless", "3")
+    assert "not_in_spec" not in config
+    assert build_config(SPEC, {"launch_profile": "default"}, defaults=defaults)["launch_profile"] == "default"
+
+
+def test_build_config_compares_dropdowns_as_strings():
+    assert build_config(SPEC, {"max_result_pages": 5})["max_result_pages"] == 5
+
+
+@pytest.mark.parametrize("source, message", [
+    ({"selected_profile": "carol"}, "Invalid value 'carol' for selected_profile"),
+    ({"colour": "red"}, "Unknown configuration keys \\['colour'\\]"),
+])
+def test_build_config_rejects_bad_values(source, message):
+    with pytest.raises(ConfigError, match=message):
+        build_config(SPEC, source)
+
+
+def test_build_config_without_spec_passes_sources_through():
+    assert build_config(None, {"anything": 1}) == {"anything": 1}
+
+
+def test_load_config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"pacing": "fast"}))
+    assert load_config_file(str(path)) == {"pacing": "fast"}
+    assert load_config_file(None) == {}
+
+    path.write_text("[1, 2]")
+    with pytest.raises(ConfigError, match="JSON object"):
+        load_config_file(str(path))
+
+
+@pytest.mark.parametrize("handle, expected", [
+    (FakeHandle(result=True), (cli.EXIT_OK, "complete")),
+    (FakeHandle(result=None), (cli.EXIT_OK, "complete")),
+    (FakeHandle(result=False), (cli.EXIT_FAILED, "failed")),
+    (FakeHandle(error=RuntimeError("boom")), (cli.EXIT_FAILED, "failed: boom")),
+    (FakeHandle(error=CancelledError()), (cli.EXIT_INTERRUPTED, "cancelled")),
+])
+def test_outcome_exit_codes(handle, expected):
+    assert outcome(handle) == expected
+
+
+def test_run_with_bad_configuration_is_a_usage_error(monkeypatch, capsys):
+    class Registry:
+        def load_class(self, name):
+            raise KeyError(f"Unknown task '{name}', expected one of ['indeed_task']")
+    monkeypatch.setattr(cli, "get_task_registry", Registry)
+    monkeypatch.setattr(cli, "get_runtime", lambda: pytest.fail("a task was submitted"))
+
+    code = cli.command_run(argparse.Namespace(task="nope_task", config=None, set=["pacing=fast"]))
+
+    assert code == cli.EXIT_USAGE
+    assert "Unknown task 'nope_task'" in capsys.readouterr().err
+    assert cli.command_run(argparse.Namespace(task="nope_task", config=None, set=["pacing"])) == cli.EXIT_USAGE
+
+
+def test_prepare_task_runs_unattended_headless(monkeypatch):
+    class FakeTask:
+        def __init__(self, config):
+            self.config = config
+
+        @staticmethod
+        def configuration_spec():
+            return SPEC
+
+    class Registry:
+        def load_class(self, name):
+            return FakeTask
+    monkeypatch.setattr(cli, "get_task_registry", Registry)
+
+    task = cli.prepare_task("fake_task", {"selected_profile": "bob"})
+
+    assert task.config["launch_profile"] == "headless"
+    assert task.config["selected_profile"] == "bob"
+
+
+class FakeRuntime:
+    def __init__(self, error=None):
+        self.error = error
+        self.submitted = []
+
+    def submit(self, func, task_name=None):
+        if self.error:
+            raise self.error
+        self.submitted.append(task_name)
+        return FakeHandle(result=True)
+
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    runtime = FakeRuntime()
+    monkeypatch.setattr(cli, "get_runtime", lambda: runtime)
+    monkeypatch.setattr(cli, "prepare_task", lambda name, config: type("FakeTask", (), {"run": None})())
+    daemon = cli.SpoolDaemon(str(tmp_path))
+    return daemon, runtime, tmp_path
+
+
+def add_job(spool_dir, file_name):
+    (spool_dir / "incoming" / file_name).write_text(json.dumps({"task": "fake_task"}))
+
+
+def test_daemon_only_picks_up_finished_job_files(spool):
+    daemon, runtime, spool_dir = spool
+    add_job(spool_dir, "a.json")
+    add_job(spool_dir, "b.json.tmp")
+
+    daemon.poll()
+
+    assert runtime.submitted == ["FakeTask"]
+    assert sorted(path.name for path in (spool_dir / "incoming").iterdir()) == ["b.json.tmp"]
+
+
+def test_daemon_survives_jobs_it_cannot_submit(spool, monkeypatch):
+    daemon, runtime, spool_dir = spool
+    for name in ("a.json", "b.json", "c.json"):
+        add_job(spool_dir, name)
+    submit = daemon.submit
+
+    def flaky_submit(file_name):
+        if file_name == "a.json":
+            raise PermissionError("spool is read-only")
+        if file_name == "b.json":
+            os.remove(spool_dir / "incoming" / file_name)  # Taken by another daemon in the meantime
+        submit(file_name)
+    monkeypatch.setattr(daemon, "submit", flaky_submit)
+    runtime.error = RuntimeError("runtime is shutting down")
+
+    daemon.poll()
+
+    result = json.loads((spool_dir / "failed" / "c.result.json").read_text())
+    assert (result["status"], result["error"]) == ("not submitted", "runtime is shutting down")
+    assert sorted(path.name for path in (spool_dir / "incoming").iterdir()) == ["a.json"]
@@ -0,0 +1,90 @@
+# test_job_store.py
+import asyncio
+import sqlite3
+
+import pytest
+
+from tasks.common.job_store import JobIngestor, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    yield store
+    store.close()
+
+
+def job(key, title="Engineer"):
+    return {"job_key": key, "title": title, "company": "Acme", "url": f"https://example.com/{key}"}
+
+
+def rows(store):
+    conn = sqlite3.connect(store.path)
+    try:
+        return {row[0]: row[1:] for row in conn.execute(
+            "SELECT job_key, title, first_seen, last_seen, seen_count, query FROM jobs")}
+    finally:
+        conn.close()
+
+
+def test_ingest_returns_only_new_postings_in_order(store):
+    assert [r["job_key"] for r in store.ingest("indeed", [job("a"), job("b")], "python")] == ["a", "b"]
+    assert [r["job_key"] for r in store.ingest("indeed", [job("c"), job("a"), job("d")])] == ["c", "d"]
+    assert store.count("indeed") == 4
+
+
+def test_duplicates_within_a_batch_and_keyless_records_are_dropped(store):
+    new = store.ingest("indeed", [job("a", "First"), job("a", "Sponsored copy"), {"title": "No key"}])
+
+    assert [r["title"] for r in new] == ["First"]
+    assert store.ingest("indeed", [{"job_key": ""}]) == []
+    assert rows(store)["a"][0] == "First"
+
+
+def test_known_postings_bump_last_seen_but_keep_first_seen(store):
+    store.ingest("indeed", [job("a", "Original")], "python")
+    _, first_seen, last_seen, seen_count, query = rows(store)["a"]
+    assert first_seen == last_seen and seen_count == 1 and query == "python"
+
+    store.ingest("indeed", [job("a", "Retitled")], "rust")
+
+    title, first_seen_after, last_seen_after, seen_count, query = rows(store)["a"]
+    assert (title, query, first_seen_after, seen_count) == ("Original", "python", first_seen, 2)
+    assert last_seen_after >= last_seen
+
+
+def test_postings_are_unique_per_site(store):
+    store.ingest("indeed", [job("a")])
+
+    assert len(store.ingest("linkedin", [job("a")])) == 1
+    assert (store.count("indeed"), store.count("linkedin"), store.count()) == (1, 1, 2)
+
+
+def test_ingestor_batches_and_flushes_on_exit(store):
+    async def crawl():
+        async with JobIngestor(store, "indeed", "python", batch_size=3) as ingestor:
+            await ingestor.add_many([job("a"), job("b")])
+            assert store.count() == 0  # Below the batch size, still buffered
+            await ingestor.add(job("c"))
+            assert store.count() == 3
+            await ingestor.add(job("a"))
+        return ingestor
+
+    ingestor = asyncio.run(crawl())
+
+    assert (ingestor.new_count, ingestor.total_count, store.count()) == (3, 4, 3)
+
+
+def test_add_page_writes_immediately_and_reports_what_was_new(store):
+    async def crawl():
+        async with JobIngestor(store, "indeed", batch_size=50) as ingestor:
+            first = await ingestor.add_page([job("a"), job("b")])
+            second = await ingestor.add_page([job("b"), job("c")])
+            repeat = await ingestor.add_page([job("a"), job("c")])
+        return first, second, repeat
+
+    first, second, repeat = asyncio.run(crawl())
+
+    assert [r["job_key"] for r in first] == ["a", "b"]
+    assert [r["job_key"] for r in second] == ["c"]
+    assert repeat == []
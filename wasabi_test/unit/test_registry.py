@@ -0,0 +1,126 @@
+# test_registry.py
+import json
+import os
+
+import pytest
+
+from tasks import registry
+from tasks.registry import TaskRegistry, class_name_for, parse_task_file
+
+TASK_SOURCE = '''
+class {cls}:
+    """{doc}
+
+    More detail that the GUI does not show.
+    """
+    async def run(self):
+        return True
+{extra}'''
+
+SPEC_METHOD = '''
+    @staticmethod
+    def configuration_spec():
+        return {"inputs": []}
+'''
+
+
+def write_task(tasks_dir, package, name, doc="Does a thing.", spec=False, mtime=None):
+    os.makedirs(tasks_dir / package, exist_ok=True)
+    path = tasks_dir / package / f"{name}.py"
+    path.write_text(TASK_SOURCE.format(cls=class_name_for(name), doc=doc, extra=SPEC_METHOD if spec else ""))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def tasks_dir(tmp_path):
+    tasks_dir = tmp_path / "tasks"
+    write_task(tasks_dir, "demo_task", "demo_task", doc="Demo the registry.", spec=True, mtime=1000)
+    write_task(tasks_dir, "other_task", "other_task", mtime=1000)
+    (tasks_dir / "other_task" / "helpers.py").write_text("class Helpers: pass\n")
+    write_task(tasks_dir, "_private", "hidden_task", mtime=1000)
+    return tasks_dir
+
+
+def make_registry(tasks_dir):
+    return TaskRegistry(tasks_dir=str(tasks_dir), manifest_path=str(tasks_dir.parent / "data" / "manifest.json"))
+
+
+def test_class_name_for():
+    assert class_name_for("indeed_task") == "IndeedTask"
+
+
+def test_parse_task_file_reads_metadata_without_importing(tasks_dir):
+    info = parse_task_file(str(tasks_dir / "demo_task" / "demo_task.py"), "demo_task")
+
+    assert (info.name, info.module, info.class_name) == ("demo_task", "tasks.demo_task.demo_task", "DemoTask")
+    assert info.description == "Demo the registry."
+    assert info.has_configuration_spec and info.mtime == 1000
+
+
+def test_parse_task_file_without_the_expected_class(tmp_path):
+    path = tmp_path / "odd_task.py"
+    path.write_text("class SomethingElse:\n    pass\n")
+
+    assert parse_task_file(str(path), "odd") is None
+
+
+def test_discovers_task_files_one_package_deep(tasks_dir):
+    tasks = make_registry(tasks_dir).tasks()
+
+    assert sorted(tasks) == ["demo_task", "other_task"]
+    assert not tasks["other_task"].has_configuration_spec
+    assert make_registry(tasks_dir).configuration_spec("other_task") is None
+
+
+def test_unknown_task_lists_the_known_ones(tasks_dir):
+    with pytest.raises(KeyError, match="demo_task"):
+        make_registry(tasks_dir).get("missing_task")
+
+
+def test_fresh_registry_reuses_a_current_manifest(tasks_dir, monkeypatch):
+    first = make_registry(tasks_dir).tasks()
+    manifest = json.loads((tasks_dir.parent / "data" / "manifest.json").read_text())
+    assert manifest["version"] == registry.MANIFEST_VERSION and len(manifest["files"]) == 2
+
+    def no_parsing(*args):
+        raise AssertionError("task files were parsed although the manifest is current")
+    monkeypatch.setattr(registry, "parse_task_file", no_parsing)
+
+    assert make_registry(tasks_dir).tasks() == first
+
+
+def test_manifest_is_rebuilt_when_a_task_file_changes(tasks_dir):
+    task_registry = make_registry(tasks_dir)
+    assert task_registry.tasks()["demo_task"].description == "Demo the registry."
+
+    write_task(tasks_dir, "demo_task", "demo_task", doc="Changed description.", mtime=2000)
+    assert task_registry.tasks()["demo_task"].description == "Changed description."
+    assert make_registry(tasks_dir).tasks()["demo_task"].mtime == 2000
+
+    write_task(tasks_dir, "new_task", "new_task", mtime=2000)
+    assert "new_task" in task_registry.tasks()
+
+    os.remove(tasks_dir / "other_task" / "other_task.py")
+    assert sorted(make_registry(tasks_dir).tasks()) == ["demo_task", "new_task"]
+
+
+def test_corrupt_or_outdated_manifest_is_rebuilt(tasks_dir):
+    manifest_path = tasks_dir.parent / "data" / "manifest.json"
+    make_registry(tasks_dir).tasks()
+
+    manifest_path.write_text("{not json")
+    assert sorted(make_registry(tasks_dir).tasks()) == ["demo_task", "other_task"]
+
+    manifest = json.loads(manifest_path.read_text())
+    manifest["version"] = registry.MANIFEST_VERSION + 1
+    manifest["tasks"] = []
+    manifest_path.write_text(json.dumps(manifest))
+    assert sorted(make_registry(tasks_dir).tasks()) == ["demo_task", "other_task"]
+
+
+def test_unparsable_task_files_are_skipped(tasks_dir):
+    (tasks_dir / "demo_task" / "demo_task.py").write_text("class DemoTask(:\n")
+
+    assert sorted(make_registry(tasks_dir).tasks()) == ["other_task"]
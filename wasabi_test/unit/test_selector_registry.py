@@ -0,0 +1,119 @@
+# test_selector_registry.py
+import asyncio
+
+import pytest
+
+from tasks.common.selector_registry import SelectorMissingError, SelectorRegistry, as_selector, compile_xpath
+
+
+class FakePage:
+    """Answers VALIDATE_SCRIPT with canned match counts and records the payload it was sent."""
+    url = "https://example.com/jobs"
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.payloads = []
+
+    async def evaluate(self, script, payload):
+        self.payloads.append(payload)
+        return {name: self.counts.get(name, 0) for name, engine, body in payload}
+
+
+@pytest.mark.parametrize("xpath, css", [
+    ("//a[contains(@href, 'login')]", 'a[href*="login"]'),
+    ("//form[@id='jobsearch']//button[@type='submit']", 'form[id="jobsearch"] button[type="submit"]'),
+    ("//ul[@id='results']/li", 'ul[id="results"] > li'),
+    ("//*[@data-testid=\"job\"]", '[data-testid="job"]'),
+    ("//input[@disabled]", "input[disabled]"),
+    ("//div[@class='a'][contains(@style, 'visible')]", 'div[class="a"][style*="visible"]'),
+    ("//a[contains(@title, 'say \"hi\"')]", 'a[title*="say \\"hi\\""]'),
+])
+def test_compile_xpath_translates_simple_paths(xpath, css):
+    assert compile_xpath(xpath) == css
+
+
+@pytest.mark.parametrize("xpath", [
+    "//button[text()='Sign in']",
+    "//li[2]",
+    "/html/body/div",
+    "//div[@id='content'][.//a[contains(@href, 'cloudflare')]]",
+    "//div/following-sibling::span",
+    "(//a)[1]",
+    "",
+])
+def test_compile_xpath_leaves_the_rest_to_xpath(xpath):
+    assert compile_xpath(xpath) is None
+
+
+def test_as_selector():
+    assert as_selector("//a") == "xpath=//a"
+    assert as_selector("css=a.b") == "css=a.b"
+    assert as_selector("role=button[name='Go']") == "role=button[name='Go']"
+
+
+def test_registry_serves_css_when_it_can():
+    selectors = SelectorRegistry("test", {
+        "link": "//a[contains(@href, 'login')]",
+        "text": "//button[text()='Go']",
+        "role": "role=button",
+    })
+
+    assert selectors["link"] == 'css=a[href*="login"]'
+    assert selectors["text"] == "xpath=//button[text()='Go']"
+    assert selectors["role"] == "role=button"
+    assert "link" in selectors and list(selectors) == ["link", "text", "role"]
+    assert SelectorRegistry("test", {"link": "//a"}, compile_css=False)["link"] == "xpath=//a"
+    with pytest.raises(KeyError, match="No test selector named 'missing'"):
+        selectors["missing"]
+
+
+def test_validate_checks_every_selector_in_one_evaluate():
+    selectors = SelectorRegistry("test", {"link": "//a[@id='x']", "text": "//p[text()='x']", "role": "role=button"})
+    page = FakePage({"link": 2, "text": 0, "role": None})
+
+    counts = asyncio.run(selectors.validate(page))
+
+    assert counts == {"link": 2, "text": 0, "role": None}
+    assert page.payloads == [[["link", "css", 'a[id="x"]'], ["text", "xpath", "//p[text()='x']"],
+                              ["role", "role", "button"]]]
+
+
+def test_require_names_only_the_selectors_that_match_nothing():
+    selectors = SelectorRegistry("test", {"ok": "//a", "gone": "//b", "invalid": "//c", "unchecked": "role=button"})
+    page = FakePage({"ok": 1, "gone": 0, "invalid": -1, "unchecked": None})
+
+    asyncio.run(selectors.require(page, ["ok", "unchecked"]))
+    with pytest.raises(SelectorMissingError) as raised:
+        asyncio.run(selectors.require(page, ["ok", "gone", "invalid", "unchecked"]))
+
+    assert raised.value.missing == ["gone", "invalid"]
+    assert str(raised.value) == "test selectors missing on https://example.com/jobs: gone, invalid"
+
+
+def test_site_selectors_compile():
+    from tasks.indeed_task.selectors import INDEED_SELECTORS
+    from tasks.subtasks.selectors import COMMON_SELECTORS
+
+    for registry in (INDEED_SELECTORS, COMMON_SELECTORS):
+        assert all(registry[name].startswith(("css=", "xpath=")) for name in registry)
+
+
+def test_wait_for_names_missing_selectors_on_timeout():
+    playwright = pytest.importorskip("playwright.async_api")
+
+    class SlowPage(FakePage):
+        def __init__(self, counts):
+            super().__init__(counts)
+            self.timeouts = []
+
+        async def wait_for_selector(self, selector, state, timeout):
+            self.timeouts.append(timeout)
+            if selector.endswith("b"):
+                raise playwright.TimeoutError("timed out")
+
+    selectors = SelectorRegistry("test", {"ready": "//a", "broken": "//b"})
+    page = SlowPage({"ready": 1, "broken": 0})
+
+    with pytest.raises(SelectorMissingError, match="broken"):
+        asyncio.run(selectors.wait_for(page, ["ready", "broken"], timeout=2000))
+    assert all(0 < timeout <= 2000 for timeout in page.timeouts)
@@ -0,0 +1,130 @@
+# test_step_engine.py
+import asyncio
+
+import pytest
+
+from tasks.subtasks.step_engine import StepDefinitionError, StepPlan, compile_steps
+
+
+class FakeActions:
+    """Stands in for GlobalActionTask: an action registry of plain coroutines, no browser."""
+    def __init__(self, click_results=(True,)):
+        self.click_results = list(click_results)
+        self.clicks = 0
+        self.action_registry = {
+            'hover_and_click': self.hover_and_click,
+            'random_wait': self.random_wait,
+            'confirm_navigation': self.confirm_navigation,
+        }
+        self.param_choices = {'hover_and_click': {'button': ('left', 'right')}}
+
+    async def hover_and_click(self, page, xpath, element_description="", button="left"):
+        self.clicks += 1
+        result = self.click_results.pop(0) if self.click_results else True
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def random_wait(self, pause_type="short"):
+        return None
+
+    async def confirm_navigation(self, page, page_name, outcomes):
+        return (False, {})
+
+
+class FakeCheckpoint:
+    def __init__(self, completed=()):
+        self.completed = list(completed)
+
+    def is_done(self, step_key):
+        return step_key in self.completed
+
+    async def mark_done(self, step_key, page=None):
+        self.completed.append(step_key)
+
+
+def click(**extra):
+    return {'type': 'hover_and_click', 'params': {'xpath': '//button', 'element_description': 'Button'}, **extra}
+
+
+def test_compiles_steps_with_ids_units_and_descriptions():
+    plan = compile_steps(FakeActions(), [
+        click(id='submit', timeout=1500, retries=2, retry_delay=250),
+        {'type': 'random_wait', 'params': {'pause_type': 'long'}, 'description': 'Pause'},
+    ], name='login')
+
+    assert isinstance(plan, StepPlan) and len(plan) == 2
+    first, second = plan.steps
+    assert (first.step_id, first.timeout, first.retries, first.retry_delay) == ('submit', 1.5, 2, 0.25)
+    assert first.description == 'Button'
+    assert (second.step_id, second.description, second.timeout) == ('1:random_wait', 'Pause', None)
+    assert plan.checkpoint_key(first) == 'login/submit'
+
+
+@pytest.mark.parametrize("step, message", [
+    ("not a dict", "must be a dict"),
+    ({'params': {}}, "must be a dict with a 'type' key"),
+    ({'type': 'teleport'}, "not supported"),
+    (click(colour='red'), "unknown keys"),
+    ({'type': 'hover_and_click', 'params': {'element_description': 'x'}}, "invalid params"),
+    (click(params={'xpath': '//a', 'speed': 3}), "invalid params"),
+    (click(params={'xpath': '//a', 'button': 'middle'}), "must be one of"),
+    (click(retries=-1), "'retries'"),
+    (click(retries=True), "'retries'"),
+    (click(timeout='5'), "'timeout'"),
+    (click(timeout=-10), "'timeout'"),
+    (click(timeout=0), "'timeout' must be greater than 0"),
+    (click(timeout=0.0), "'timeout' must be greater than 0"),
+    (click(retry_delay='fast'), "'retry_delay'"),
+])
+def test_rejects_bad_definitions(step, message):
+    with pytest.raises(StepDefinitionError, match=message):
+        compile_steps(FakeActions(), [step])
+
+
+def test_rejects_duplicate_step_ids():
+    with pytest.raises(StepDefinitionError, match="duplicate step id 'submit'"):
+        compile_steps(FakeActions(), [click(id='submit'), click(), click(id='submit')])
+    with pytest.raises(StepDefinitionError, match="duplicate step id '1:hover_and_click'"):
+        compile_steps(FakeActions(), [click(), click(), click(id='1:hover_and_click')])
+
+
+def test_pageless_actions_are_bound_without_a_page():
+    compile_steps(FakeActions(), [{'type': 'random_wait', 'params': {'pause_type': 'short'}}])
+    with pytest.raises(StepDefinitionError):
+        compile_steps(FakeActions(), [{'type': 'random_wait', 'params': {'page': None}}])
+
+
+def test_run_retries_until_success():
+    actions = FakeActions(click_results=(False, RuntimeError("detached"), True))
+    plan = compile_steps(actions, [click(retries=2)])
+
+    results = asyncio.run(plan.run(page=None))
+
+    assert [result.success for result in results] == [True]
+    assert results[0].attempts == 3 and actions.clicks == 3
+
+
+def test_run_stops_at_first_failure_and_reports_it():
+    actions = FakeActions()
+    plan = compile_steps(actions, [
+        {'type': 'confirm_navigation', 'params': {'page_name': 'Home', 'outcomes': {}}},
+        click(),
+    ])
+
+    results = asyncio.run(plan.run(page=None))
+
+    assert len(results) == 1 and not results[0].success
+    assert actions.clicks == 0
+
+
+def test_run_skips_checkpointed_steps_and_records_new_ones():
+    actions = FakeActions()
+    plan = compile_steps(actions, [click(id='first'), click(id='second'), click(id='again', checkpoint=False)], name='flow')
+    checkpoint = FakeCheckpoint(completed=['flow/first'])
+
+    results = asyncio.run(plan.run(page=None, checkpoint=checkpoint))
+
+    assert [result.skipped for result in results] == [True, False, False]
+    assert actions.clicks == 2
+    assert checkpoint.completed == ['flow/first', 'flow/second']